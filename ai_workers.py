@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - AI Service Workers
+Gunicorn configuration for running the AI service in production:
+
+    gunicorn -c ai_workers.py new_backend:app
+
+Worker count follows the CPUs actually available to the container (CPU
+affinity and the cgroup CPU quota), the symptom DB, medicine catalogue and
+interaction graph are loaded in the master before fork so workers share those
+pages copy-on-write, and workers are recycled after a number of requests to
+bound memory growth.
+"""
+
+import gc
+import math
+import os
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.absolute()
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# Serve the medicine catalogue from this memory-mapped snapshot (see catalogue_snapshot.py) when set
+CATALOGUE_SNAPSHOT = os.environ.get("AI_CATALOGUE_SNAPSHOT")
+
+CGROUP_V2_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+CGROUP_V1_QUOTA = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+CGROUP_V1_PERIOD = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+
+
+def cgroup_cpu_quota():
+    """CPUs allowed by the cgroup CPU quota, or None when unlimited or unknown"""
+    try:
+        quota, period = CGROUP_V2_CPU_MAX.read_text().split()[:2]
+        if quota == "max":
+            return None
+        return int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        quota = int(CGROUP_V1_QUOTA.read_text())
+        period = int(CGROUP_V1_PERIOD.read_text())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def available_cpus():
+    """CPUs this process may actually use: affinity mask capped by the cgroup quota"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def worker_count(cpus=None):
+    """AI_WORKERS if set, otherwise gunicorn's recommended 2 x CPUs + 1"""
+    configured = os.environ.get("AI_WORKERS")
+    if configured:
+        return max(1, int(configured))
+    return 2 * (cpus or available_cpus()) + 1
+
+
+def preload():
+    """Load shared read-only data once in the master so forked workers inherit it"""
+    import medicine_db
+    from condition_model import condition_models
+    from interaction_graph import interaction_graphs
+    from medicine_catalogue import medicine_catalogues
+    from symptom_analysis import shared_symptom_matcher
+
+    conn = medicine_db.connect()
+    try:
+        if CATALOGUE_SNAPSHOT:
+            from catalogue_snapshot import CatalogueSnapshot, publish_snapshot
+            publish_snapshot(CatalogueSnapshot(CATALOGUE_SNAPSHOT))
+        else:
+            shared_symptom_matcher()
+            medicine_catalogues.get(conn)
+        interaction_graphs.get(conn)
+        condition_models.load(conn)
+    finally:
+        # SQLite connections must not cross fork; workers open their own
+        conn.close()
+
+
+# Gunicorn settings
+bind = os.environ.get("AI_BIND", "0.0.0.0:5001")
+workers = worker_count()
+# Cached responses are only shared between workers through a shared backend (see cache_backends.py)
+if workers > 1:
+    os.environ.setdefault("AI_CACHE_URL", "sqlite://")
+threads = int(os.environ.get("AI_THREADS", 2))
+worker_class = "gthread" if threads > 1 else "sync"
+preload_app = True
+max_requests = int(os.environ.get("AI_MAX_REQUESTS", 1000))
+# Spread recycling out so workers do not all restart at once
+max_requests_jitter = max_requests // 10
+timeout = int(os.environ.get("AI_WORKER_TIMEOUT", 60))
+graceful_timeout = int(os.environ.get("AI_GRACEFUL_TIMEOUT", 10))
+keepalive = 5
+
+
+def on_starting(server):
+    preload()
+    server.log.info("Preloaded symptom DB, medicine catalogue, interaction graph and condition model; "
+                    f"starting {workers} worker(s) x {threads} thread(s) for {available_cpus()} available CPU(s)")
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the collector's reach, so collections
+    # in the workers do not touch (and copy) the shared pages
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Threads do not survive fork, so each worker runs its own watcher over the inherited snapshots
+    if CATALOGUE_SNAPSHOT:
+        from catalogue_snapshot import SnapshotWatcher
+        SnapshotWatcher(CATALOGUE_SNAPSHOT).start()
+    elif os.environ.get("AI_CATALOGUE_WATCH", "1") != "0":
+        from catalogue_watcher import start_catalogue_watcher
+        start_catalogue_watcher()
+
+
+def main():
+    cpus = available_cpus()
+    quota = cgroup_cpu_quota()
+    print("⚙️  AI service worker sizing")
+    print(f"   • Visible CPUs: {os.cpu_count()}")
+    print(f"   • cgroup quota: {'unlimited' if quota is None else f'{quota:g} CPU(s)'}")
+    print(f"   • Available CPUs: {cpus}")
+    print(f"   • Workers: {worker_count(cpus)} x {threads} thread(s), recycled after ~{max_requests} requests")
+    if CATALOGUE_SNAPSHOT:
+        print(f"   • Catalogue: memory-mapped snapshot {CATALOGUE_SNAPSHOT}")
+    else:
+        print(f"   • Catalogue hot reload: {'off' if os.environ.get('AI_CATALOGUE_WATCH') == '0' else 'on'}")
+    print(f"   • Response cache: {os.environ.get('AI_CACHE_URL') or 'local'}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Analysis Pipeline
+One request's symptom analysis as a chain of stages: normalize, detect,
+rank medicines, build treatments and attach safety. Each stage runs at most
+once per request and only when something asks for it, so composite
+endpoints such as /combined share detection and catalogue lookups instead of
+repeating them for every part of the response.
+"""
+
+import json
+import sys
+from functools import cached_property
+
+import medicine_db
+from interaction_graph import interaction_graphs
+from medicine_ranking import DEFAULT_CONFIDENCE, INDICATION_WEIGHTS, candidate_columns, rank
+from medicine_search import medicines_by_indication, normalize_symptom, search_medicines
+from symptom_analysis import shared_symptom_matcher
+
+TREATMENTS_PER_SYMPTOM = 3
+NATURAL_CATEGORIES = ('herbal', 'ayurvedic', 'natural', 'homeopathic', 'essential oil')
+MEDICINE_LIMIT = 10
+# confidence_score (as a percentage) from which a recommendation counts as high confidence
+HIGH_CONFIDENCE = 80
+TREATMENT_TYPES = ('allopathy', 'naturopathy', 'both')
+
+# Self-care advice per interned symptom name; symptoms without an entry get none
+LIFESTYLE_ADVICE = {
+    'headache': ["Drink water regularly through the day", "Take screen breaks and rest in a quiet, dark room"],
+    'migraine': ["Keep a diary to identify triggers", "Keep regular sleep and meal times"],
+    'fever': ["Rest and drink plenty of fluids", "Dress lightly and keep the room cool"],
+    'cough': ["Drink warm fluids such as honey and lemon", "Avoid smoke and other airway irritants"],
+    'sore throat': ["Gargle with warm salt water", "Drink warm fluids and rest your voice"],
+    'runny nose': ["Rest and drink plenty of fluids", "Wash hands often to avoid spreading infection"],
+    'congestion': ["Inhale steam or use a humidifier", "Sleep with your head slightly raised"],
+    'sneezing': ["Keep windows closed on high pollen days", "Wash bedding weekly in hot water"],
+    'allergy': ["Avoid known allergens", "Shower and change clothes after time outdoors"],
+    'nausea': ["Eat small, bland meals", "Sip clear fluids slowly"],
+    'vomiting': ["Sip water or oral rehydration solution in small amounts", "Return to bland food gradually"],
+    'diarrhea': ["Drink oral rehydration solution to replace lost fluids", "Avoid fatty, spicy food and alcohol"],
+    'constipation': ["Eat more fibre from fruit, vegetables and whole grains", "Drink more water and stay active"],
+    'heartburn': ["Eat smaller meals and avoid lying down after eating", "Limit caffeine, alcohol and spicy food"],
+    'bloating': ["Eat slowly and avoid fizzy drinks", "Take a short walk after meals"],
+    'stomach pain': ["Eat small, bland meals", "Avoid alcohol and fatty food until it settles"],
+    'fatigue': ["Keep a regular sleep schedule", "Take light exercise and eat balanced meals"],
+    'insomnia': ["Keep a regular sleep schedule", "Avoid caffeine and screens before bed"],
+    'anxiety': ["Practise slow breathing or meditation", "Take regular exercise and limit caffeine"],
+    'depression': ["Stay in touch with friends and family", "Take regular exercise and time outdoors"],
+    'back pain': ["Stay gently active rather than resting in bed", "Keep a good posture and lift with your legs"],
+    'joint pain': ["Keep moving with low-impact exercise such as swimming", "Keep to a healthy weight"],
+    'muscle pain': ["Stretch gently and rest the sore muscles", "Apply warmth to ease stiffness"],
+    'cramps': ["Stretch and massage the cramping muscle", "Drink enough fluids, especially after exercise"],
+    'dizziness': ["Sit or lie down until it passes", "Stand up slowly and drink enough fluids"],
+    'itching': ["Keep the skin moisturised", "Avoid hot showers and scratching"],
+    'rash': ["Use mild, fragrance-free soap", "Wear loose cotton clothing"],
+    'acne': ["Wash your face twice a day with a gentle cleanser", "Avoid picking or squeezing spots"],
+    'high blood pressure': ["Cut down on salt", "Take regular exercise and limit alcohol"],
+    'shortness of breath': ["Avoid smoke and strenuous activity", "Seek urgent care if it is sudden or severe"],
+    'chest pain': ["Seek urgent medical care if the pain is severe or spreads to the arm or jaw"],
+    'loss of appetite': ["Eat small, frequent meals", "Choose nutritious snacks and drinks"],
+}
+
+
+def _is_natural(medicine):
+    category = (medicine.get('category') or '').lower()
+    return any(natural in category for natural in NATURAL_CATEGORIES)
+
+
+def _split_treatments(medicines):
+    """Split medicines into allopathic and naturopathic treatments by category"""
+    allopathy, naturopathy = [], []
+    for medicine in medicines:
+        (naturopathy if _is_natural(medicine) else allopathy).append(medicine)
+    return allopathy[:TREATMENTS_PER_SYMPTOM], naturopathy[:TREATMENTS_PER_SYMPTOM]
+
+
+def _overall_confidence(detected, treatments):
+    """Confidence grows with the number of recognised symptoms that have treatments"""
+    if not detected:
+        return 0.0
+    covered = sum(1 for symptom in detected if any(treatments[symptom]))
+    return round(min(0.95, 0.5 + 0.15 * len(detected) + 0.05 * covered), 2)
+
+
+class AnalysisPipeline:
+    """The analysis stages of one symptom description, each memoized on first use
+
+    `lookups` maps a symptom to its indication lookup; pass the same dict to
+    every pipeline of a batch and items reporting the same symptom share one
+    catalogue query. `detected` skips the detect stage when the symptoms were
+    already matched, e.g. by SymptomMatcher.find_batch over a whole batch.
+    """
+
+    def __init__(self, symptoms, conn, matcher=None, lookups=None, detected=None):
+        self.symptoms = symptoms
+        self.conn = conn
+        self._matcher = matcher
+        self.lookups = {} if lookups is None else lookups
+        if detected is not None:
+            # Pre-fill the cached_property so the stage never runs
+            self.__dict__['detected'] = detected
+
+    @cached_property
+    def normalized(self):
+        return normalize_symptom(self.symptoms)
+
+    @cached_property
+    def detected(self):
+        """Known symptoms mentioned in the description, in symptom DB order"""
+        matcher = shared_symptom_matcher() if self._matcher is None else self._matcher
+        return matcher.find(self.normalized)
+
+    def indication(self, symptom):
+        """Ranked medicines for one detected symptom, shared through `lookups`"""
+        medicines = self.lookups.get(symptom)
+        if medicines is None:
+            medicines = self.lookups[symptom] = medicines_by_indication(
+                self.conn, symptom, TREATMENTS_PER_SYMPTOM * 2)
+        return medicines
+
+    @cached_property
+    def medicines(self):
+        """The best medicines across every detected symptom, or a text search when none was recognised"""
+        if not self.detected:
+            return search_medicines(self.conn, self.normalized, MEDICINE_LIMIT)
+        candidates = {}
+        for symptom in self.detected:
+            for medicine in self.indication(symptom):
+                known = candidates.get(medicine['name'])
+                effectiveness = medicine.get('effectiveness_score') or 0
+                if known is None or effectiveness > (known.get('effectiveness_score') or 0):
+                    candidates[medicine['name']] = medicine
+        candidates = list(candidates.values())
+        columns = candidate_columns(
+            effectiveness=[medicine.get('effectiveness_score') for medicine in candidates],
+            evidence=[medicine.get('evidence_level') for medicine in candidates],
+            confidence=[medicine.get('confidence_score') for medicine in candidates],
+        )
+        return rank(candidates, columns, INDICATION_WEIGHTS, MEDICINE_LIMIT)
+
+    @cached_property
+    def treatments(self):
+        """{symptom: (allopathy, naturopathy)} treatment split for every detected symptom"""
+        return {symptom: _split_treatments(self.indication(symptom)) for symptom in self.detected}
+
+    @cached_property
+    def confidence(self):
+        return _overall_confidence(self.detected, self.treatments)
+
+    @cached_property
+    def lifestyle(self):
+        """Self-care advice for every detected symptom, each piece of advice once"""
+        advice, seen = [], set()
+        for symptom in self.detected:
+            for recommendation in LIFESTYLE_ADVICE.get(symptom, ()):
+                if recommendation not in seen:
+                    seen.add(recommendation)
+                    advice.append({'symptom': symptom, 'recommendation': recommendation})
+        return advice
+
+    @cached_property
+    def recommendations(self):
+        """Every treatment as a flat recommendation, conventional and natural alike"""
+        recommendations, seen = [], set()
+        for symptom in self.detected:
+            for medicines in self.treatments[symptom]:
+                for medicine in medicines:
+                    if medicine['name'] in seen:
+                        continue
+                    seen.add(medicine['name'])
+                    recommendations.append({
+                        'medicine_name': medicine['name'],
+                        'symptom': symptom,
+                        'type': medicine.get('category') or 'Unknown',
+                        'natural': _is_natural(medicine),
+                        'confidence_score': round((medicine.get('confidence_score') or DEFAULT_CONFIDENCE) * 100, 1),
+                        'effectiveness_score': medicine.get('effectiveness_score'),
+                        'evidence_level': medicine.get('evidence_level'),
+                    })
+        return recommendations
+
+    @cached_property
+    def safety(self):
+        """Interactions between the recommended medicines and their warnings"""
+        by_name = {}
+        for medicine in (*self.medicines, *(item for symptom in self.detected for item in self.indication(symptom))):
+            by_name.setdefault(medicine['name'], medicine)
+        names = sorted({medicine['name'] for medicine in self.medicines}
+                       | {recommendation['medicine_name'] for recommendation in self.recommendations})
+        return {
+            'interactions': interaction_graphs.get(self.conn).check_regimen(names),
+            'warnings': [
+                {
+                    'medicine_name': name,
+                    'warnings': by_name[name].get('warnings'),
+                    'contraindications': by_name[name].get('contraindications') or [],
+                }
+                for name in names if by_name[name].get('warnings') or by_name[name].get('contraindications')
+            ],
+        }
+
+
+def comprehensive_analysis(pipeline, user_id=None):
+    """Response of /ai/comprehensive-symptom-analysis"""
+    allopathy, naturopathy = [], []
+    for symptom in pipeline.detected:
+        conventional, natural = pipeline.treatments[symptom]
+        allopathy.extend(conventional)
+        naturopathy.extend(natural)
+
+    return {
+        'success': True,
+        'user_id': user_id,
+        'analysis': {
+            'detected_symptoms': pipeline.detected,
+            'overall_confidence': pipeline.confidence,
+        },
+        'treatment_options': {
+            'allopathy': {'treatments': {'primary_treatments': allopathy}},
+            'naturopathy': {'treatments': {'primary_treatments': naturopathy}},
+            'lifestyle': {'recommendations': pipeline.lifestyle},
+        },
+    }
+
+
+def enhanced_medicine_recommendations(pipeline, user_id=None):
+    """Response of /ai/enhanced-medicine-recommendations"""
+    recommendations = pipeline.recommendations
+    return {
+        'success': True,
+        'user_id': user_id,
+        'recommendations': recommendations,
+        'ai_analysis': {
+            'detected_symptoms': pipeline.detected,
+            'confidence': round(pipeline.confidence * 100, 1),
+            'high_confidence_count': sum(1 for item in recommendations if item['confidence_score'] >= HIGH_CONFIDENCE),
+            'natural_options': sum(1 for item in recommendations if item['natural']),
+        },
+        'safety': pipeline.safety,
+    }
+
+
+def enhanced_recommendations(pipeline, treatment_type='both'):
+    """Response of /ai/enhanced-recommendations, limited to one treatment approach unless 'both'"""
+    analysis = comprehensive_analysis(pipeline)
+    recommendations = {
+        kind: options['treatments'] for kind, options in analysis['treatment_options'].items()
+        if kind != 'lifestyle' and treatment_type in (kind, 'both')
+    }
+    recommendations['lifestyle'] = analysis['treatment_options']['lifestyle']['recommendations']
+    return {
+        'success': True,
+        'detected_symptoms': pipeline.detected,
+        'confidence_score': pipeline.confidence,
+        'treatment_approach': treatment_type,
+        'recommendations': recommendations,
+        'safety': pipeline.safety,
+    }
+
+
+def combined(pipeline):
+    """Response of /combined: ranked medicines and recommendations from one detection pass"""
+    return {
+        'success': True,
+        'symptoms': pipeline.symptoms,
+        'detected_symptoms': pipeline.detected,
+        'confidence': pipeline.confidence,
+        'medicines': pipeline.medicines,
+        'recommendations': pipeline.recommendations,
+        'safety': pipeline.safety,
+    }
+
+
+def register_routes(app):
+    """Register the composite analysis endpoints on the AI service's Flask app"""
+    from flask import jsonify, request
+
+    from db_pool import shared_pool
+    from symptom_analysis import validate_item
+
+    def pipeline_for(payload):
+        error = validate_item(payload)
+        if error:
+            return None, (jsonify({'success': False, 'message': error}), 400)
+        return AnalysisPipeline(payload['symptoms'], shared_pool().reader()), None
+
+    @app.route('/combined', methods=['POST'])
+    def combined_analysis():
+        pipeline, error = pipeline_for(request.get_json(silent=True) or {})
+        return error or jsonify(combined(pipeline))
+
+    @app.route('/ai/comprehensive-symptom-analysis', methods=['POST'])
+    def comprehensive_symptom_analysis():
+        payload = request.get_json(silent=True) or {}
+        pipeline, error = pipeline_for(payload)
+        return error or jsonify(comprehensive_analysis(pipeline, payload.get('user_id')))
+
+    @app.route('/ai/enhanced-medicine-recommendations', methods=['POST'])
+    def enhanced_medicine_recommendations_route():
+        payload = request.get_json(silent=True) or {}
+        pipeline, error = pipeline_for(payload)
+        return error or jsonify(enhanced_medicine_recommendations(pipeline, payload.get('user_id')))
+
+    @app.route('/ai/enhanced-recommendations', methods=['POST'])
+    def enhanced_recommendations_route():
+        payload = request.get_json(silent=True) or {}
+        treatment_type = payload.get('treatment_type', 'both')
+        if treatment_type not in TREATMENT_TYPES:
+            message = f"'treatment_type' must be one of {', '.join(TREATMENT_TYPES)}"
+            return jsonify({'success': False, 'message': message}), 400
+        pipeline, error = pipeline_for(payload)
+        return error or jsonify(enhanced_recommendations(pipeline, treatment_type))
+
+    return app
+
+
+def main():
+    """Run the combined analysis for a symptom description from the command line"""
+    if len(sys.argv) < 2:
+        print('Usage: python analysis_pipeline.py "<symptoms>"')
+        return False
+
+    conn = medicine_db.connect()
+    result = combined(AnalysisPipeline(" ".join(sys.argv[1:]), conn))
+    conn.close()
+    print(json.dumps(result, indent=2))
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
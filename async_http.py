@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Async HTTP Client
+Small asyncio HTTP/1.1 client with keep-alive connection pooling, used for
+outbound GPT calls and for load testing the services without extra dependencies.
+"""
+
+import asyncio
+import json
+import ssl
+from urllib.parse import urlsplit
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_CONNECTIONS_PER_HOST = 10
+MAX_HEADER_LINES = 100
+
+
+class HTTPError(Exception):
+    """The server sent something that is not a valid HTTP/1.1 response"""
+
+
+class HTTPResponse:
+    def __init__(self, status, headers, body):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    @property
+    def text(self):
+        return self.body.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _Connection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+
+    def close(self):
+        self.writer.close()
+
+
+async def _read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                # Trailers end with an empty line
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+    length = headers.get('content-length')
+    if length is not None:
+        return await reader.readexactly(int(length))
+    return await reader.read()
+
+
+async def _read_response(reader, method):
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("Connection closed before a response was received")
+    parts = status_line.decode('latin-1').split(' ', 2)
+    if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+        raise HTTPError(f"Malformed status line: {status_line!r}")
+    status = int(parts[1])
+
+    headers = {}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HTTPError("Too many response headers")
+
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        body = b''
+    else:
+        body = await _read_body(reader, headers)
+    return HTTPResponse(status, headers, body)
+
+
+class ConnectionPool:
+    """Keep-alive connections per (scheme, host, port), bounded per host"""
+
+    def __init__(self, connections_per_host=DEFAULT_CONNECTIONS_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                 ssl_context=None):
+        self.connections_per_host = connections_per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._idle = {}
+        self._limits = {}
+        self.opened = 0
+
+    def _limit(self, origin):
+        limit = self._limits.get(origin)
+        if limit is None:
+            limit = self._limits[origin] = asyncio.Semaphore(self.connections_per_host)
+        return limit
+
+    async def _acquire(self, origin):
+        idle = self._idle.setdefault(origin, [])
+        while idle:
+            connection = idle.pop()
+            if not connection.reader.at_eof():
+                connection.reused = True
+                return connection
+            connection.close()
+        scheme, host, port = origin
+        context = None
+        if scheme == 'https':
+            context = self.ssl_context or ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(host, port, ssl=context)
+        self.opened += 1
+        return _Connection(reader, writer)
+
+    def _release(self, origin, connection, keep_alive):
+        if keep_alive:
+            self._idle.setdefault(origin, []).append(connection)
+        else:
+            connection.close()
+
+    async def request(self, method, url, json_body=None, body=None, headers=None, timeout=None):
+        """Send a request and return the full HTTPResponse"""
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        origin = (scheme, parts.hostname, port)
+        path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+        request_headers = {'Host': parts.netloc, 'Connection': 'keep-alive', 'Accept': 'application/json'}
+        if json_body is not None:
+            body = json.dumps(json_body, separators=(',', ':')).encode()
+            request_headers['Content-Type'] = 'application/json'
+        body = body or b''
+        if body or method in ('POST', 'PUT', 'PATCH'):
+            request_headers['Content-Length'] = str(len(body))
+        request_headers.update(headers or {})
+        head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in request_headers.items())
+        payload = head.encode('latin-1') + b"\r\n" + body
+
+        async with self._limit(origin):
+            return await asyncio.wait_for(
+                self._exchange(origin, method, payload), timeout or self.timeout
+            )
+
+    async def _exchange(self, origin, method, payload):
+        # A reused keep-alive connection may have been closed by the server; retry once on a fresh one
+        for attempt in range(2):
+            connection = await self._acquire(origin)
+            try:
+                connection.writer.write(payload)
+                await connection.writer.drain()
+                response = await _read_response(connection.reader, method)
+            except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                connection.close()
+                if connection.reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            keep_alive = response.headers.get('connection', '').lower() != 'close'
+            self._release(origin, connection, keep_alive)
+            return response
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, json_body=None, **kwargs):
+        return await self.request('POST', url, json_body=json_body, **kwargs)
+
+    async def close(self):
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.close()
+        self._idle.clear()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Performance Regression Benchmarks
+Measures the main AI endpoints with the load generator, stores the results as
+a baseline per git commit under benchmarks/baselines/, and fails when an
+endpoint's p95 latency regresses beyond a threshold against the nearest
+ancestor commit that has a baseline.
+
+    python benchmark.py --start --save     # record a baseline for HEAD
+    python benchmark.py --start            # compare the working tree against it
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from load_test import print_summaries, run_load_test
+from process_groups import new_group_kwargs, shutdown_services
+from service_probes import http_probe, wait_until_ready
+
+PROJECT_ROOT = Path(__file__).parent.absolute()
+BASELINE_DIR = PROJECT_ROOT / "benchmarks" / "baselines"
+# The synthetic catalogue from seed_catalogue.py when it has been generated, else the shipped database
+SEED_DB = PROJECT_ROOT / "benchmarks" / "seeded_medicine_database.db"
+if not SEED_DB.exists():
+    SEED_DB = PROJECT_ROOT / "medicine_database.db"
+DEFAULT_BASE_URL = "http://localhost:5001"
+
+BENCHMARK_ENDPOINTS = [
+    'medicine-search',
+    'comprehensive-symptom-analysis',
+    'enhanced-medicine-recommendations',
+    'enhanced-recommendations',
+    'predict',
+    'combined',
+]
+# Run settings that change latency on their own; runs that differ in them are not compared
+COMPARABLE_CONFIG = ('concurrency', 'duration')
+# Regressions smaller than this are noise, however large in relative terms
+MIN_DELTA_MS = 1.0
+MAX_ERROR_RATE_INCREASE = 0.01
+ANCESTOR_SEARCH_DEPTH = 200
+
+
+def _git(*args):
+    result = subprocess.run(["git", *args], cwd=PROJECT_ROOT, capture_output=True, text=True)
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def current_commit():
+    """(sha, dirty) for the working tree, or (None, False) outside a git checkout"""
+    sha = _git("rev-parse", "HEAD")
+    dirty = bool(_git("status", "--porcelain", "--untracked-files=no"))
+    return sha, dirty
+
+
+def baseline_path(sha):
+    return BASELINE_DIR / f"{sha}.json"
+
+
+def find_baseline(sha=None):
+    """Load the baseline for `sha`, or for the nearest ancestor of HEAD that has one"""
+    if sha:
+        candidates = [_git("rev-parse", sha) or sha]
+    else:
+        candidates = (_git("rev-list", f"--max-count={ANCESTOR_SEARCH_DEPTH}", "HEAD") or "").split()
+    for candidate in candidates:
+        path = baseline_path(candidate)
+        if path.exists():
+            return json.loads(path.read_text())
+    return None
+
+
+def machine_info():
+    return {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def start_ai_service(base_url, db_path):
+    """Start the AI service against a private copy of the seeded database; return (process, tmpdir)"""
+    tmpdir = tempfile.mkdtemp(prefix="healthcare-bench-")
+    db_copy = Path(tmpdir) / "medicine_database.db"
+    shutil.copy(db_path, db_copy)
+    env = dict(os.environ, MEDICINE_DB_PATH=str(db_copy), PYTHONPATH=str(PROJECT_ROOT))
+    process = subprocess.Popen(
+        [sys.executable, "new_backend.py"],
+        cwd=PROJECT_ROOT / "ai_service",
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **new_group_kwargs()
+    )
+    ready, seconds = wait_until_ready(http_probe(f"{base_url}/health"), timeout=60,
+                                      is_alive=lambda: process.poll() is None)
+    if not ready:
+        stop_ai_service(process, tmpdir)
+        raise RuntimeError(f"AI service did not become ready (exit code {process.poll()})")
+    print(f"✅ AI service ready in {seconds:.1f}s (database: {db_copy})")
+    return process, tmpdir
+
+
+def stop_ai_service(process, tmpdir):
+    shutdown_services([{'name': 'AI Service', 'pgid': process.pid, 'process': process}], timeout=5)
+    shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+def run_benchmarks(base_url, concurrency, duration, warmup):
+    """Warm every endpoint up, then measure each one in a closed loop"""
+    if warmup:
+        asyncio.run(run_load_test(base_url, BENCHMARK_ENDPOINTS, 'closed', concurrency, duration=warmup))
+    return asyncio.run(run_load_test(base_url, BENCHMARK_ENDPOINTS, 'closed', concurrency, duration=duration))
+
+
+def config_mismatches(config, baseline):
+    """Human-readable differences in the run settings that make latencies incomparable"""
+    recorded = baseline.get('config', {})
+    return [f"{key} {recorded.get(key)} → {config[key]}" for key in COMPARABLE_CONFIG
+            if recorded.get(key) != config[key]]
+
+
+def compare(results, baseline, threshold, min_delta_ms=MIN_DELTA_MS):
+    """Return a list of human-readable regressions against `baseline`"""
+    regressions = []
+    print(f"\n📏 Compared with baseline {baseline['commit'][:12]} (threshold +{threshold * 100:.0f}% p95)")
+    for endpoint, current in results.items():
+        previous = baseline['results'].get(endpoint)
+        if previous is None:
+            print(f"   • {endpoint}: no baseline")
+            continue
+        old_p95, new_p95 = previous['latency_ms']['p95'], current['latency_ms']['p95']
+        change = (new_p95 - old_p95) / old_p95 if old_p95 else 0.0
+        regressed = new_p95 > old_p95 * (1 + threshold) and new_p95 - old_p95 > min_delta_ms
+        print(f"   {'❌' if regressed else '✅'} {endpoint}: p95 {old_p95:.1f}ms → {new_p95:.1f}ms ({change:+.0%})")
+        if regressed:
+            regressions.append(f"{endpoint}: p95 {old_p95:.1f}ms → {new_p95:.1f}ms ({change:+.0%})")
+        if current['error_rate'] > previous['error_rate'] + MAX_ERROR_RATE_INCREASE:
+            regressions.append(f"{endpoint}: error rate {previous['error_rate']:.1%} → {current['error_rate']:.1%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI endpoints and catch p95 latency regressions")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--start', action='store_true',
+                        help="Start the AI service locally against a copy of the seeded database")
+    parser.add_argument('--db', default=str(SEED_DB), help="Seeded medicine database used with --start")
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=5.0, help="Measured seconds per endpoint")
+    parser.add_argument('--warmup', type=float, default=1.0, help="Unmeasured seconds per endpoint")
+    parser.add_argument('--threshold', type=float, default=0.2, help="Allowed relative p95 increase")
+    parser.add_argument('--baseline', help="Commit to compare against (default: nearest ancestor with a baseline)")
+    parser.add_argument('--save', action='store_true', help="Store the results as the baseline for HEAD")
+    args = parser.parse_args()
+
+    sha, dirty = current_commit()
+    print("⏱️  Healthcare AI - Performance Benchmarks")
+    print("=" * 60)
+
+    service = start_ai_service(args.base_url, args.db) if args.start else None
+    try:
+        results = run_benchmarks(args.base_url, args.concurrency, args.duration, args.warmup)
+    finally:
+        if service is not None:
+            stop_ai_service(*service)
+    print_summaries(results)
+
+    failed = False
+    config = {'concurrency': args.concurrency, 'duration': args.duration, 'warmup': args.warmup}
+    baseline = find_baseline(args.baseline)
+    mismatches = config_mismatches(config, baseline) if baseline is not None else []
+    if baseline is None:
+        print("\nℹ️  No baseline found; run with --save on a clean checkout to record one")
+    elif mismatches:
+        failed = True
+        print(f"\n❌ Not comparing with baseline {baseline['commit'][:12]}: run settings differ "
+              f"({', '.join(mismatches)}); rerun with the baseline's settings")
+    else:
+        if baseline.get('machine') != machine_info():
+            print("⚠️  Baseline was recorded on a different machine; comparisons may be noisy")
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            failed = True
+            print("\n❌ Performance regressions:")
+            for regression in regressions:
+                print(f"   • {regression}")
+
+    if args.save:
+        if sha is None:
+            print("❌ Not a git checkout; cannot save a baseline")
+            return False
+        if dirty:
+            print("⚠️  Working tree has uncommitted changes; the baseline is recorded for HEAD anyway")
+        BASELINE_DIR.mkdir(parents=True, exist_ok=True)
+        baseline_path(sha).write_text(json.dumps({
+            'commit': sha,
+            'dirty': dirty,
+            'timestamp': time.time(),
+            'machine': machine_info(),
+            'config': config,
+            'results': results,
+        }, indent=2))
+        print(f"💾 Baseline saved to {baseline_path(sha).relative_to(PROJECT_ROOT)}")
+
+    return not failed
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
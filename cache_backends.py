@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Cache Backends
+Storage behind ResponseCache: in-process, a SQLite file shared by every worker
+on the box, or any Redis-protocol server.
+"""
+
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+DEFAULT_SHARED_PATH = Path(tempfile.gettempdir()) / "healthcare_ai_response_cache.db"
+DEFAULT_MAX_ENTRIES = 2048
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class LocalBackend:
+    """In-process LRU store, shared only between the threads of one worker"""
+
+    shared = False
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, payload, ttl):
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (self.clock() + ttl, payload)
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def acquire_lease(self, key, ttl):
+        # Threads of this process are already coalesced by ResponseCache
+        return True
+
+    def release_lease(self, key):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'local',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+class SQLiteBackend:
+    """Cache shared by every worker process on one machine through a WAL-mode SQLite file
+
+    Recency is tracked approximately: an entry's access time is refreshed at
+    most every `touch_interval` seconds so reads rarely need a write.
+    """
+
+    shared = True
+
+    def __init__(self, path=DEFAULT_SHARED_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 touch_interval=5.0, trim_every=64, clock=time.time):
+        self.path = str(path)
+        self.max_entries = max_entries
+        self.touch_interval = touch_interval
+        self.trim_every = trim_every
+        self.clock = clock
+        self.evictions = 0
+        self._writes = 0
+        self._pid = os.getpid()
+        self._local = threading.local()
+
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries(accessed_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache_leases (
+                key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL
+            )
+        """)
+
+    def _conn(self):
+        if self._pid != os.getpid():
+            # Connections must not cross fork; each worker opens its own
+            self._pid, self._local = os.getpid(), threading.local()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = self.clock()
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT payload, expires_at, accessed_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+        if now - row[2] > self.touch_interval:
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return bytes(row[0])
+
+    def set(self, key, payload, ttl):
+        now = self.clock()
+        conn = self._conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries(key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, payload, now + ttl, now),
+        )
+        self._writes += 1
+        if self._writes % self.trim_every == 0:
+            self._trim(conn, now)
+
+    def _trim(self, conn, now):
+        """Drop expired entries, then the least recently used ones beyond max_entries"""
+        conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        excess = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0] - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM cache_entries WHERE key IN "
+                "(SELECT key FROM cache_entries ORDER BY accessed_at LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def acquire_lease(self, key, ttl):
+        """Claim the right to compute `key`; False if another worker holds it"""
+        now = self.clock()
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache_leases WHERE key = ? AND expires_at <= ?", (key, now))
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO cache_leases(key, expires_at) VALUES (?, ?)", (key, now + ttl)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def release_lease(self, key):
+        self._conn().execute("DELETE FROM cache_leases WHERE key = ?", (key,))
+
+    def clear(self):
+        self._conn().execute("DELETE FROM cache_entries")
+
+    def stats(self):
+        entries, size = self._conn().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(payload)), 0) FROM cache_entries"
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'path': self.path,
+            'entries': entries,
+            'bytes': size,
+            'evictions': self.evictions,
+            'max_entries': self.max_entries,
+        }
+
+
+class RedisError(Exception):
+    """Error reply from a Redis-protocol server"""
+
+
+class RedisBackend:
+    """Cache kept on a Redis-protocol server, spoken to directly over RESP
+
+    Memory is bounded by the server (e.g. `maxmemory` with `allkeys-lru`);
+    entries carry their TTL so they also expire on their own.
+    """
+
+    shared = True
+
+    def __init__(self, url="redis://localhost:6379/0", prefix="ai-cache:", socket_timeout=2.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip('/') or 0)
+        self.prefix = prefix
+        self.socket_timeout = socket_timeout
+        self._pid = os.getpid()
+        self._local = threading.local()
+
+    def _connection(self):
+        if self._pid != os.getpid():
+            # A socket shared with the parent would interleave both processes' replies
+            self._pid, self._local = os.getpid(), threading.local()
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.socket_timeout)
+            connection = self._local.connection = (sock, sock.makefile('rb'))
+            if self.password:
+                self._command('AUTH', self.password)
+            if self.db:
+                self._command('SELECT', self.db)
+        return connection
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Redis server closed the connection")
+        kind, body = line[:1], line[1:-2]
+        if kind == b'+':
+            return body.decode()
+        if kind == b'-':
+            raise RedisError(body.decode())
+        if kind == b':':
+            return int(body)
+        if kind == b'$':
+            length = int(body)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            count = int(body)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def _command(self, *args):
+        sock, reader = self._connection()
+        parts = [b'*%d\r\n' % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b'$%d\r\n%s\r\n' % (len(data), data))
+        try:
+            sock.sendall(b''.join(parts))
+            return self._read_reply(reader)
+        except (OSError, ConnectionError):
+            # Drop the broken connection so the next command reconnects
+            self._local.connection = None
+            sock.close()
+            raise
+
+    def get(self, key):
+        return self._command('GET', self.prefix + key)
+
+    def set(self, key, payload, ttl):
+        self._command('SET', self.prefix + key, payload, 'PX', max(1, int(ttl * 1000)))
+
+    def acquire_lease(self, key, ttl):
+        reply = self._command('SET', self.prefix + 'lease:' + key, os.getpid(), 'NX', 'PX', max(1, int(ttl * 1000)))
+        return reply == 'OK'
+
+    def release_lease(self, key):
+        self._command('DEL', self.prefix + 'lease:' + key)
+
+    def clear(self):
+        cursor = b'0'
+        while True:
+            cursor, keys = self._command('SCAN', cursor, 'MATCH', self.prefix + '*', 'COUNT', 500)
+            if keys:
+                self._command('DEL', *keys)
+            if cursor in (b'0', 0):
+                break
+
+    def stats(self):
+        return {'backend': 'redis', 'host': self.host, 'port': self.port, 'db': self.db}
+
+
+def create_backend(url=None, **options):
+    """Create a backend from a cache URL
+
+    local                    in-process LRU (default)
+    sqlite:///path/to/file   file shared by every worker on this machine
+    redis://host:port/db     Redis-protocol server
+    """
+    url = url or os.environ.get('AI_CACHE_URL') or 'local'
+    if url == 'local':
+        return LocalBackend(**options)
+    parsed = urlparse(url)
+    if parsed.scheme == 'sqlite':
+        path = unquote(parsed.path) if parsed.path not in ('', '/') else DEFAULT_SHARED_PATH
+        return SQLiteBackend(path, **options)
+    if parsed.scheme in ('redis', 'rediss'):
+        if parsed.scheme == 'rediss':
+            raise ValueError("TLS Redis connections are not supported; put a local TLS proxy in front")
+        return RedisBackend(url, **options)
+    raise ValueError(f"Unknown cache backend URL: {url}")
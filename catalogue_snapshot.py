@@ -0,0 +1,488 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Catalogue Snapshot
+Compiles medicine_database.db into a compact, versioned, read-only binary
+snapshot that AI workers memory-map instead of each holding a parsed copy:
+
+    python catalogue_snapshot.py                  # export snapshots/medicine_catalogue.snap
+    python catalogue_snapshot.py --info           # describe the published snapshot
+
+Every worker maps the same file, so the catalogue's physical pages are shared
+through the page cache, and opening a snapshot costs a header parse. A new
+snapshot is written beside the old one and renamed over it, and workers swap
+to it on their next poll.
+
+Layout (little-endian): a header and section directory, then 8-byte aligned
+sections: META (JSON), a string table (STRDATA plus STROFFS offsets), fixed
+size medicine records (MEDS) with list items in LISTS, lookup indexes (IDS,
+NAMES), symptoms (SYMS, SYMIDX) and the indication posting lists (POSTS),
+each ordered by effectiveness.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import medicine_db
+from medicine_catalogue import SCALAR_FIELDS, Medicine, load_medicine, medicine_version
+from medicine_db import LIST_FIELDS
+
+PROJECT_ROOT = Path(__file__).parent.absolute()
+DEFAULT_SNAPSHOT = PROJECT_ROOT / "snapshots" / "medicine_catalogue.snap"
+
+MAGIC = b"HCSNAP\x00\x00"
+FORMAT_VERSION = 1
+NULL = 0xFFFFFFFF
+# Decoded records kept per worker: hot medicines skip decoding, memory stays bounded
+DECODED_CACHE_SIZE = 4096
+
+_HEADER = struct.Struct("<8sIII")
+_SECTION = struct.Struct("<8sQQ")
+# Scalars other than id and confidence_score are string table indexes
+_STRING_FIELDS = tuple(field for field in SCALAR_FIELDS if field not in ('id', 'confidence_score'))
+_MEDICINE = struct.Struct("<q" + "I" * len(_STRING_FIELDS) + "d" + "II" * len(LIST_FIELDS))
+_SYMPTOM = struct.Struct("<IIIII")
+_POSTING = struct.Struct("<iIdI")
+
+_MEDICINES_SQL = f"SELECT {', '.join(SCALAR_FIELDS)} FROM medicines ORDER BY id"
+_LIST_VALUES_SQL = "SELECT medicine_id, field, value FROM medicine_list_values ORDER BY medicine_id, field, position"
+_SYMPTOMS_SQL = "SELECT id, name FROM symptoms ORDER BY id"
+_SYNONYMS_SQL = "SELECT symptom_id, synonym FROM symptom_synonyms ORDER BY symptom_id, synonym"
+_POSTINGS_SQL = """
+    SELECT map.symptom_id, map.medicine_name, map.effectiveness_score, map.evidence_level, m.id
+    FROM symptom_medicine_mapping map
+    LEFT JOIN medicines m ON m.name = map.medicine_name
+    WHERE map.symptom_id IS NOT NULL
+    ORDER BY map.symptom_id, map.effectiveness_score DESC, map.medicine_name
+"""
+
+
+def _canonical_name(name):
+    return " ".join((name or "").lower().split())
+
+
+class _StringTable:
+    """Interns strings; every distinct value is stored once"""
+
+    def __init__(self):
+        self.index = {}
+        self.data = bytearray()
+        self.offsets = [0]
+
+    def add(self, value):
+        if value is None:
+            return NULL
+        value = str(value)
+        position = self.index.get(value)
+        if position is None:
+            position = self.index[value] = len(self.offsets) - 1
+            self.data += value.encode('utf-8')
+            self.offsets.append(len(self.data))
+        return position
+
+
+def _pack_array(typecode, values):
+    return struct.pack(f"<{len(values)}{typecode}", *values)
+
+
+def export_snapshot(conn, output=DEFAULT_SNAPSHOT):
+    """Compile the catalogue behind `conn` into `output`, atomically replacing any previous snapshot"""
+    from symptom_analysis import symptom_version
+
+    strings = _StringTable()
+    lists = []
+    started = time.perf_counter()
+
+    # One read transaction, so every section describes the same catalogue version
+    conn.execute("BEGIN")
+    try:
+        version = medicine_version(conn)
+        catalogue_version = medicine_db.catalogue_version(conn)
+        vocabulary_version = symptom_version(conn)
+
+        rows = conn.execute(_MEDICINES_SQL).fetchall()
+        positions = {row[0]: index for index, row in enumerate(rows)}
+        items = {}
+        for medicine_id, field, value in conn.execute(_LIST_VALUES_SQL):
+            items.setdefault((medicine_id, field), []).append(value)
+
+        medicines = bytearray()
+        for row in rows:
+            values = dict(zip(SCALAR_FIELDS, row))
+            spans = []
+            for field in LIST_FIELDS:
+                values_for_field = items.pop((values['id'], field), ())
+                spans += [len(lists), len(values_for_field)]
+                lists.extend(strings.add(value) for value in values_for_field)
+            score = values['confidence_score']
+            medicines += _MEDICINE.pack(
+                values['id'],
+                *(strings.add(values[field]) for field in _STRING_FIELDS),
+                float('nan') if score is None else float(score),
+                *spans,
+            )
+        names = sorted(range(len(rows)), key=lambda index: _canonical_name(rows[index][1]))
+
+        symptom_rows = conn.execute(_SYMPTOMS_SQL).fetchall()
+        synonyms = {}
+        for symptom_id, synonym in conn.execute(_SYNONYMS_SQL):
+            synonyms.setdefault(symptom_id, []).append(synonym)
+        postings = {}
+        for symptom_id, medicine_name, score, evidence, medicine_id in conn.execute(_POSTINGS_SQL):
+            postings.setdefault(symptom_id, []).append(_POSTING.pack(
+                positions.get(medicine_id, -1), strings.add(medicine_name),
+                float('nan') if score is None else float(score), strings.add(evidence),
+            ))
+    finally:
+        conn.rollback()
+
+    symptoms, posts = bytearray(), bytearray()
+    post_count = 0
+    for symptom_id, name in symptom_rows:
+        symptom_synonyms = synonyms.get(symptom_id, ())
+        symptom_postings = postings.get(symptom_id, ())
+        symptoms += _SYMPTOM.pack(strings.add(name), len(lists), len(symptom_synonyms),
+                                  post_count, len(symptom_postings))
+        lists.extend(strings.add(synonym) for synonym in symptom_synonyms)
+        for posting in symptom_postings:
+            posts += posting
+        post_count += len(symptom_postings)
+    symptom_index = sorted(range(len(symptom_rows)), key=lambda index: symptom_rows[index][1])
+
+    meta = {
+        'format_version': FORMAT_VERSION,
+        'created_at': time.time(),
+        'database': conn.execute("PRAGMA database_list").fetchone()[2],
+        'medicine_version': list(version),
+        'catalogue_version': list(catalogue_version),
+        'symptom_version': list(vocabulary_version),
+        'medicines': len(rows),
+        'symptoms': len(symptom_rows),
+        'postings': post_count,
+        'strings': len(strings.offsets) - 1,
+    }
+    sections = [
+        (b"META", json.dumps(meta).encode('utf-8')),
+        (b"STRDATA", bytes(strings.data)),
+        (b"STROFFS", _pack_array('Q', strings.offsets)),
+        (b"MEDS", bytes(medicines)),
+        (b"LISTS", _pack_array('I', lists)),
+        (b"IDS", _pack_array('q', [row[0] for row in rows])),
+        (b"NAMES", _pack_array('I', names)),
+        (b"SYMS", bytes(symptoms)),
+        (b"SYMIDX", _pack_array('I', symptom_index)),
+        (b"POSTS", bytes(posts)),
+    ]
+    _write_atomically(Path(output), sections)
+    meta['seconds'] = round(time.perf_counter() - started, 3)
+    meta['bytes'] = Path(output).stat().st_size
+    return meta
+
+
+def _write_atomically(output, sections):
+    """Write beside `output`, then rename over it: readers see the old file or the new one"""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    directory = []
+    for name, data in sections:
+        offset = (offset + 7) & ~7
+        directory.append((name, offset, len(data)))
+        offset += len(data)
+
+    temporary = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections), 0))
+            for entry in directory:
+                f.write(_SECTION.pack(*entry))
+            for (name, offset, _), (_, data) in zip(directory, sections):
+                f.write(b"\x00" * (offset - f.tell()))
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, output)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(output.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class CatalogueSnapshot:
+    """A memory-mapped snapshot, usable wherever a MedicineCatalogue is
+
+    Records are decoded on access and nothing is copied into the Python heap
+    up front. Readers may keep using a snapshot after a newer one has been
+    published; its mapping is released once the last reference goes away.
+    """
+
+    def __init__(self, path=DEFAULT_SNAPSHOT):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.identity = _file_identity(self.path)
+        view = memoryview(self._map)
+
+        magic, format_version, section_count, _ = _HEADER.unpack_from(view, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a catalogue snapshot")
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f"{self.path} has snapshot format {format_version}, expected {FORMAT_VERSION}")
+        sections = {}
+        for number in range(section_count):
+            name, offset, length = _SECTION.unpack_from(view, _HEADER.size + number * _SECTION.size)
+            sections[name.rstrip(b"\x00").decode()] = (offset, view[offset:offset + length])
+        self._strings_offset = sections['STRDATA'][0]
+        sections = {name: section for name, (_, section) in sections.items()}
+
+        self.meta = json.loads(bytes(sections['META']))
+        self.version = tuple(self.meta['medicine_version'])
+        self.symptom_version = tuple(self.meta['symptom_version'])
+        self._string_offsets = sections['STROFFS'].cast('Q')
+        self._medicines = sections['MEDS']
+        self._lists = sections['LISTS'].cast('I')
+        self._ids = sections['IDS'].cast('q')
+        self._names = sections['NAMES'].cast('I')
+        self._symptoms = sections['SYMS']
+        self._symptom_index = sections['SYMIDX'].cast('I')
+        self._postings = sections['POSTS']
+        # An instance OrderedDict rather than lru_cache over a bound method, which would make the snapshot reference
+        # itself and leave its mapping to the cyclic collector (kept away from it by gc.freeze in workers)
+        self._decoded = OrderedDict()
+        self._decoded_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _string(self, index):
+        if index == NULL:
+            return None
+        base = self._strings_offset
+        return self._map[base + self._string_offsets[index]:base + self._string_offsets[index + 1]].decode('utf-8')
+
+    def _list(self, start, count):
+        return tuple(self._string(index) for index in self._lists[start:start + count])
+
+    def medicine_at(self, position):
+        """The Medicine at `position` (in id order), the DECODED_CACHE_SIZE most recently used stay decoded"""
+        with self._decoded_lock:
+            medicine = self._decoded.get(position)
+            if medicine is not None:
+                self._decoded.move_to_end(position)
+                return medicine
+        medicine = self._decode_medicine(position)
+        with self._decoded_lock:
+            self._decoded[position] = medicine
+            if len(self._decoded) > DECODED_CACHE_SIZE:
+                self._decoded.popitem(last=False)
+        return medicine
+
+    def _decode_medicine(self, position):
+        """Decode the medicine record at `position` (in id order); used through medicine_at()"""
+        record = _MEDICINE.unpack_from(self._medicines, position * _MEDICINE.size)
+        values = {'id': record[0]}
+        for field, index in zip(_STRING_FIELDS, record[1:]):
+            values[field] = self._string(index)
+        score = record[1 + len(_STRING_FIELDS)]
+        values['confidence_score'] = None if score != score else score
+        spans = record[2 + len(_STRING_FIELDS):]
+        for number, field in enumerate(LIST_FIELDS):
+            values[field] = self._list(spans[2 * number], spans[2 * number + 1])
+        return Medicine(**values)
+
+    def _position(self, medicine_id):
+        low, high = 0, len(self._ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._ids[middle] < medicine_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low if low < len(self._ids) and self._ids[low] == medicine_id else None
+
+    def get(self, medicine_id, conn=None):
+        """Return the Medicine with `medicine_id`; rows newer than the snapshot are read from `conn`"""
+        position = self._position(medicine_id)
+        if position is not None:
+            return self.medicine_at(position)
+        return load_medicine(conn, medicine_id) if conn is not None else None
+
+    def find(self, name):
+        """Return the Medicine called `name`, ignoring case and extra whitespace, or None"""
+        key = _canonical_name(name)
+        low, high = 0, len(self._names)
+        while low < high:
+            middle = (low + high) // 2
+            record_name = self._string(_MEDICINE.unpack_from(self._medicines, self._names[middle] * _MEDICINE.size)[1])
+            if _canonical_name(record_name) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(self._names):
+            medicine = self.medicine_at(self._names[low])
+            if _canonical_name(medicine.name) == key:
+                return medicine
+        return None
+
+    def _symptom(self, position):
+        return _SYMPTOM.unpack_from(self._symptoms, position * _SYMPTOM.size)
+
+    def indication_postings(self, symptom, limit):
+        """Up to `limit` (medicine_name, effectiveness_score, evidence_level, Medicine or None) for a
+        normalized symptom, most effective first; None when the snapshot has no postings for it"""
+        low, high = 0, len(self._symptom_index)
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(self._symptom(self._symptom_index[middle])[0]) < symptom:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self._symptom_index):
+            return None
+        name, _, _, start, count = self._symptom(self._symptom_index[low])
+        if self._string(name) != symptom or not count:
+            return None
+
+        postings = []
+        for number in range(start, start + min(count, limit)):
+            position, medicine_name, score, evidence = _POSTING.unpack_from(self._postings, number * _POSTING.size)
+            postings.append((
+                self._string(medicine_name),
+                None if score != score else score,
+                self._string(evidence),
+                self.medicine_at(position) if position >= 0 else None,
+            ))
+        return postings
+
+    def symptom_db(self):
+        """The symptom DB in the shape load_symptom_db() returns, for compiling a SymptomMatcher"""
+        symptom_db = {}
+        for position in range(len(self._symptom_index)):
+            name, synonyms_start, synonyms_count, _, _ = self._symptom(position)
+            symptom_db[self._string(name)] = {
+                'synonyms': [synonym.lower() for synonym in self._list(synonyms_start, synonyms_count)],
+            }
+        return symptom_db
+
+
+def _file_identity(path):
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+def publish_snapshot(snapshot, catalogues=None, matchers=None):
+    """Make `snapshot` the catalogue (and, if its vocabulary changed, the symptom matcher) readers see"""
+    from medicine_catalogue import medicine_catalogues
+    from symptom_analysis import symptom_matchers
+    from symptom_matcher import SymptomMatcher
+
+    catalogues = catalogues or medicine_catalogues
+    matchers = matchers or symptom_matchers
+    if matchers.current is None or matchers.version != snapshot.symptom_version:
+        matchers.publish(SymptomMatcher(snapshot.symptom_db()), snapshot.symptom_version)
+    catalogues.publish(snapshot)
+
+
+class SnapshotWatcher:
+    """Serves the catalogue from a snapshot file and swaps to each newly published one"""
+
+    def __init__(self, path=DEFAULT_SNAPSHOT, interval=2.0, catalogues=None, matchers=None):
+        from medicine_catalogue import medicine_catalogues
+
+        self.path = Path(path)
+        self.interval = interval
+        self.catalogues = catalogues or medicine_catalogues
+        self.matchers = matchers
+        self.snapshot = None
+        self.swaps = 0
+        self.last_error = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Swap to the snapshot file if it was replaced; returns True on a swap"""
+        if self.snapshot is not None and _file_identity(self.path) == self.snapshot.identity:
+            return False
+        snapshot = CatalogueSnapshot(self.path)
+        publish_snapshot(snapshot, self.catalogues, self.matchers)
+        if self.snapshot is not None:
+            self.swaps += 1
+        self.snapshot = snapshot
+        return True
+
+    def start(self):
+        current = self.catalogues.current
+        if isinstance(current, CatalogueSnapshot) and current.path == self.path:
+            # Keep the mapping inherited from the master rather than mapping the file again
+            self.snapshot = current
+        self.poll()
+        # The snapshot stands in for the database, so readers stop comparing it with database versions
+        self.catalogues.watched = True
+        self._thread = threading.Thread(target=self._run, name="snapshot-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.catalogues.watched = False
+
+
+def describe(snapshot):
+    meta = snapshot.meta
+    print(f"📦 {snapshot.path} (format {meta['format_version']}, {snapshot.path.stat().st_size:,} bytes)")
+    print(f"   • Created: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(meta['created_at']))}")
+    print(f"   • Catalogue version: {meta['catalogue_version']}")
+    print(f"   • {meta['medicines']:,} medicines, {meta['symptoms']:,} symptoms, "
+          f"{meta['postings']:,} indication postings, {meta['strings']:,} distinct strings")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the medicine catalogue into a memory-mapped snapshot")
+    parser.add_argument('--db', help="Medicine database (default: medicine_database.db)")
+    parser.add_argument('--output', default=str(DEFAULT_SNAPSHOT), help="Snapshot file to publish")
+    parser.add_argument('--info', action='store_true', help="Describe the snapshot instead of exporting")
+    args = parser.parse_args()
+
+    if not args.info:
+        conn = medicine_db.connect(args.db)
+        try:
+            meta = export_snapshot(conn, args.output)
+        finally:
+            conn.close()
+        print(f"✅ Snapshot exported in {meta['seconds']}s")
+
+    try:
+        snapshot = CatalogueSnapshot(args.output)
+    except (OSError, ValueError) as e:
+        print(f"❌ Cannot open snapshot: {e}")
+        return False
+    started = time.perf_counter()
+    CatalogueSnapshot(args.output)
+    describe(snapshot)
+    print(f"   • Opens in {(time.perf_counter() - started) * 1000:.2f}ms")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Catalogue Watcher
+Keeps the AI service's in-memory catalogue current without a restart. A
+background thread notices commits through PRAGMA data_version, reads only the
+rows changed since the previous load (by last_updated and id), and publishes
+new snapshots of the medicine catalogue, interaction graph, symptom matcher
+and condition model. Each swap is a single reference assignment, so readers
+never block and see either the old snapshot or the new one.
+"""
+
+import logging
+import os
+import sys
+import threading
+import time
+
+import medicine_db
+from condition_model import condition_models, condition_version
+from interaction_graph import interaction_graphs, interaction_version, load_interaction_graph
+from medicine_catalogue import load_changed_medicines, load_medicine_catalogue, medicine_catalogues, medicine_version
+from symptom_analysis import symptom_matchers, symptom_version
+
+DEFAULT_INTERVAL = float(os.environ.get('AI_CATALOGUE_POLL_INTERVAL', 2.0))
+# A delta touching more than this fraction of a snapshot is loaded from scratch instead
+FULL_RELOAD_FRACTION = 0.5
+# last_updated has one second resolution and a row is stamped before its transaction
+# commits, so rows stamped this recently are read again by the next reload
+SETTLE_SECONDS = 5
+
+_MARKS_SQL = """
+    SELECT
+        (SELECT MAX(last_updated) FROM {table}),
+        (SELECT MAX(id) FROM {table}),
+        (SELECT COUNT(*) FROM {table}),
+        datetime('now', '-{settle} seconds')
+"""
+
+_CHANGED_INTERACTIONS_SQL = """
+    SELECT id, drug1, drug2, interaction_type, severity, description
+    FROM drug_interactions
+    WHERE last_updated > ? OR id > ?
+    ORDER BY id
+"""
+
+_MEDICINE_IDS_SQL = "SELECT id FROM medicines"
+
+
+def _is_loaded(graph, row):
+    """Whether an (id, drug1, drug2, type, severity, description) row is already in `graph`"""
+    known = graph.interaction(row[1], row[2])
+    return known is not None and (known['interaction_type'], known['severity'], known['description']) == tuple(row[3:])
+
+
+class CatalogueWatcher:
+    """Polls the medicine database and hot-swaps the in-memory catalogue snapshots
+
+    For each table the watcher keeps a watermark (last_updated up to which
+    every row has been loaded, the highest id and the row count). Writers must
+    bump last_updated on every row they change, as the importer and the column
+    default do; deleted rows show up as a lower count than expected.
+    """
+
+    def __init__(self, path=None, interval=DEFAULT_INTERVAL, catalogues=medicine_catalogues,
+                 graphs=interaction_graphs, matchers=symptom_matchers, models=condition_models):
+        self.path = path
+        self.interval = interval
+        self.catalogues = catalogues
+        self.graphs = graphs
+        self.matchers = matchers
+        self.models = models
+
+        self._conn = None
+        self._data_version = None
+        self._marks = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+        self.polls = 0
+        self.reloads = 0
+        self.last_reload = None
+        self.last_error = None
+
+    def _read_marks(self, table):
+        """(watermark, max id, row count) of a table as of the current transaction"""
+        max_updated, max_id, count, settled = self._conn.execute(
+            _MARKS_SQL.format(table=table, settle=SETTLE_SECONDS)
+        ).fetchone()
+        return min(max_updated or '', settled), max_id or 0, count
+
+    def start(self):
+        """Validate the current snapshots, then watch for changes in a background thread"""
+        self._conn = medicine_db.connect(self.path, check_same_thread=False)
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        # Every load reads inside one transaction, so the marks recorded match the rows read
+        self._conn.execute("BEGIN")
+        try:
+            self._marks = {table: self._read_marks(table) for table in ('medicines', 'drug_interactions')}
+            catalogue = self.catalogues.current
+            if catalogue is None or catalogue.version != medicine_version(self._conn):
+                self.catalogues.publish(load_medicine_catalogue(self._conn))
+
+            graph = self.graphs.current
+            if graph is None or graph.version != interaction_version(self._conn):
+                self.graphs.publish(load_interaction_graph(self._conn))
+
+            if self.matchers.current is None or self.matchers.version != symptom_version(self._conn):
+                self.matchers.load(self._conn)
+
+            if self.models.current is None or self.models.version != condition_version(self._conn):
+                self.models.load(self._conn)
+        finally:
+            self._conn.rollback()
+
+        self.catalogues.watched = self.graphs.watched = True
+        self._thread = threading.Thread(target=self._run, name="catalogue-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception as e:
+                self.last_error = str(e)
+                logging.warning(f"⚠️  Catalogue reload failed, keeping the current snapshot: {e}")
+
+    def poll(self):
+        """Apply any committed changes; returns what was reloaded (empty when nothing changed)"""
+        self.polls += 1
+        data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return {}
+
+        started = time.perf_counter()
+        self._conn.execute("BEGIN")
+        try:
+            changes = {
+                'medicines': self._reload_medicines(),
+                'interactions': self._reload_interactions(),
+                'symptoms': self._reload_symptoms(),
+                'conditions': self._reload_conditions(),
+            }
+        finally:
+            self._conn.rollback()
+        # Only advance once the snapshots are published, so a failed reload is retried
+        self._data_version = data_version
+
+        changes = {name: change for name, change in changes.items() if change}
+        if changes:
+            self.reloads += 1
+            self.last_reload = {
+                'at': time.time(),
+                'seconds': round(time.perf_counter() - started, 4),
+                'changes': changes,
+            }
+            self.last_error = None
+            logging.info(f"🔄 Catalogue reloaded in {self.last_reload['seconds'] * 1000:.1f}ms: {changes}")
+        return changes
+
+    def _reload_medicines(self):
+        since, after_id, count = self._marks['medicines']
+        marks = self._read_marks('medicines')
+        catalogue = self.catalogues.current
+        # Rows re-read from the settle window are usually the ones already loaded
+        changed = [medicine for medicine in load_changed_medicines(self._conn, since, after_id)
+                   if catalogue.by_id.get(medicine.id) != medicine]
+        if not changed and marks[2] == count:
+            self._marks['medicines'] = marks
+            return None
+
+        if len(changed) > FULL_RELOAD_FRACTION * max(len(catalogue), 1):
+            self.catalogues.publish(load_medicine_catalogue(self._conn))
+            change = {'full': True, 'rows': marks[2]}
+        else:
+            version = medicine_version(self._conn)
+            updated = catalogue.updated(changed, version=version)
+            removed = []
+            if len(updated) != marks[2]:
+                existing = {row[0] for row in self._conn.execute(_MEDICINE_IDS_SQL)}
+                removed = [medicine_id for medicine_id in updated.by_id if medicine_id not in existing]
+                updated = catalogue.updated(changed, removed, version)
+            self.catalogues.publish(updated)
+            change = {'full': False, 'changed': len(changed), 'removed': len(removed)}
+        self._marks['medicines'] = marks
+        return change
+
+    def _reload_interactions(self):
+        since, after_id, count = self._marks['drug_interactions']
+        marks = self._read_marks('drug_interactions')
+        graph = self.graphs.current
+        rows = self._conn.execute(_CHANGED_INTERACTIONS_SQL, (since, after_id)).fetchall()
+        added = sum(1 for row in rows if row[0] > after_id)
+        rows = [row for row in rows if not _is_loaded(graph, row)]
+        if not rows and marks[2] == count:
+            self._marks['drug_interactions'] = marks
+            return None
+
+        # Deleted rows cannot be read as a delta; neither is it worth patching most of the graph
+        if marks[2] != count + added or len(rows) > FULL_RELOAD_FRACTION * max(len(graph), 1):
+            self.graphs.publish(load_interaction_graph(self._conn))
+            change = {'full': True, 'rows': marks[2]}
+        else:
+            self.graphs.publish(graph.updated([tuple(row[1:]) for row in rows], interaction_version(self._conn)))
+            change = {'full': False, 'changed': len(rows)}
+        self._marks['drug_interactions'] = marks
+        return change
+
+    def _reload_symptoms(self):
+        version = symptom_version(self._conn)
+        if version == self.matchers.version:
+            return None
+        matcher = self.matchers.load(self._conn)
+        return {'full': True, 'symptoms': len(matcher.symptoms)}
+
+    def _reload_conditions(self):
+        if condition_version(self._conn) == self.models.version:
+            return None
+        model = self.models.load(self._conn)
+        return {'full': True, 'conditions': len(model.conditions)}
+
+    def stop(self):
+        """Stop watching; the stores go back to checking versions on access"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.catalogues.watched = self.graphs.watched = False
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def stats(self):
+        catalogue, graph = self.catalogues.current, self.graphs.current
+        return {
+            'interval_seconds': self.interval,
+            'polls': self.polls,
+            'reloads': self.reloads,
+            'last_reload': self.last_reload,
+            'last_error': self.last_error,
+            'medicines': len(catalogue) if catalogue is not None else 0,
+            'interactions': len(graph) if graph is not None else 0,
+            'symptoms': len(self.matchers.current.symptoms) if self.matchers.current is not None else 0,
+        }
+
+
+def start_catalogue_watcher(path=None, interval=DEFAULT_INTERVAL):
+    """Start hot-reloading the shared catalogue snapshots of this process"""
+    return CatalogueWatcher(path, interval).start()
+
+
+def register_routes(app, watcher):
+    """Expose the watcher's reload counters on the AI service's Flask app"""
+    from flask import jsonify
+
+    @app.route('/ai/catalogue-status', methods=['GET'])
+    def catalogue_status():
+        return jsonify(watcher.stats())
+
+    return app
+
+
+def main():
+    """Watch the medicine database and report every reload until interrupted"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    watcher = start_catalogue_watcher()
+    stats = watcher.stats()
+    print(f"👀 Watching {medicine_db.DB_PATH} every {watcher.interval:g}s: {stats['medicines']} medicines, "
+          f"{stats['interactions']} interactions, {stats['symptoms']} symptoms")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.stop()
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Condition Model
+Symptom-to-condition scoring behind /predict. Condition profiles and symptom
+specificity from symptom_medicine_mapping are compiled into one sparse
+condition x symptom weight matrix; a request is a sparse symptom vector, so
+scoring every condition is a sparse matrix-vector product and a batch of
+requests is a sparse matrix-matrix product.
+
+The matrix is stored symptom-major (CSC), so a request only touches the
+conditions linked to the symptoms it mentions: adding conditions does not
+slow down predictions that do not involve them. SciPy does the products when
+it is installed and the batch is large enough to amortize it; otherwise the
+same CSC arrays are walked in pure Python.
+"""
+
+import heapq
+import json
+import math
+import sys
+import threading
+import time
+
+import medicine_db
+from symptom_analysis import load_symptom_db
+from symptom_matcher import SymptomMatcher
+
+try:
+    from scipy import sparse
+except ImportError:
+    sparse = None
+
+# How strongly each symptom points at a condition (0-1), keyed by interned symptom name
+CONDITION_PROFILES = {
+    'common cold': {'runny nose': 1.0, 'sneezing': 0.9, 'congestion': 0.9, 'sore throat': 0.8, 'cough': 0.7,
+                    'headache': 0.3, 'fever': 0.3},
+    'influenza': {'fever': 1.0, 'muscle pain': 0.9, 'fatigue': 0.9, 'chills': 0.8, 'cough': 0.7, 'headache': 0.7,
+                  'sore throat': 0.5, 'loss of appetite': 0.4},
+    'strep throat': {'sore throat': 1.0, 'fever': 0.8, 'headache': 0.4, 'loss of appetite': 0.3, 'chills': 0.3},
+    'acute bronchitis': {'cough': 1.0, 'wheezing': 0.7, 'chest pain': 0.5, 'shortness of breath': 0.5,
+                         'fatigue': 0.4, 'fever': 0.3, 'sore throat': 0.3},
+    'asthma': {'wheezing': 1.0, 'shortness of breath': 1.0, 'cough': 0.6, 'chest pain': 0.5},
+    'allergic rhinitis': {'sneezing': 1.0, 'runny nose': 0.9, 'itching': 0.8, 'congestion': 0.7, 'allergy': 0.9},
+    'migraine': {'migraine': 1.0, 'headache': 0.9, 'nausea': 0.6, 'vomiting': 0.4, 'dizziness': 0.4},
+    'tension headache': {'headache': 1.0, 'muscle pain': 0.4, 'anxiety': 0.3, 'fatigue': 0.3, 'insomnia': 0.2},
+    'gastroenteritis': {'diarrhea': 1.0, 'vomiting': 0.9, 'nausea': 0.8, 'stomach pain': 0.8, 'fever': 0.4,
+                        'cramps': 0.4, 'loss of appetite': 0.3},
+    'gastroesophageal reflux': {'heartburn': 1.0, 'chest pain': 0.5, 'bloating': 0.4, 'nausea': 0.3, 'cough': 0.2},
+    'irritable bowel syndrome': {'bloating': 1.0, 'stomach pain': 0.9, 'constipation': 0.7, 'diarrhea': 0.7,
+                                 'cramps': 0.6},
+    'anxiety disorder': {'anxiety': 1.0, 'insomnia': 0.6, 'dizziness': 0.4, 'fatigue': 0.4, 'chest pain': 0.3,
+                         'shortness of breath': 0.3},
+    'depression': {'depression': 1.0, 'fatigue': 0.7, 'insomnia': 0.6, 'loss of appetite': 0.5, 'anxiety': 0.3},
+    'insomnia disorder': {'insomnia': 1.0, 'fatigue': 0.6, 'anxiety': 0.3, 'headache': 0.2},
+    'urticaria': {'rash': 1.0, 'itching': 1.0, 'allergy': 0.6, 'inflammation': 0.3},
+    'osteoarthritis': {'joint pain': 1.0, 'inflammation': 0.6, 'back pain': 0.4, 'pain': 0.3},
+    'muscle strain': {'muscle pain': 1.0, 'back pain': 0.7, 'cramps': 0.6, 'inflammation': 0.5, 'pain': 0.4},
+    'otitis media': {'earache': 1.0, 'fever': 0.6, 'headache': 0.3, 'loss of appetite': 0.2},
+    'dental abscess': {'toothache': 1.0, 'inflammation': 0.6, 'fever': 0.4, 'pain': 0.3},
+    'hypertension': {'high blood pressure': 1.0, 'headache': 0.4, 'dizziness': 0.4, 'chest pain': 0.3},
+    'acne vulgaris': {'acne': 1.0, 'rash': 0.3, 'inflammation': 0.3},
+    'pneumonia': {'fever': 0.9, 'cough': 0.9, 'shortness of breath': 0.9, 'chest pain': 0.7, 'chills': 0.7,
+                  'fatigue': 0.5},
+}
+ALTERNATIVES = 3
+# Below this many requests building SciPy matrices costs more than walking the columns directly
+SPARSE_BATCH_MIN = 32
+MAX_BATCH_SIZE = 5000
+
+_SYMPTOM_MEDICINES_SQL = """
+    SELECT s.name, COUNT(DISTINCT map.medicine_name)
+    FROM symptoms s
+    JOIN symptom_medicine_mapping map ON map.symptom_id = s.id
+    GROUP BY s.id
+"""
+
+_MAPPED_MEDICINES_SQL = "SELECT COUNT(DISTINCT medicine_name) FROM symptom_medicine_mapping"
+
+_CONDITION_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(id) FROM symptoms),
+        (SELECT COUNT(*) FROM symptom_synonyms),
+        (SELECT MAX(id) FROM symptom_medicine_mapping),
+        (SELECT COUNT(*) FROM symptom_medicine_mapping)
+"""
+
+
+def condition_version(conn):
+    """Symptom vocabulary and mapping counters; changes whenever the compiled model would"""
+    return tuple(conn.execute(_CONDITION_VERSION_SQL).fetchone())
+
+
+def load_symptom_medicine_counts(conn):
+    """({symptom: distinct mapped medicines}, distinct mapped medicines overall)"""
+    counts = dict(conn.execute(_SYMPTOM_MEDICINES_SQL).fetchall())
+    return counts, conn.execute(_MAPPED_MEDICINES_SQL).fetchone()[0]
+
+
+class ConditionModel:
+    """Conditions scored by cosine similarity between weighted symptom vectors
+
+    Each symptom is weighted by its specificity, an inverse document frequency
+    over the medicines it is mapped to: "pain" says less about a condition than
+    "wheezing". Condition rows are normalized to unit length, so a score is the
+    cosine between a request and a condition profile, between 0 and 1.
+    """
+
+    def __init__(self, profiles=CONDITION_PROFILES, symptom_db=None, medicine_counts=None, medicines=0):
+        vocabulary = dict(symptom_db or {})
+        for weights in profiles.values():
+            for symptom in weights:
+                vocabulary.setdefault(symptom, {'synonyms': []})
+        # Matcher symptom ids double as matrix columns
+        self.matcher = SymptomMatcher(vocabulary)
+        self.conditions = list(profiles)
+        medicine_counts = medicine_counts or {}
+        self.specificity = [1.0 + math.log((1 + medicines) / (1 + medicine_counts.get(symptom, 0)))
+                            for symptom in self.matcher.symptoms]
+
+        column_of = {symptom: column for column, symptom in enumerate(self.matcher.symptoms)}
+        entries = [[] for _ in self.matcher.symptoms]
+        for row, weights in enumerate(profiles.values()):
+            weighted = {column_of[symptom]: weight * self.specificity[column_of[symptom]]
+                        for symptom, weight in weights.items()}
+            norm = math.sqrt(sum(value * value for value in weighted.values())) or 1.0
+            for column, value in weighted.items():
+                entries[column].append((row, value / norm))
+
+        # CSC of the condition x symptom matrix, i.e. CSR of its transpose
+        self.indptr, self.indices, self.data = [0], [], []
+        for column_entries in entries:
+            for row, value in sorted(column_entries):
+                self.indices.append(row)
+                self.data.append(value)
+            self.indptr.append(len(self.indices))
+
+        self._matrix = None
+        if sparse is not None:
+            self._matrix = sparse.csr_matrix((self.data, self.indices, self.indptr),
+                                             shape=(len(self.matcher.symptoms), len(self.conditions)))
+
+    @property
+    def nonzeros(self):
+        return len(self.data)
+
+    def vectorize(self, text):
+        """Detected symptom columns of `text` and their unit-length weights"""
+        columns = sorted(self.matcher.find_ids(text))
+        norm = math.sqrt(sum(self.specificity[column] ** 2 for column in columns)) or 1.0
+        return columns, [self.specificity[column] / norm for column in columns]
+
+    def score_batch(self, vectors):
+        """Nonzero {condition row: score} of every (columns, values) vector, as one sparse product"""
+        if self._matrix is not None and len(vectors) >= SPARSE_BATCH_MIN:
+            indptr = [0]
+            for columns, _ in vectors:
+                indptr.append(indptr[-1] + len(columns))
+            requests = sparse.csr_matrix(
+                ([value for _, values in vectors for value in values],
+                 [column for columns, _ in vectors for column in columns], indptr),
+                shape=(len(vectors), self._matrix.shape[0]))
+            scores = (requests @ self._matrix).tocsr()
+            return [dict(zip(scores.indices[scores.indptr[row]:scores.indptr[row + 1]].tolist(),
+                             scores.data[scores.indptr[row]:scores.indptr[row + 1]].tolist()))
+                    for row in range(len(vectors))]
+
+        indptr, indices, data = self.indptr, self.indices, self.data
+        results = []
+        for columns, values in vectors:
+            scores = {}
+            for column, value in zip(columns, values):
+                for position in range(indptr[column], indptr[column + 1]):
+                    row = indices[position]
+                    scores[row] = scores.get(row, 0.0) + value * data[position]
+            results.append(scores)
+        return results
+
+    def predict_batch(self, texts, alternatives=ALTERNATIVES):
+        """Most likely condition, confidence and runners-up for every text of a batch"""
+        vectors = [self.vectorize(text) for text in texts]
+        predictions = []
+        for (columns, _), scores in zip(vectors, self.score_batch(vectors)):
+            best = heapq.nlargest(alternatives + 1, scores.items(), key=lambda item: (item[1], -item[0]))
+            ranked = [{'condition': self.conditions[row], 'confidence': round(min(score, 1.0), 3)}
+                      for row, score in best if score > 0]
+            predictions.append({
+                'prediction': ranked[0]['condition'] if ranked else None,
+                'confidence': ranked[0]['confidence'] if ranked else 0.0,
+                'detected_symptoms': [self.matcher.symptoms[column] for column in columns],
+                'alternatives': ranked[1:],
+            })
+        return predictions
+
+    def predict(self, text):
+        return self.predict_batch([text])[0]
+
+
+def load_condition_model(conn, profiles=CONDITION_PROFILES):
+    """Compile the condition model from the profiles and the symptom tables behind `conn`"""
+    medicine_counts, medicines = load_symptom_medicine_counts(conn)
+    return ConditionModel(profiles, load_symptom_db(conn), medicine_counts, medicines)
+
+
+class ConditionModelStore:
+    """Holds the compiled condition model, loaded once per process
+
+    Like the symptom matcher, the catalogue watcher publishes a recompiled
+    model when the symptom vocabulary or mapping changes.
+    """
+
+    def __init__(self):
+        self._state = (None, None)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        return self._state[0]
+
+    @property
+    def version(self):
+        return self._state[1]
+
+    def publish(self, model, version):
+        """Atomically replace the model readers see"""
+        self._state = (model, version)
+
+    def load(self, conn):
+        """Compile the model from the database behind `conn` and publish it"""
+        version = condition_version(conn)
+        model = load_condition_model(conn)
+        self.publish(model, version)
+        return model
+
+    def get(self):
+        model = self.current
+        if model is None:
+            with self._lock:
+                model = self.current
+                if model is None:
+                    conn = medicine_db.connect()
+                    try:
+                        model = self.load(conn)
+                    finally:
+                        conn.close()
+        return model
+
+
+condition_models = ConditionModelStore()
+
+
+def validate_symptoms(symptoms):
+    """Return an error message for invalid symptom text, or None"""
+    if not isinstance(symptoms, str) or not symptoms.strip():
+        return "Symptoms are required"
+    return None
+
+
+def register_routes(app):
+    """Register /predict and its batch form on the AI service's Flask app"""
+    from flask import jsonify, request
+
+    @app.route('/predict', methods=['POST'])
+    def predict():
+        payload = request.get_json(silent=True) or {}
+        error = validate_symptoms(payload.get('symptoms'))
+        if error:
+            return jsonify({'success': False, 'message': error}), 400
+        return jsonify({'success': True, **condition_models.get().predict(payload['symptoms'])})
+
+    @app.route('/predict/batch', methods=['POST'])
+    def predict_batch():
+        payload = request.get_json(silent=True) or {}
+        items = payload.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'message': "'items' must be a non-empty list"}), 400
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({'success': False, 'message': f"At most {MAX_BATCH_SIZE} items per batch"}), 400
+
+        symptoms = [item.get('symptoms') if isinstance(item, dict) else None for item in items]
+        errors = [validate_symptoms(text) for text in symptoms]
+        valid = [index for index, error in enumerate(errors) if error is None]
+        results = [{'success': False, 'message': error} for error in errors]
+        for index, prediction in zip(valid, condition_models.get().predict_batch([symptoms[i] for i in valid])):
+            results[index] = {'success': True, **prediction}
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+
+    return app
+
+
+def main():
+    """Predict conditions for symptom descriptions given on the command line"""
+    if len(sys.argv) < 2:
+        print('Usage: python condition_model.py "<symptoms>" ["<symptoms>" ...]')
+        return False
+
+    started = time.perf_counter()
+    model = condition_models.get()
+    compiled = time.perf_counter() - started
+    print(f"🩺 {len(model.conditions)} conditions x {len(model.matcher.symptoms)} symptoms, "
+          f"{model.nonzeros} weights ({'SciPy' if sparse is not None else 'pure Python'}), "
+          f"compiled in {compiled * 1000:.1f}ms")
+    print(json.dumps(model.predict_batch(sys.argv[1:]), indent=2))
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Database Pool
+Long-lived connections to medicine_database.db for the threaded AI service:
+one read-only connection per thread and a single serialized writer.
+
+Read connections keep their schema parsed, their hot statements prepared in
+the sqlite3 statement cache and their pages mapped between requests, instead
+of paying for all three on every lookup.
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+import medicine_db
+
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+# Page cache per connection (or per shared cache), in KiB as PRAGMA cache_size takes negative values
+DEFAULT_CACHE_KIB = 32 * 1024
+# Statements kept prepared per connection; well above the number of distinct hot queries
+DEFAULT_CACHED_STATEMENTS = 256
+DEFAULT_BUSY_TIMEOUT = 5.0
+
+
+def _close_connection(conn, pid):
+    # A connection inherited across fork belongs to the parent; leave it alone
+    if os.getpid() == pid:
+        conn.close()
+
+
+class _Reader:
+    """One thread's read connection, closed when the thread goes away or on close()"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.close = weakref.finalize(self, _close_connection, conn, os.getpid())
+
+
+class DatabasePool:
+    """Per-thread read-only connections plus one serialized writer
+
+    Readers are opened with mode=ro and PRAGMA query_only, memory-map the
+    database file and, by default, share one page cache within the process.
+    Writes go through `writer()`, which hands out a single connection to one
+    caller at a time, so imports never contend with each other for the lock.
+    """
+
+    def __init__(self, path=None, mmap_size=DEFAULT_MMAP_SIZE, cache_kib=DEFAULT_CACHE_KIB,
+                 cached_statements=DEFAULT_CACHED_STATEMENTS, shared_cache=True, busy_timeout=DEFAULT_BUSY_TIMEOUT):
+        self.path = Path(path or medicine_db.DB_PATH).absolute()
+        self.mmap_size = mmap_size
+        self.cache_kib = cache_kib
+        self.cached_statements = cached_statements
+        self.shared_cache = shared_cache
+        self.busy_timeout = busy_timeout
+
+        # Read-only connections cannot migrate, so bring the schema up to date first
+        medicine_db.connect(self.path).close()
+
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        # Readers of live threads only: a thread's reader dies with its thread-local storage
+        self._readers = weakref.WeakSet()
+        self._writer = None
+
+    def _check_fork(self):
+        # SQLite connections must not cross fork; a child starts with no connections
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _open_reader(self):
+        uri = f"{self.path.as_uri()}?mode=ro" + ("&cache=shared" if self.shared_cache else "")
+        conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_kib)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        return conn
+
+    def reader(self):
+        """This thread's read-only connection, opened on first use and closed when the thread exits"""
+        self._check_fork()
+        reader = getattr(self._local, 'reader', None)
+        if reader is None:
+            reader = self._local.reader = _Reader(self._open_reader())
+            with self._lock:
+                self._readers.add(reader)
+        return reader.conn
+
+    def _open_writer(self):
+        conn = sqlite3.connect(str(self.path), timeout=self.busy_timeout, check_same_thread=False,
+                               cached_statements=self.cached_statements)
+        conn.row_factory = sqlite3.Row
+        # WAL lets the pooled readers keep reading while an import writes
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = {-int(self.cache_kib)}")
+        return conn
+
+    @contextmanager
+    def writer(self):
+        """The single writer connection, held exclusively for the duration of the block
+
+        Transactions are the caller's: commit inside the block. Anything left
+        uncommitted when the block exits is rolled back.
+        """
+        self._check_fork()
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            try:
+                yield self._writer
+            finally:
+                if self._writer.in_transaction:
+                    self._writer.rollback()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'path': str(self.path),
+                'readers': len(self._readers),
+                'writer_open': self._writer is not None,
+                'shared_cache': self.shared_cache,
+                'mmap_size': self.mmap_size,
+                'cached_statements': self.cached_statements,
+            }
+
+    def close(self):
+        """Close every connection of this process; threads reopen readers on next use"""
+        with self._lock, self._write_lock:
+            if self._pid == os.getpid():
+                for reader in list(self._readers):
+                    reader.close()
+                if self._writer is not None:
+                    self._writer.close()
+            self._reset()
+
+
+_shared_pool = None
+_shared_pool_lock = threading.Lock()
+
+
+def shared_pool():
+    """The process-wide pool over medicine_database.db (or MEDICINE_DB_PATH)"""
+    global _shared_pool
+    if _shared_pool is None:
+        with _shared_pool_lock:
+            if _shared_pool is None:
+                _shared_pool = DatabasePool()
+    return _shared_pool
+
+
+def main():
+    """Compare a fresh connection per lookup with the pooled reader"""
+    from medicine_search import medicines_by_indication
+
+    lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    pool = shared_pool()
+    conn = pool.reader()
+    indication = (conn.execute("SELECT name FROM symptoms LIMIT 1").fetchone() or ["headache"])[0]
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        fresh = medicine_db.connect()
+        medicines_by_indication(fresh, indication, 5)
+        fresh.close()
+    per_connect = (time.perf_counter() - started) / lookups
+
+    started = time.perf_counter()
+    for _ in range(lookups):
+        medicines_by_indication(pool.reader(), indication, 5)
+    pooled = (time.perf_counter() - started) / lookups
+
+    print(f"🗄️  {lookups} lookups for '{indication}'")
+    print(f"   • Connection per lookup: {per_connect * 1000:.3f}ms")
+    print(f"   • Pooled reader: {pooled * 1000:.3f}ms ({per_connect / pooled:.1f}x faster)")
+    pool.close()
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -23,7 +23,13 @@ BACKEND_PID=$!
 # Start AI service
 echo "🟢 Starting AI Service..."
 cd /app/ai_service
-python new_backend.py &
+if [ "${AI_SERVICE_MODE:-production}" = "production" ]; then
+    # Pre-fork workers sized to the container's CPU quota (see ai_workers.py)
+    python /app/ai_workers.py || true
+    gunicorn -c /app/ai_workers.py new_backend:app &
+else
+    python new_backend.py &
+fi
 AI_PID=$!
 
 # Start frontend (serve static files)
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - GPT Client
+Asynchronous call path for /ai/gpt-analyze and GPT medicine recommendations:
+bounded concurrency, token-bucket rate limiting, deduplication of identical
+in-flight prompts, a persistent prompt cache and a local analyzer fallback.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from async_http import ConnectionPool
+from cache_backends import SQLiteBackend
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_CACHE_PATH = Path(tempfile.gettempdir()) / "healthcare_gpt_cache.db"
+DEFAULT_CACHE_TTL = 7 * 24 * 3600
+
+SYSTEM_PROMPT = (
+    "You are a careful medical information assistant. Reply with a JSON object containing "
+    "'summary', 'possible_conditions', 'recommendations' and 'seek_medical_attention'. "
+    "Always advise consulting a healthcare professional."
+)
+
+PROMPTS = {
+    'analyze': "Analyse these symptoms: {symptoms}",
+    'medicine_recommendations': (
+        "Suggest conventional and natural medicine options, with dosage notes and safety "
+        "warnings, for these symptoms: {symptoms}"
+    ),
+}
+
+
+class TokenBucket:
+    """Token bucket allowing `rate_per_minute` calls on average with bursts up to `capacity`"""
+
+    def __init__(self, rate_per_minute, capacity=None, clock=time.monotonic):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 6)
+        self.tokens = float(self.capacity)
+        self.clock = clock
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+class AsyncGPTClient:
+    """OpenAI-compatible chat client tuned for the AI service
+
+    Configuration comes from the same environment variables as the rest of the
+    GPT integration (OPENAI_API_KEY, AI_MODEL, AI_MAX_TOKENS, AI_TEMPERATURE,
+    MAX_REQUESTS_PER_MINUTE), plus OPENAI_BASE_URL to point at a local mock,
+    GPT_MAX_CONCURRENCY and GPT_TIMEOUT.
+
+    `fallback(kind, symptoms)` produces an answer when GPT is unavailable,
+    times out or fails; results carry a 'source' of gpt, cache or fallback.
+    The fallback and the SQLite prompt cache block, so they run in the loop's
+    default executor rather than on the event loop itself.
+    """
+
+    def __init__(self, api_key=None, base_url=None, model=None, max_tokens=None, temperature=None,
+                 max_concurrency=None, requests_per_minute=None, timeout=None,
+                 cache_path=DEFAULT_CACHE_PATH, cache_ttl=DEFAULT_CACHE_TTL, fallback=None):
+        env = os.environ
+        self.api_key = api_key if api_key is not None else env.get('OPENAI_API_KEY')
+        self.base_url = (base_url or env.get('OPENAI_BASE_URL') or DEFAULT_BASE_URL).rstrip('/')
+        self.model = model or env.get('AI_MODEL', 'gpt-3.5-turbo')
+        self.max_tokens = int(max_tokens or env.get('AI_MAX_TOKENS', 1000))
+        self.temperature = float(temperature if temperature is not None else env.get('AI_TEMPERATURE', 0.3))
+        self.max_concurrency = int(max_concurrency or env.get('GPT_MAX_CONCURRENCY', 8))
+        self.requests_per_minute = int(requests_per_minute or env.get('MAX_REQUESTS_PER_MINUTE', 60))
+        self.timeout = float(timeout or env.get('GPT_TIMEOUT', 20))
+        self.cache = SQLiteBackend(cache_path) if cache_path else None
+        self.cache_ttl = cache_ttl
+        self.fallback = fallback
+
+        self._semaphore = None
+        self._bucket = None
+        self._pool = None
+        self._inflight = {}
+        self.stats = {'calls': 0, 'cache_hits': 0, 'deduplicated': 0, 'fallbacks': 0, 'errors': 0}
+
+    @property
+    def available(self):
+        """GPT is usable with an API key, or without one against a local endpoint"""
+        return bool(self.api_key) or self.base_url != DEFAULT_BASE_URL
+
+    def _ensure_started(self):
+        # asyncio primitives must be created inside the loop that uses them
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._bucket = TokenBucket(self.requests_per_minute)
+            self._pool = ConnectionPool(connections_per_host=self.max_concurrency, timeout=self.timeout)
+
+    def _messages(self, kind, symptoms):
+        # Normalized so trivially different phrasings share cache entries and in-flight calls
+        prompt = PROMPTS[kind].format(symptoms=" ".join(symptoms.lower().split()))
+        return [{'role': 'system', 'content': SYSTEM_PROMPT}, {'role': 'user', 'content': prompt}]
+
+    def _cache_key(self, messages):
+        material = json.dumps([self.model, self.temperature, self.max_tokens, messages], sort_keys=True)
+        return "gpt|" + hashlib.sha256(material.encode()).hexdigest()
+
+    async def _call(self, messages):
+        self._ensure_started()
+        await self._bucket.acquire()
+        async with self._semaphore:
+            self.stats['calls'] += 1
+            headers = {'Authorization': f"Bearer {self.api_key}"} if self.api_key else {}
+            response = await self._pool.post(
+                f"{self.base_url}/chat/completions",
+                json_body={
+                    'model': self.model,
+                    'messages': messages,
+                    'max_tokens': self.max_tokens,
+                    'temperature': self.temperature,
+                },
+                headers=headers,
+                timeout=self.timeout,
+            )
+        if response.status != 200:
+            raise RuntimeError(f"GPT request failed with HTTP {response.status}: {response.text[:200]}")
+        content = response.json()['choices'][0]['message']['content']
+        try:
+            return json.loads(content)
+        except ValueError:
+            return {'summary': content}
+
+    async def complete(self, kind, symptoms):
+        """Answer one prompt, sharing the work with identical prompts already in flight"""
+        messages = self._messages(kind, symptoms)
+        key = self._cache_key(messages)
+
+        if self.cache is not None:
+            cached = await asyncio.to_thread(self.cache.get, key)
+            if cached is not None:
+                self.stats['cache_hits'] += 1
+                return {'success': True, 'source': 'cache', 'model': self.model, 'analysis': json.loads(cached)}
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats['deduplicated'] += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._complete_uncached(kind, symptoms, messages, key)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so a future nobody else awaited does not log a warning
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _complete_uncached(self, kind, symptoms, messages, key):
+        if not self.available:
+            return await self._fallback(kind, symptoms, 'GPT is not configured')
+        try:
+            analysis = await asyncio.wait_for(self._call(messages), self.timeout)
+        except asyncio.TimeoutError:
+            return await self._fallback(kind, symptoms, 'timeout')
+        except Exception as e:
+            self.stats['errors'] += 1
+            return await self._fallback(kind, symptoms, str(e))
+
+        if self.cache is not None:
+            await asyncio.to_thread(self.cache.set, key, json.dumps(analysis).encode(), self.cache_ttl)
+        return {'success': True, 'source': 'gpt', 'model': self.model, 'analysis': analysis}
+
+    async def _fallback(self, kind, symptoms, reason):
+        self.stats['fallbacks'] += 1
+        if self.fallback is None:
+            return {'success': False, 'source': 'fallback', 'message': f"GPT unavailable: {reason}"}
+        return {
+            'success': True,
+            'source': 'fallback',
+            'fallback_reason': reason,
+            'analysis': await asyncio.to_thread(self.fallback, kind, symptoms),
+        }
+
+    async def analyze(self, symptoms):
+        return await self.complete('analyze', symptoms)
+
+    async def medicine_recommendations(self, symptoms):
+        return await self.complete('medicine_recommendations', symptoms)
+
+    async def close(self):
+        if self._pool is not None:
+            await self._pool.close()
+
+
+def symptom_analyzer_fallback(kind, symptoms):
+    """Answer from the local symptom analyzer when GPT cannot"""
+    from db_pool import shared_pool
+    from symptom_analysis import analyze_symptoms
+
+    return analyze_symptoms(symptoms, shared_pool().reader())
+
+
+class GPTService:
+    """Runs an AsyncGPTClient on a dedicated event loop for the synchronous Flask app
+
+    Calls from any number of request threads share one loop, so the concurrency
+    limit, rate limit, deduplication and connection pool apply across all of them.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or AsyncGPTClient(fallback=symptom_analyzer_fallback)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="gpt-client", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine, timeout=None):
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        return future.result(timeout)
+
+    def analyze(self, symptoms):
+        return self.run(self.client.analyze(symptoms))
+
+    def medicine_recommendations(self, symptoms):
+        return self.run(self.client.medicine_recommendations(symptoms))
+
+    def close(self):
+        self.run(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+def register_routes(app, service):
+    """Serve /ai/gpt-analyze and /ai/gpt-medicine-recommendations through a GPTService"""
+    from flask import jsonify, request
+
+    def _symptoms():
+        payload = request.get_json(silent=True) or {}
+        symptoms = payload.get('symptoms')
+        return symptoms if isinstance(symptoms, str) and symptoms.strip() else None
+
+    @app.route('/ai/gpt-analyze', methods=['POST'])
+    def gpt_analyze():
+        symptoms = _symptoms()
+        if symptoms is None:
+            return jsonify({'success': False, 'message': 'Symptoms are required'}), 400
+        return jsonify(service.analyze(symptoms))
+
+    @app.route('/ai/gpt-medicine-recommendations', methods=['POST'])
+    def gpt_medicine_recommendations():
+        symptoms = _symptoms()
+        if symptoms is None:
+            return jsonify({'success': False, 'message': 'Symptoms are required'}), 400
+        return jsonify(service.medicine_recommendations(symptoms))
+
+    return app
+
+
+async def measure_throughput(base_url, total, distinct, concurrency, latency):
+    """Fire `total` analyses over `distinct` prompts at a mock LLM and report throughput"""
+    from mock_llm_server import MockLLMServer
+
+    server = None
+    if base_url is None:
+        server = await MockLLMServer(port=0, latency=latency, jitter=0).start()
+        base_url = server.base_url
+
+    client = AsyncGPTClient(api_key='', base_url=base_url, max_concurrency=concurrency,
+                            requests_per_minute=10 ** 6, cache_path=None, timeout=latency * 10 + 5)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(client.analyze(f"symptom set {i % distinct}") for i in range(total)))
+    elapsed = time.perf_counter() - started
+    await client.close()
+    if server is not None:
+        await server.stop()
+
+    succeeded = sum(1 for result in results if result.get('success'))
+    print(f"📊 {total} analyses ({distinct} distinct) in {elapsed:.2f}s "
+          f"= {total / elapsed:.1f} req/s, {succeeded} succeeded")
+    print(f"   Upstream calls: {client.stats['calls']}, deduplicated: {client.stats['deduplicated']}, "
+          f"fallbacks: {client.stats['fallbacks']}")
+    return client.stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure GPT call path throughput against a mock LLM")
+    parser.add_argument('--base-url', help="OpenAI-compatible endpoint; starts a local mock when omitted")
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--distinct', type=int, default=50, help="Number of different prompts")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--latency', type=float, default=0.2, help="Mock completion latency in seconds")
+    args = parser.parse_args()
+    stats = asyncio.run(measure_throughput(args.base_url, args.requests, args.distinct, args.concurrency,
+                                           args.latency))
+    return stats['errors'] == 0
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Catalogue Import
+Streams vendor formulary dumps (CSV or JSON Lines, optionally gzipped) into
+the medicines table through a generator pipeline: read -> normalize ->
+batch -> upsert. Memory use does not grow with the input, duplicates are
+merged on `name`, and progress is checkpointed with every committed batch so
+an interrupted import resumes where it stopped.
+
+    python import_catalogue.py formulary.csv.gz --source "Vendor X"
+"""
+
+import argparse
+import csv
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from db_pool import DatabasePool
+from medicine_db import LIST_FIELDS
+from medicine_search import parse_list
+
+DEFAULT_BATCH_SIZE = 5000
+# Columns of the medicines table an import may set; id, source and last_updated are managed here
+COLUMNS = (
+    'name', 'generic_name', 'brand_names', 'category', 'description', 'dosage_forms', 'common_dosages',
+    'indications', 'contraindications', 'side_effects', 'interactions', 'warnings', 'pregnancy_category',
+    'controlled_substance', 'availability', 'price_range', 'manufacturer', 'approval_date',
+    'confidence_score',
+)
+LIST_SEPARATORS = (';', '|')
+
+_UPSERT_SQL = f"""
+    INSERT INTO medicines({', '.join(COLUMNS)}, source, last_updated)
+    VALUES ({', '.join('?' * len(COLUMNS))}, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(name) DO UPDATE SET
+        {', '.join(f'{column} = excluded.{column}' for column in COLUMNS[1:])},
+        source = excluded.source,
+        last_updated = CURRENT_TIMESTAMP
+"""
+
+_CHECKPOINT_SQL = """
+    INSERT INTO import_checkpoints(source, fingerprint, byte_offset, records, updated_at)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(source) DO UPDATE SET
+        fingerprint = excluded.fingerprint,
+        byte_offset = excluded.byte_offset,
+        records = excluded.records,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+class _TrackedLines:
+    """Iterate a binary file line by line, remembering the byte offset after the last line read"""
+
+    def __init__(self, raw, offset):
+        self.raw = raw
+        self.offset = offset
+
+    def __iter__(self):
+        for line in self.raw:
+            first = self.offset == 0
+            self.offset += len(line)
+            text = line.decode('utf-8', errors='replace')
+            yield text.lstrip('\ufeff') if first else text
+
+
+def _open(path):
+    return gzip.open(path, 'rb') if str(path).endswith('.gz') else open(path, 'rb')
+
+
+def detect_format(path):
+    name = str(path).lower().removesuffix('.gz')
+    return 'jsonl' if name.endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def fingerprint(path):
+    """Identifies one version of an input file, so a changed file is not resumed mid-way"""
+    stat = os.stat(path)
+    return hashlib.sha1(f"{Path(path).absolute()}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def read_records(path, fmt, start_offset=0):
+    """Yield (record dict, byte offset just after it), starting at `start_offset`"""
+    with _open(path) as raw:
+        if fmt == 'csv':
+            header_line = raw.readline()
+            header = next(csv.reader([header_line.decode('utf-8-sig')]))
+            fieldnames = [field.strip().lower().replace(' ', '_') for field in header]
+            offset = max(start_offset, len(header_line))
+            raw.seek(offset)
+            lines = _TrackedLines(raw, offset)
+            # csv.reader pulls exactly the lines of one record, so lines.offset is that record's end
+            for values in csv.reader(lines):
+                if values:
+                    yield dict(zip(fieldnames, values)), lines.offset
+        else:
+            raw.seek(start_offset)
+            lines = _TrackedLines(raw, start_offset)
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                yield (record if isinstance(record, dict) else {}), lines.offset
+
+
+def normalize_list(value):
+    """Any list representation (JSON array, list, or ;/|/, separated text) as a clean JSON array"""
+    if value is None:
+        items = []
+    elif isinstance(value, (list, tuple)):
+        items = [str(item) for item in value]
+    else:
+        text = str(value).strip()
+        separator = next((s for s in LIST_SEPARATORS if s in text), None)
+        items = text.split(separator) if separator and not text.startswith('[') else parse_list(text)
+    seen, cleaned = set(), []
+    for item in items:
+        item = " ".join(item.split())
+        if item and item.lower() not in seen:
+            seen.add(item.lower())
+            cleaned.append(item)
+    return json.dumps(cleaned)
+
+
+def normalize(records, source):
+    """Yield (row, offset) ready for upsert, or (None, offset) for records without a name"""
+    for record, offset in records:
+        record = {str(key).strip().lower().replace(' ', '_'): value for key, value in record.items()}
+        name = " ".join(str(record.get('name') or '').split())
+        if not name:
+            yield None, offset
+            continue
+        row = []
+        for column in COLUMNS:
+            value = record.get(column)
+            if column == 'name':
+                value = name
+            elif column in LIST_FIELDS:
+                value = normalize_list(value)
+            elif column == 'confidence_score':
+                try:
+                    value = min(1.0, max(0.0, float(value)))
+                except (TypeError, ValueError):
+                    value = 0.8
+            elif isinstance(value, (list, tuple)):
+                value = ", ".join(str(item) for item in value)
+            elif isinstance(value, str):
+                value = value.strip() or None
+            row.append(value)
+        row.append(source)
+        yield tuple(row), offset
+
+
+def batched(rows, batch_size):
+    """Group rows into batches of unique names; the last record for a name wins
+
+    Yields (rows, end_offset, records_seen, rejected).
+    """
+    batch, seen, rejected, offset = {}, 0, 0, 0
+    for row, offset in rows:
+        seen += 1
+        if row is None:
+            rejected += 1
+        else:
+            batch[row[0]] = row
+        if len(batch) >= batch_size:
+            yield list(batch.values()), offset, seen, rejected
+            batch, seen, rejected = {}, 0, 0
+    if batch or seen:
+        yield list(batch.values()), offset, seen, rejected
+
+
+def _tune(conn):
+    conn.execute("PRAGMA journal_mode = WAL")
+    # NORMAL is crash-safe under WAL; only the last transactions can be lost on power failure
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -65536")
+    conn.execute("PRAGMA temp_store = MEMORY")
+
+
+def import_file(path, conn, fmt=None, source=None, batch_size=DEFAULT_BATCH_SIZE, restart=False, log=print):
+    """Import one file, resuming from its checkpoint; returns a summary dict"""
+    fmt = fmt or detect_format(path)
+    key = str(Path(path).absolute())
+    source = source or Path(path).name
+    print_every = max(1, 100_000 // batch_size)
+    _tune(conn)
+
+    current = fingerprint(path)
+    start_offset, total = 0, 0
+    checkpoint = conn.execute(
+        "SELECT fingerprint, byte_offset, records FROM import_checkpoints WHERE source = ?", (key,)
+    ).fetchone()
+    if checkpoint and not restart:
+        if checkpoint[0] == current:
+            start_offset, total = checkpoint[1], checkpoint[2]
+            log(f"↩️  Resuming {Path(path).name} after {total:,} records (byte {start_offset:,})")
+        else:
+            log(f"⚠️  {Path(path).name} changed since its last import; starting from the beginning")
+
+    started = time.perf_counter()
+    upserted = rejected = 0
+    pipeline = batched(normalize(read_records(path, fmt, start_offset), source), batch_size)
+    for number, (rows, offset, seen, bad) in enumerate(pipeline, start=1):
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(_UPSERT_SQL, rows)
+            total += seen
+            conn.execute(_CHECKPOINT_SQL, (key, current, offset, total))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        upserted += len(rows)
+        rejected += bad
+        if number % print_every == 0:
+            elapsed = time.perf_counter() - started
+            log(f"   • {total:,} records ({upserted / elapsed:,.0f} rows/s)")
+
+    elapsed = time.perf_counter() - started
+    return {
+        'records': total,
+        'upserted': upserted,
+        'rejected': rejected,
+        'seconds': round(elapsed, 2),
+        'rows_per_second': round(upserted / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream a CSV/JSONL formulary dump into the medicine catalogue")
+    parser.add_argument('files', nargs='+', help="CSV or JSON Lines files, optionally .gz")
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help="Input format (default: from the extension)")
+    parser.add_argument('--db', help="Medicine database (default: medicine_database.db)")
+    parser.add_argument('--source', help="Value stored in medicines.source (default: the file name)")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument('--restart', action='store_true', help="Ignore checkpoints and import from the start")
+    args = parser.parse_args()
+
+    pool = DatabasePool(args.db)
+    try:
+        with pool.writer() as conn:
+            for path in args.files:
+                print(f"📥 Importing {path}...")
+                summary = import_file(path, conn, args.format, args.source, args.batch_size, args.restart)
+                print(f"✅ {summary['records']:,} records: {summary['upserted']:,} upserted, "
+                      f"{summary['rejected']:,} rejected, in {summary['seconds']}s "
+                      f"({summary['rows_per_second']:,.0f} rows/s)")
+    except (OSError, csv.Error) as e:
+        print(f"❌ Import failed: {e}")
+        return False
+    finally:
+        pool.close()
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Drug Interaction Graph
+In-memory, symmetric view of the drug_interactions table for fast safety checks.
+"""
+
+import sys
+import threading
+from array import array
+from itertools import combinations
+
+import medicine_db
+
+_INTERACTIONS_SQL = """
+    SELECT drug1, drug2, interaction_type, severity, description
+    FROM drug_interactions
+    ORDER BY id
+"""
+
+_VERSION_SQL = "SELECT MAX(last_updated) FROM drug_interactions"
+
+
+def canonical_drug_name(name):
+    """Canonical key for a drug name: case and surrounding whitespace do not matter"""
+    return " ".join((name or "").lower().split())
+
+
+def _pair_key(a, b):
+    """Pack an unordered pair of drug ids into one integer"""
+    return (a << 32) | b if a < b else (b << 32) | a
+
+
+class InteractionGraph:
+    """Drug interactions as a symmetric adjacency list in compressed sparse row form
+
+    Drug names map to integer ids. The neighbours of drug `i` are
+    `neighbors[offsets[i]:offsets[i + 1]]` and `edges` holds the matching index
+    into `interactions`, so every pair is stored once but reachable from both
+    sides. Pair lookups go through a dict keyed on the packed id pair.
+    """
+
+    def __init__(self, rows=(), version=None, base=None):
+        self.version = version
+        self.drug_ids = dict(base.drug_ids) if base else {}
+        self.names = list(base.names) if base else []
+        self.interactions = list(base.interactions) if base else []
+        self._pairs = dict(base._pairs) if base else {}
+        pair_count = len(self._pairs)
+
+        for drug1, drug2, interaction_type, severity, description in rows:
+            a, b = self._intern(drug1), self._intern(drug2)
+            if a == b:
+                continue
+            record = (self.names[a], self.names[b], interaction_type, severity, description)
+            key = _pair_key(a, b)
+            if key in self._pairs:
+                # Later rows supersede earlier ones for the same pair
+                self.interactions[self._pairs[key]] = record
+            else:
+                self._pairs[key] = len(self.interactions)
+                self.interactions.append(record)
+
+        if base is not None and len(self._pairs) == pair_count:
+            # Only existing pairs changed: edge indexes are unchanged, so the adjacency can be shared
+            self.offsets, self.neighbors, self.edges = base.offsets, base.neighbors, base.edges
+        else:
+            self._build_adjacency()
+
+    def updated(self, rows, version):
+        """A new graph with `rows` applied on top of this one, which is left untouched"""
+        return InteractionGraph(rows, version, base=self)
+
+    def _intern(self, name):
+        key = canonical_drug_name(name)
+        drug_id = self.drug_ids.get(key)
+        if drug_id is None:
+            drug_id = self.drug_ids[key] = len(self.names)
+            self.names.append(key)
+        return drug_id
+
+    def _build_adjacency(self):
+        degree = [0] * (len(self.names) + 1)
+        for key in self._pairs:
+            degree[key >> 32] += 1
+            degree[key & 0xFFFFFFFF] += 1
+
+        self.offsets = array('l', [0]) * (len(self.names) + 1)
+        for drug_id in range(len(self.names)):
+            self.offsets[drug_id + 1] = self.offsets[drug_id] + degree[drug_id]
+
+        self.neighbors = array('l', [0]) * (2 * len(self._pairs))
+        self.edges = array('l', [0]) * (2 * len(self._pairs))
+        cursor = array('l', self.offsets[:-1]) if self.names else array('l')
+        for key, edge in sorted(self._pairs.items()):
+            a, b = key >> 32, key & 0xFFFFFFFF
+            for source, target in ((a, b), (b, a)):
+                self.neighbors[cursor[source]] = target
+                self.edges[cursor[source]] = edge
+                cursor[source] += 1
+
+    def __len__(self):
+        return len(self.interactions)
+
+    def _as_dict(self, edge, drug=None):
+        drug1, drug2, interaction_type, severity, description = self.interactions[edge]
+        result = {
+            'drug1': drug1,
+            'drug2': drug2,
+            'interaction_type': interaction_type,
+            'severity': severity,
+            'description': description,
+        }
+        if drug is not None:
+            result['interacting_drug'] = drug2 if drug1 == drug else drug1
+        return result
+
+    def interaction(self, drug_a, drug_b):
+        """Return the interaction between two drugs, or None"""
+        a = self.drug_ids.get(canonical_drug_name(drug_a))
+        b = self.drug_ids.get(canonical_drug_name(drug_b))
+        if a is None or b is None:
+            return None
+        edge = self._pairs.get(_pair_key(a, b))
+        return None if edge is None else self._as_dict(edge)
+
+    def interactions_for(self, drug):
+        """Return every interaction involving `drug`, whichever column it was stored in"""
+        drug_id = self.drug_ids.get(canonical_drug_name(drug))
+        if drug_id is None:
+            return []
+        name = self.names[drug_id]
+        start, end = self.offsets[drug_id], self.offsets[drug_id + 1]
+        return [self._as_dict(edge, name) for edge in self.edges[start:end]]
+
+    def check_regimen(self, drugs):
+        """Return every pairwise interaction within a multi-drug regimen"""
+        ids = {self.drug_ids.get(canonical_drug_name(drug)) for drug in drugs}
+        ids.discard(None)
+        found = []
+        for a, b in combinations(sorted(ids), 2):
+            edge = self._pairs.get(_pair_key(a, b))
+            if edge is not None:
+                found.append(self._as_dict(edge))
+        return found
+
+
+def interaction_version(conn):
+    """Latest last_updated value in drug_interactions, used to detect changes"""
+    return conn.execute(_VERSION_SQL).fetchone()[0]
+
+
+def load_interaction_graph(conn):
+    """Build an InteractionGraph from the drug_interactions table"""
+    version = interaction_version(conn)
+    return InteractionGraph(conn.execute(_INTERACTIONS_SQL), version)
+
+
+class InteractionGraphStore:
+    """Holds the current InteractionGraph and rebuilds it when last_updated advances
+
+    Once a catalogue watcher keeps the graph current (`watched`), readers get
+    the published graph without a version query.
+    """
+
+    def __init__(self):
+        self._graph = None
+        self._lock = threading.Lock()
+        self.watched = False
+
+    @property
+    def current(self):
+        return self._graph
+
+    def publish(self, graph):
+        """Atomically replace the graph readers see"""
+        self._graph = graph
+
+    def get(self, conn):
+        """Return an up-to-date graph; readers never see a half-built one"""
+        graph = self._graph
+        if graph is not None and (self.watched or graph.version == interaction_version(conn)):
+            return graph
+        with self._lock:
+            if self._graph is None or self._graph.version != interaction_version(conn):
+                self._graph = load_interaction_graph(conn)
+            return self._graph
+
+
+interaction_graphs = InteractionGraphStore()
+
+
+def main():
+    """Check a regimen for interactions from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python interaction_graph.py <drug> [<drug> ...]")
+        return False
+
+    conn = medicine_db.connect()
+    graph = interaction_graphs.get(conn)
+    conn.close()
+
+    drugs = sys.argv[1:]
+    found = graph.check_regimen(drugs) if len(drugs) > 1 else graph.interactions_for(drugs[0])
+    print(f"💊 {len(graph)} known interactions, {len(found)} relevant to: {', '.join(drugs)}")
+    for item in found:
+        print(f"   ⚠️  {item['drug1']} + {item['drug2']}: {item['severity'] or 'unknown severity'}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
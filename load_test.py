@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Load Generator
+Drives the AI service endpoints with asyncio over pooled keep-alive
+connections, in closed-loop (fixed concurrency) or open-loop (constant RPS)
+mode, and reports latency percentiles, error rates and achieved throughput.
+
+Open-loop latencies are measured from each request's scheduled send time,
+so a stalled server shows up in the tail instead of silently lowering the
+request rate (coordinated omission).
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+
+from async_http import ConnectionPool
+
+DEFAULT_BASE_URL = "http://localhost:5001"
+
+# The endpoints exercised by test_ai_integration.py, each with a few payloads to rotate through
+ENDPOINTS = {
+    'medicine-search': ('POST', '/ai/medicine-search', [
+        {"query": "headache pain", "limit": 5},
+        {"query": "fever", "limit": 5},
+        {"query": "cough cold", "limit": 5},
+    ]),
+    'enhanced-medicine-recommendations': ('POST', '/ai/enhanced-medicine-recommendations', [
+        {"symptoms": "fever headache fatigue", "user_id": "load_test"},
+        {"symptoms": "cough sore throat", "user_id": "load_test"},
+    ]),
+    'enhanced-recommendations': ('POST', '/ai/enhanced-recommendations', [
+        {"symptoms": "headache and stress", "treatment_type": "both"},
+        {"symptoms": "anxiety and insomnia", "treatment_type": "naturopathy"},
+        {"symptoms": "fever and cough", "treatment_type": "allopathy"},
+    ]),
+    'medicines-by-indication': ('POST', '/ai/medicines-by-indication', [
+        {"indication": "pain relief", "limit": 5},
+        {"indication": "allergy", "limit": 5},
+    ]),
+    'predict': ('POST', '/predict', [
+        {"symptoms": "cough fever sore throat"},
+        {"symptoms": "headache nausea"},
+    ]),
+    'combined': ('POST', '/combined', [
+        {"symptoms": "anxiety stress insomnia"},
+        {"symptoms": "fever body ache"},
+    ]),
+    'comprehensive-symptom-analysis': ('POST', '/ai/comprehensive-symptom-analysis', [
+        {"symptoms": "headache fever", "user_id": "load_test"},
+        {"symptoms": "stomach pain nausea", "user_id": "load_test"},
+    ]),
+}
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies in microseconds
+
+    Values are bucketed with `significant_bits` bits of precision (11 bits is
+    better than 0.1% relative error), so memory stays constant however many
+    samples are recorded and histograms from several runs can be merged.
+    """
+
+    def __init__(self, significant_bits=11):
+        self.significant_bits = significant_bits
+        self.counts = Counter()
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _bucket(self, value):
+        shift = max(0, value.bit_length() - self.significant_bits)
+        return (value >> shift) << shift, shift
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[self._bucket(value)[0]] += 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Latency in milliseconds at percentile `p` (0-100)"""
+        if not self.total:
+            return 0.0
+        rank = max(1, round(p / 100.0 * self.total))
+        seen = 0
+        for lowest in sorted(self.counts):
+            seen += self.counts[lowest]
+            if seen >= rank:
+                _, shift = self._bucket(lowest)
+                # Report the middle of the bucket, never beyond the observed extremes
+                value = min(max(lowest + (1 << shift) // 2, self.min), self.max)
+                return value / 1000.0
+        return self.max / 1000.0
+
+    def summary(self):
+        return {
+            **{f"p{p:g}": round(self.percentile(p), 3) for p in PERCENTILES},
+            'min': round((self.min or 0) / 1000.0, 3),
+            'max': round(self.max / 1000.0, 3),
+            'mean': round(self.sum / self.total / 1000.0, 3) if self.total else 0.0,
+        }
+
+
+class LoadResult:
+    """Outcome of driving one endpoint"""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.latency = LatencyHistogram()
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.duration = 0.0
+
+    @property
+    def completed(self):
+        return self.latency.total
+
+    @property
+    def failed(self):
+        return sum(self.errors.values()) + sum(n for status, n in self.statuses.items() if status >= 400)
+
+    def summary(self):
+        return {
+            'endpoint': self.endpoint,
+            'requests': self.completed,
+            'errors': self.failed,
+            'error_rate': round(self.failed / self.completed, 4) if self.completed else 0.0,
+            'achieved_rps': round(self.completed / self.duration, 2) if self.duration else 0.0,
+            'duration_seconds': round(self.duration, 3),
+            'latency_ms': self.latency.summary(),
+            'status_counts': {str(status): n for status, n in sorted(self.statuses.items())},
+            'error_types': dict(self.errors),
+        }
+
+
+async def _send(pool, base_url, endpoint, index, result, timeout, scheduled=None):
+    method, path, payloads = ENDPOINTS[endpoint]
+    started = scheduled if scheduled is not None else time.perf_counter()
+    try:
+        response = await pool.request(method, base_url + path, json_body=payloads[index % len(payloads)],
+                                      timeout=timeout)
+        result.statuses[response.status] += 1
+    except asyncio.TimeoutError:
+        result.errors['timeout'] += 1
+    except Exception as e:
+        result.errors[type(e).__name__] += 1
+    # Failed requests count towards latency too, so errors cannot flatter the tail
+    result.latency.record(time.perf_counter() - started)
+
+
+async def run_closed_loop(pool, base_url, endpoint, concurrency, duration=None, requests=None, timeout=10):
+    """`concurrency` workers each send the next request as soon as the previous one completes"""
+    result = LoadResult(endpoint)
+    counter = iter(range(requests if requests is not None else sys.maxsize))
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async def worker():
+        for index in counter:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            await _send(pool, base_url, endpoint, index, result, timeout)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def run_open_loop(pool, base_url, endpoint, rps, duration, timeout=10):
+    """Send requests at a constant `rps` regardless of how fast responses come back"""
+    result = LoadResult(endpoint)
+    interval = 1.0 / rps
+    started = time.perf_counter()
+    tasks = []
+    for index in range(int(rps * duration)):
+        scheduled = started + index * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(_send(pool, base_url, endpoint, index, result, timeout, scheduled)))
+    await asyncio.gather(*tasks)
+    result.duration = time.perf_counter() - started
+    return result
+
+
+async def run_load_test(base_url=DEFAULT_BASE_URL, endpoints=None, mode='closed', concurrency=10,
+                        rps=50.0, duration=10.0, requests=None, connections=None, timeout=10):
+    """Drive each endpoint in turn and return {endpoint: summary}"""
+    pool = ConnectionPool(connections_per_host=connections or max(concurrency, 10), timeout=timeout)
+    summaries = {}
+    try:
+        for endpoint in endpoints or list(ENDPOINTS):
+            if mode == 'open':
+                result = await run_open_loop(pool, base_url, endpoint, rps, duration, timeout)
+            else:
+                result = await run_closed_loop(pool, base_url, endpoint, concurrency,
+                                               None if requests else duration, requests, timeout)
+            summaries[endpoint] = result.summary()
+    finally:
+        await pool.close()
+    return summaries
+
+
+def print_summaries(summaries):
+    print(f"{'Endpoint':<32} {'Reqs':>7} {'RPS':>8} {'Err%':>6} "
+          + " ".join(f"{f'p{p:g}':>9}" for p in PERCENTILES) + f" {'max':>9}")
+    for endpoint, s in summaries.items():
+        latency = s['latency_ms']
+        print(f"{endpoint:<32} {s['requests']:>7} {s['achieved_rps']:>8.1f} {s['error_rate'] * 100:>5.1f}% "
+              + " ".join(f"{latency[f'p{p:g}']:>7.1f}ms" for p in PERCENTILES) + f" {latency['max']:>7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the AI service endpoints")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL)
+    parser.add_argument('--endpoint', action='append', choices=sorted(ENDPOINTS),
+                        help="Endpoint to drive (repeatable); all of them by default")
+    parser.add_argument('--mode', choices=('closed', 'open'), default='closed',
+                        help="closed: fixed concurrency; open: constant request rate")
+    parser.add_argument('--concurrency', type=int, default=10, help="Workers in closed-loop mode")
+    parser.add_argument('--rps', type=float, default=50.0, help="Request rate in open-loop mode")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per endpoint")
+    parser.add_argument('--requests', type=int, help="Closed loop: stop after this many requests instead")
+    parser.add_argument('--connections', type=int, help="Keep-alive connections (default: concurrency)")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--json', metavar='PATH', help="Write the results as JSON for later comparison")
+    args = parser.parse_args()
+
+    print(f"🔥 Load testing {args.base_url} ({args.mode} loop, "
+          + (f"{args.rps:g} req/s" if args.mode == 'open' else f"{args.concurrency} workers") + ")")
+    summaries = asyncio.run(run_load_test(
+        args.base_url, args.endpoint, args.mode, args.concurrency, args.rps, args.duration,
+        args.requests, args.connections, args.timeout,
+    ))
+    print_summaries(summaries)
+
+    if args.json:
+        report = {
+            'timestamp': time.time(),
+            'base_url': args.base_url,
+            'mode': args.mode,
+            'concurrency': args.concurrency if args.mode == 'closed' else None,
+            'target_rps': args.rps if args.mode == 'open' else None,
+            'results': summaries,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Results written to {args.json}")
+
+    return all(s['requests'] and s['error_rate'] < 1.0 for s in summaries.values())
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
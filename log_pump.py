@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Log Pump
+Continuously drains the stdout/stderr pipes of every managed service so no
+child ever blocks on a full pipe buffer. Lines are prefixed with the service
+name, written to rotating per-service log files and kept in a bounded ring
+buffer per service for crash diagnostics.
+"""
+
+import logging
+import os
+import re
+import selectors
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_RING_SIZE = 200
+READ_SIZE = 64 * 1024
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+class _Stream:
+    """One pipe being drained: partial-line buffer plus where its lines go"""
+
+    def __init__(self, service, label, pipe):
+        self.service = service
+        self.label = label
+        self.pipe = pipe
+        self.pending = b""
+
+
+class LogPump:
+    """Drains child process pipes on a background thread
+
+    On POSIX a single thread multiplexes every pipe with a selector; on
+    Windows, where pipes cannot be selected, each pipe gets its own reader
+    thread. Either way the children never stall on output.
+    """
+
+    def __init__(self, log_dir, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 ring_size=DEFAULT_RING_SIZE, echo=False):
+        self.log_dir = Path(log_dir)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.ring_size = ring_size
+        self.echo = echo
+        self._loggers = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._use_selector = os.name != 'nt'
+        self._selector = None
+        self._thread = None
+        self._wake_read = self._wake_write = None
+        self._pending = []
+        self._running = False
+
+    def _logger(self, service):
+        logger = self._loggers.get(service)
+        if logger is None:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            logger = logging.getLogger(f"services.{_slug(service)}")
+            logger.setLevel(logging.INFO)
+            logger.propagate = False
+            # A previous pump in this process may have left its handlers behind
+            for handler in list(logger.handlers):
+                logger.removeHandler(handler)
+                handler.close()
+            handler = RotatingFileHandler(
+                self.log_dir / f"{_slug(service)}.log",
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding='utf-8',
+            )
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            logger.addHandler(handler)
+            if self.echo:
+                logger.addHandler(logging.StreamHandler())
+            self._loggers[service] = logger
+            self._recent[service] = deque(maxlen=self.ring_size)
+        return logger
+
+    def add(self, service, process):
+        """Start draining a process's stdout and stderr (whichever are pipes)"""
+        with self._lock:
+            self._logger(service)
+        for label, pipe in (("stdout", process.stdout), ("stderr", process.stderr)):
+            if pipe is not None:
+                self._add_stream(_Stream(service, label, pipe))
+
+    def _add_stream(self, stream):
+        if not self._use_selector:
+            thread = threading.Thread(target=self._drain_blocking, args=(stream,),
+                                      name=f"log-pump-{_slug(stream.service)}-{stream.label}", daemon=True)
+            thread.start()
+            return
+        self._ensure_thread()
+        os.set_blocking(stream.pipe.fileno(), False)
+        with self._lock:
+            self._pending.append(stream)
+        os.write(self._wake_write, b"\0")
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._selector = selectors.DefaultSelector()
+            self._wake_read, self._wake_write = os.pipe()
+            os.set_blocking(self._wake_read, False)
+            self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="log-pump", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while self._running:
+            for key, _ in self._selector.select(timeout=1.0):
+                if key.data is None:
+                    self._register_pending()
+                else:
+                    self._read(key.data)
+        self._selector.close()
+
+    def _register_pending(self):
+        try:
+            while os.read(self._wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for stream in pending:
+            self._selector.register(stream.pipe.fileno(), selectors.EVENT_READ, stream)
+
+    def _read(self, stream):
+        try:
+            data = os.read(stream.pipe.fileno(), READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if data:
+            self._feed(stream, data)
+            return
+        # EOF: the child closed this pipe (usually because it exited)
+        self._selector.unregister(stream.pipe.fileno())
+        self._flush(stream)
+        stream.pipe.close()
+
+    def _drain_blocking(self, stream):
+        raw = getattr(stream.pipe, 'buffer', stream.pipe)
+        for data in iter(lambda: raw.read1(READ_SIZE), b""):
+            self._feed(stream, data)
+        self._flush(stream)
+        stream.pipe.close()
+
+    def _feed(self, stream, data):
+        *lines, stream.pending = (stream.pending + data).split(b"\n")
+        for line in lines:
+            self._emit(stream, line)
+
+    def _flush(self, stream):
+        if stream.pending:
+            self._emit(stream, stream.pending)
+            stream.pending = b""
+
+    def _emit(self, stream, raw_line):
+        text = raw_line.rstrip(b"\r").decode('utf-8', errors='replace')
+        line = f"[{stream.service}] {text}" if stream.label == "stdout" else f"[{stream.service}] [stderr] {text}"
+        with self._lock:
+            self._recent[stream.service].append(line)
+        self._loggers[stream.service].info(line)
+
+    def recent(self, service, limit=None):
+        """The most recent output lines of a service, oldest first"""
+        with self._lock:
+            lines = list(self._recent.get(service, ()))
+        return lines[-limit:] if limit else lines
+
+    def log_path(self, service):
+        return self.log_dir / f"{_slug(service)}.log"
+
+    def stop(self):
+        """Stop the selector thread; pipes still open are left to their owners"""
+        self._running = False
+        if self._thread is not None:
+            os.write(self._wake_write, b"\0")
+            self._thread.join(timeout=2)
+            os.close(self._wake_read)
+            os.close(self._wake_write)
+            self._thread = None
+        for logger in self._loggers.values():
+            for handler in logger.handlers:
+                handler.flush()
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Medicine Catalogue
+In-memory Medicine records built once from the medicines table and its
+medicine_list_values items, so serving a result never re-parses list columns.
+"""
+
+import sys
+import threading
+from itertools import groupby
+
+import medicine_db
+from medicine_db import LIST_FIELDS
+
+# Every medicines column, in table order, which is also the order of keys in API responses
+MEDICINE_FIELDS = (
+    'id', 'name', 'generic_name', 'brand_names', 'category', 'description', 'dosage_forms', 'common_dosages',
+    'indications', 'contraindications', 'side_effects', 'interactions', 'warnings', 'pregnancy_category',
+    'controlled_substance', 'availability', 'price_range', 'manufacturer', 'approval_date', 'last_updated',
+    'source', 'confidence_score',
+)
+SCALAR_FIELDS = tuple(field for field in MEDICINE_FIELDS if field not in LIST_FIELDS)
+
+_MEDICINES_SQL = f"SELECT {', '.join(SCALAR_FIELDS)} FROM medicines"
+_LIST_VALUES_SQL = "SELECT medicine_id, field, value FROM medicine_list_values ORDER BY medicine_id, field, position"
+
+_MEDICINE_SQL = f"SELECT {', '.join(SCALAR_FIELDS)} FROM medicines WHERE id = ?"
+_MEDICINE_LIST_VALUES_SQL = """
+    SELECT medicine_id, field, value FROM medicine_list_values
+    WHERE medicine_id = ?
+    ORDER BY field, position
+"""
+
+_CHANGED_MEDICINES_SQL = f"SELECT {', '.join(SCALAR_FIELDS)} FROM medicines WHERE last_updated > ? OR id > ?"
+_CHANGED_LIST_VALUES_SQL = """
+    SELECT l.medicine_id, l.field, l.value
+    FROM medicines m
+    JOIN medicine_list_values l ON l.medicine_id = m.id
+    WHERE m.last_updated > ? OR m.id > ?
+    ORDER BY l.medicine_id, l.field, l.position
+"""
+
+_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(last_updated) FROM medicines),
+        (SELECT MAX(id) FROM medicines)
+"""
+
+
+class Medicine:
+    """One catalogue entry; list columns are tuples of their items"""
+
+    __slots__ = MEDICINE_FIELDS
+
+    def __init__(self, **values):
+        for field in MEDICINE_FIELDS:
+            setattr(self, field, values.get(field, () if field in LIST_FIELDS else None))
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a Medicine from a row of SCALAR_FIELDS; list fields start empty"""
+        return cls(**dict(zip(SCALAR_FIELDS, row)))
+
+    def __eq__(self, other):
+        if not isinstance(other, Medicine):
+            return NotImplemented
+        return all(getattr(self, field) == getattr(other, field) for field in MEDICINE_FIELDS)
+
+    __hash__ = None
+
+    def to_dict(self):
+        """The JSON shape returned by the AI service; a fresh dict the caller may modify"""
+        medicine = {}
+        for field in MEDICINE_FIELDS:
+            value = getattr(self, field)
+            medicine[field] = list(value) if field in LIST_FIELDS else value
+        return medicine
+
+
+def _attach_list_values(medicines, rows):
+    """Fill list fields from (medicine_id, field, value) rows ordered by medicine, field and position"""
+    for (medicine_id, field), items in groupby(rows, key=lambda row: (row[0], row[1])):
+        medicine = medicines.get(medicine_id)
+        if medicine is not None and field in LIST_FIELDS:
+            setattr(medicine, field, tuple(item[2] for item in items))
+
+
+def medicine_version(conn):
+    """Latest last_updated and highest id in medicines, used to detect changes"""
+    return tuple(conn.execute(_VERSION_SQL).fetchone())
+
+
+def load_medicine(conn, medicine_id):
+    """Read a single Medicine straight from the database, or None"""
+    row = conn.execute(_MEDICINE_SQL, (medicine_id,)).fetchone()
+    if row is None:
+        return None
+    medicine = Medicine.from_row(row)
+    _attach_list_values({medicine_id: medicine}, conn.execute(_MEDICINE_LIST_VALUES_SQL, (medicine_id,)))
+    return medicine
+
+
+def _canonical_name(name):
+    return " ".join((name or "").lower().split())
+
+
+class MedicineCatalogue:
+    """Every medicine by id and by canonical name"""
+
+    def __init__(self, medicines=(), version=None):
+        self.version = version
+        self.by_id = {medicine.id: medicine for medicine in medicines}
+        self.by_name = {_canonical_name(medicine.name): medicine for medicine in self.by_id.values()}
+
+    def updated(self, changed, removed_ids=(), version=None):
+        """A new catalogue with `changed` medicines replaced or added and `removed_ids` dropped
+
+        This catalogue is left untouched, so readers holding it are unaffected.
+        """
+        catalogue = MedicineCatalogue(version=version)
+        catalogue.by_id = dict(self.by_id)
+        catalogue.by_name = dict(self.by_name)
+        for medicine_id in (*removed_ids, *(medicine.id for medicine in changed)):
+            old = catalogue.by_id.pop(medicine_id, None)
+            if old is not None and catalogue.by_name.get(_canonical_name(old.name)) is old:
+                del catalogue.by_name[_canonical_name(old.name)]
+        for medicine in changed:
+            catalogue.by_id[medicine.id] = medicine
+            catalogue.by_name[_canonical_name(medicine.name)] = medicine
+        return catalogue
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get(self, medicine_id, conn=None):
+        """Return the Medicine with `medicine_id`; rows newer than the snapshot are read from `conn`"""
+        medicine = self.by_id.get(medicine_id)
+        if medicine is None and conn is not None:
+            medicine = load_medicine(conn, medicine_id)
+        return medicine
+
+    def find(self, name):
+        """Return the Medicine called `name`, ignoring case and extra whitespace, or None"""
+        return self.by_name.get(_canonical_name(name))
+
+
+def load_medicine_catalogue(conn):
+    """Build a MedicineCatalogue from the medicines table"""
+    version = medicine_version(conn)
+    medicines = {row[0]: Medicine.from_row(row) for row in conn.execute(_MEDICINES_SQL)}
+    _attach_list_values(medicines, conn.execute(_LIST_VALUES_SQL))
+    return MedicineCatalogue(medicines.values(), version)
+
+
+def load_changed_medicines(conn, since, after_id):
+    """Medicines updated after `since` or added after `after_id`, as a list"""
+    medicines = {row[0]: Medicine.from_row(row)
+                 for row in conn.execute(_CHANGED_MEDICINES_SQL, (since, after_id))}
+    if medicines:
+        _attach_list_values(medicines, conn.execute(_CHANGED_LIST_VALUES_SQL, (since, after_id)))
+    return list(medicines.values())
+
+
+class MedicineCatalogueStore:
+    """Holds the current MedicineCatalogue and rebuilds it when the medicines table changes
+
+    Once a catalogue watcher keeps the catalogue current (`watched`), readers
+    get the published catalogue without a version query.
+    """
+
+    def __init__(self):
+        self._catalogue = None
+        self._lock = threading.Lock()
+        self.watched = False
+
+    @property
+    def current(self):
+        return self._catalogue
+
+    def publish(self, catalogue):
+        """Atomically replace the catalogue readers see"""
+        self._catalogue = catalogue
+
+    def get(self, conn):
+        """Return an up-to-date catalogue; readers never see a half-built one"""
+        catalogue = self._catalogue
+        if catalogue is not None and (self.watched or catalogue.version == medicine_version(conn)):
+            return catalogue
+        with self._lock:
+            if self._catalogue is None or self._catalogue.version != medicine_version(conn):
+                self._catalogue = load_medicine_catalogue(conn)
+            return self._catalogue
+
+
+medicine_catalogues = MedicineCatalogueStore()
+
+
+def main():
+    """Show a medicine record from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python medicine_catalogue.py <medicine name>")
+        return False
+
+    conn = medicine_db.connect()
+    catalogue = medicine_catalogues.get(conn)
+    conn.close()
+
+    medicine = catalogue.find(" ".join(sys.argv[1:]))
+    print(f"💊 {len(catalogue)} medicines in the catalogue")
+    if medicine is None:
+        print(f"❌ No medicine called '{' '.join(sys.argv[1:])}'")
+        return False
+    for field in MEDICINE_FIELDS:
+        value = getattr(medicine, field)
+        print(f"   • {field}: {', '.join(value) if field in LIST_FIELDS else value}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
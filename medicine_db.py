@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Medicine Database
+Opens medicine_database.db and keeps its schema up to date through ordered migrations.
+"""
+
+import logging
+import os
+import sqlite3
+from pathlib import Path
+
+# MEDICINE_DB_PATH points the services at another copy, e.g. a seeded benchmark database
+DB_PATH = Path(os.environ.get('MEDICINE_DB_PATH') or Path(__file__).parent.absolute() / "medicine_database.db")
+
+# medicines columns holding lists; each is mirrored item by item into medicine_list_values
+LIST_FIELDS = ('dosage_forms', 'indications', 'contraindications', 'side_effects', 'interactions')
+
+
+def _migration_001_search_index(conn):
+    """FTS5 index over the searchable medicine columns, kept in sync by triggers"""
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS medicines_fts USING fts5(
+            name, generic_name, brand_names, indications, description,
+            content='medicines',
+            content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_insert AFTER INSERT ON medicines BEGIN
+            INSERT INTO medicines_fts(rowid, name, generic_name, brand_names, indications, description)
+            VALUES (new.id, new.name, new.generic_name, new.brand_names, new.indications, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_delete AFTER DELETE ON medicines BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, brand_names, indications, description)
+            VALUES ('delete', old.id, old.name, old.generic_name, old.brand_names, old.indications, old.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicines_fts_update AFTER UPDATE ON medicines BEGIN
+            INSERT INTO medicines_fts(medicines_fts, rowid, name, generic_name, brand_names, indications, description)
+            VALUES ('delete', old.id, old.name, old.generic_name, old.brand_names, old.indications, old.description);
+            INSERT INTO medicines_fts(rowid, name, generic_name, brand_names, indications, description)
+            VALUES (new.id, new.name, new.generic_name, new.brand_names, new.indications, new.description);
+        END
+    """)
+    # Column weights for BM25: a hit on the name matters far more than one in the description
+    conn.execute(
+        "INSERT INTO medicines_fts(medicines_fts, rank) VALUES ('rank', 'bm25(10.0, 8.0, 6.0, 4.0, 1.0)')"
+    )
+    conn.execute("INSERT INTO medicines_fts(medicines_fts) VALUES ('rebuild')")
+
+
+def _migration_002_symptom_lookup(conn):
+    """Interned symptoms and covering indexes for indication and interaction lookups"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS symptoms (
+            id INTEGER PRIMARY KEY,
+            name TEXT UNIQUE NOT NULL
+        )
+    """)
+    conn.execute("ALTER TABLE symptom_medicine_mapping ADD COLUMN symptom_id INTEGER REFERENCES symptoms(id)")
+    conn.execute("""
+        INSERT OR IGNORE INTO symptoms(name)
+        SELECT DISTINCT lower(trim(symptom)) FROM symptom_medicine_mapping
+    """)
+    conn.execute("""
+        UPDATE symptom_medicine_mapping
+        SET symptom_id = (SELECT id FROM symptoms WHERE name = lower(trim(symptom_medicine_mapping.symptom)))
+    """)
+    for event in ("INSERT", "UPDATE OF symptom"):
+        trigger = "symptom_medicine_mapping_intern_" + event.split()[0].lower()
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {trigger} AFTER {event} ON symptom_medicine_mapping BEGIN
+                INSERT OR IGNORE INTO symptoms(name) VALUES (lower(trim(new.symptom)));
+                UPDATE symptom_medicine_mapping
+                SET symptom_id = (SELECT id FROM symptoms WHERE name = lower(trim(new.symptom)))
+                WHERE id = new.id;
+            END
+        """)
+    # Per-symptom medicine lists, pre-sorted by effectiveness: top-N is a range scan with no sort step
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_symptom_medicine_rank
+        ON symptom_medicine_mapping(symptom_id, effectiveness_score DESC, medicine_name, evidence_level)
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_symptom_medicine_medicine ON symptom_medicine_mapping(medicine_name)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_drug_interactions_drug1 ON drug_interactions(drug1, drug2)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_drug_interactions_drug2 ON drug_interactions(drug2, drug1)")
+
+
+def _migration_003_interaction_version(conn):
+    """Index drug_interactions.last_updated so change detection is a single index probe"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_drug_interactions_updated ON drug_interactions(last_updated)")
+
+
+def _migration_004_symptom_synonyms(conn):
+    """Synonyms used to recognise interned symptoms in free text"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS symptom_synonyms (
+            symptom_id INTEGER NOT NULL REFERENCES symptoms(id),
+            synonym TEXT NOT NULL,
+            PRIMARY KEY (symptom_id, synonym)
+        ) WITHOUT ROWID
+    """)
+
+
+def _migration_005_catalogue_version(conn):
+    """Index last_updated on medicines and symptom mappings for catalogue version checks"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_medicines_updated ON medicines(last_updated)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_symptom_medicine_updated ON symptom_medicine_mapping(last_updated)")
+
+
+def _migration_006_import_checkpoints(conn):
+    """Progress of bulk catalogue imports, committed together with each imported batch"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS import_checkpoints (
+            source TEXT PRIMARY KEY,
+            fingerprint TEXT NOT NULL,
+            byte_offset INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def _list_items_sql(column):
+    """SQL listing the items of a stored list column as json_each() input
+
+    JSON arrays are used as they are; comma separated text is rewritten into a
+    JSON array of strings, falling back to a single item if that is not valid.
+    """
+    as_array = (
+        f"'[\"' || replace(replace(replace(replace(replace(replace({column}, '\\', '\\\\'), '\"', '\\\"'), "
+        f"char(10), ' '), char(13), ' '), char(9), ' '), ',', '\",\"') || '\"]'"
+    )
+    return f"""
+        CASE
+            WHEN json_valid({column}) AND json_type({column}) = 'array' THEN {column}
+            WHEN json_valid({as_array}) THEN {as_array}
+            ELSE json_array({column})
+        END
+    """
+
+
+def _insert_list_values_sql(column, row='new'):
+    """INSERT adding the items of `row`.`column`: 'new' inside triggers, 'medicines' to backfill every row"""
+    source = "json_each" if row == 'new' else "medicines, json_each"
+    return f"""
+        INSERT INTO medicine_list_values(medicine_id, field, position, value)
+        SELECT {row}.id, '{column}', items.key, trim(CAST(items.value AS TEXT))
+        FROM {source}({_list_items_sql(f'{row}.{column}')}) AS items
+        WHERE trim(CAST(items.value AS TEXT)) != ''
+    """
+
+
+def _migration_007_list_values(conn):
+    """One row per list item of the list columns, so readers never split stored text"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS medicine_list_values (
+            medicine_id INTEGER NOT NULL REFERENCES medicines(id) ON DELETE CASCADE,
+            field TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (medicine_id, field, position)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_medicine_list_values_value ON medicine_list_values(field, value)")
+    for column in LIST_FIELDS:
+        conn.execute(_insert_list_values_sql(column, 'medicines'))
+
+    # The TEXT columns stay the write interface; triggers keep the items in step with them
+    inserts = ";".join(_insert_list_values_sql(column) for column in LIST_FIELDS)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS medicine_list_values_insert AFTER INSERT ON medicines BEGIN
+            {inserts};
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS medicine_list_values_update
+        AFTER UPDATE OF id, {', '.join(LIST_FIELDS)} ON medicines BEGIN
+            DELETE FROM medicine_list_values WHERE medicine_id = old.id;
+            {inserts};
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS medicine_list_values_delete AFTER DELETE ON medicines BEGIN
+            DELETE FROM medicine_list_values WHERE medicine_id = old.id;
+        END
+    """)
+
+
+# Applied in order; the position in this list is the schema version stored in PRAGMA user_version
+MIGRATIONS = [
+    _migration_001_search_index,
+    _migration_002_symptom_lookup,
+    _migration_003_interaction_version,
+    _migration_004_symptom_synonyms,
+    _migration_005_catalogue_version,
+    _migration_006_import_checkpoints,
+    _migration_007_list_values,
+]
+
+
+_CATALOGUE_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(last_updated) FROM medicines),
+        (SELECT MAX(last_updated) FROM symptom_medicine_mapping),
+        (SELECT MAX(last_updated) FROM drug_interactions)
+"""
+
+
+def catalogue_version(conn):
+    """Latest last_updated of every catalogue table; changes whenever the catalogue does"""
+    return tuple(conn.execute(_CATALOGUE_VERSION_SQL).fetchone())
+
+
+def schema_version(conn):
+    """Return the schema version recorded in the database"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply every pending migration, each one in its own transaction"""
+    version = schema_version(conn)
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        logging.info(f"🗄️  Applying medicine database migration {number}: {migration.__doc__}")
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return schema_version(conn)
+
+
+def connect(path=None, check_same_thread=True):
+    """Open the medicine database with row access by column name and an up-to-date schema"""
+    conn = sqlite3.connect(str(path or DB_PATH), check_same_thread=check_same_thread)
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    return conn
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    db = connect()
+    logging.info(f"✅ medicine_database.db is at schema version {schema_version(db)}")
+    db.close()
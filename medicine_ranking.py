@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Medicine Ranking
+Scores candidate medicines on text relevance, confidence_score,
+effectiveness_score and evidence_level, then selects only the top `limit`
+without sorting every candidate.
+
+Scoring is a weighted sum over candidate columns, done in one vectorized
+NumPy pass when NumPy is installed and the pool is large enough to benefit;
+selection uses argpartition (NumPy) or a bounded heap (standard library).
+Both paths return the same medicines in the same order.
+"""
+
+import heapq
+import random
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Weights of each signal; every signal is scaled to 0-1 before weighting
+SEARCH_WEIGHTS = {'relevance': 0.7, 'confidence': 0.3}
+INDICATION_WEIGHTS = {'effectiveness': 0.6, 'evidence': 0.25, 'confidence': 0.15}
+
+# Evidence grades (letter or word) on a 0-1 scale
+EVIDENCE_WEIGHTS = {
+    'a': 1.0, 'high': 1.0, 'strong': 1.0,
+    'b': 0.75, 'moderate': 0.75, 'medium': 0.75,
+    'c': 0.5, 'low': 0.5, 'limited': 0.5,
+    'd': 0.25, 'very low': 0.25, 'anecdotal': 0.25,
+}
+DEFAULT_EVIDENCE = 0.5
+# The medicines table default
+DEFAULT_CONFIDENCE = 0.8
+
+# Candidates fetched per requested result, so re-ranking has something to choose from
+CANDIDATE_FACTOR = 10
+MIN_CANDIDATES = 50
+MAX_CANDIDATES = 1000
+# Below this many candidates the NumPy call overhead outweighs the vectorization
+VECTORIZE_MIN = 256
+
+
+def candidate_limit(limit):
+    """How many candidates to fetch for a request of `limit` results"""
+    return max(limit, min(MAX_CANDIDATES, max(MIN_CANDIDATES, limit * CANDIDATE_FACTOR)))
+
+
+def evidence_weight(level):
+    if level is None:
+        return DEFAULT_EVIDENCE
+    return EVIDENCE_WEIGHTS.get(" ".join(str(level).lower().split()), DEFAULT_EVIDENCE)
+
+
+def _number(value, default):
+    """`value` as a float, or `default` when it is missing or not a number"""
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if number != number else number
+
+
+def _unit(value, default):
+    """`value` clamped to 0-1, or `default` when it is missing or not a number (as import_catalogue does)"""
+    return min(1.0, max(0.0, _number(value, default)))
+
+
+def candidate_columns(relevance=None, confidence=None, effectiveness=None, evidence=None):
+    """Raw per-candidate values as 0-1 signal columns; omitted signals are left out
+
+    Relevance (BM25, unbounded) is divided by the best relevance in the pool;
+    confidence and effectiveness are clamped to 0-1.
+    """
+    columns = {}
+    if relevance is not None:
+        relevance = [_number(value, 0.0) for value in relevance]
+        best = max(relevance, default=0.0)
+        columns['relevance'] = [max(0.0, value / best) if best > 0 else 0.0 for value in relevance]
+    if confidence is not None:
+        columns['confidence'] = [_unit(value, DEFAULT_CONFIDENCE) for value in confidence]
+    if effectiveness is not None:
+        columns['effectiveness'] = [_unit(value, 0.0) for value in effectiveness]
+    if evidence is not None:
+        columns['evidence'] = [evidence_weight(level) for level in evidence]
+    return columns
+
+
+def score(columns, weights):
+    """Weighted sum of the signal columns, one score per candidate"""
+    used = [(weights[name], column) for name, column in columns.items() if weights.get(name)]
+    count = len(next(iter(columns.values()), ()))
+    if np is not None and count >= VECTORIZE_MIN:
+        total = np.zeros(count)
+        for weight, column in used:
+            total += weight * np.asarray(column, dtype=float)
+        return total
+    return [sum(weight * column[index] for weight, column in used) for index in range(count)]
+
+
+def top_k(scores, k):
+    """Indexes of the `k` highest scores, best first; ties keep candidate order
+
+    O(n) selection plus a sort of the k winners, never a sort of all n.
+    """
+    count = len(scores)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    if np is not None and isinstance(scores, np.ndarray):
+        kth = np.partition(scores, count - k)[count - k]
+        above = np.flatnonzero(scores > kth)
+        ties = np.flatnonzero(scores == kth)[:k - len(above)]
+        chosen = np.concatenate([above, ties])
+        return chosen[np.lexsort((chosen, -scores[chosen]))].tolist()
+    # nlargest is stable: equal scores come out in candidate order
+    return heapq.nlargest(k, range(count), key=scores.__getitem__)
+
+
+def rank(candidates, columns, weights, limit):
+    """The best `limit` candidates under `weights`, best first"""
+    if not candidates or limit <= 0:
+        return []
+    return [candidates[index] for index in top_k(score(columns, weights), limit)]
+
+
+def main():
+    """Time top-k selection against a full sort on random candidate pools"""
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rng = random.Random(42)
+    print(f"🏁 Ranking top {limit} ({'NumPy' if np is not None else 'heapq'} selection)")
+    for count in (50, 1000, 10000, 100000):
+        columns = candidate_columns(
+            confidence=[rng.uniform(0.6, 1.0) for _ in range(count)],
+            effectiveness=[rng.random() for _ in range(count)],
+            evidence=[rng.choice("ABCD") for _ in range(count)],
+        )
+        started = time.perf_counter()
+        scores = score(columns, INDICATION_WEIGHTS)
+        best = top_k(scores, limit)
+        selected = time.perf_counter() - started
+
+        started = time.perf_counter()
+        plain = [sum(INDICATION_WEIGHTS[name] * column[index] for name, column in columns.items())
+                 for index in range(count)]
+        ordered = sorted(range(count), key=plain.__getitem__, reverse=True)[:limit]
+        sorted_time = time.perf_counter() - started
+
+        print(f"   • {count:>6} candidates: top-k {selected * 1000:8.2f}ms, full sort {sorted_time * 1000:8.2f}ms"
+              f"{'' if best == ordered else '  ❌ results differ'}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Medicine Search
+Catalogue lookups behind the AI service's /ai/medicine-search endpoint.
+"""
+
+import json
+import re
+import sys
+
+import medicine_db
+from catalogue_snapshot import CatalogueSnapshot
+from medicine_catalogue import Medicine, medicine_catalogues
+from medicine_ranking import INDICATION_WEIGHTS, SEARCH_WEIGHTS, candidate_columns, candidate_limit, rank
+
+_SEARCH_SQL = """
+    SELECT rowid, -rank AS relevance FROM medicines_fts
+    WHERE medicines_fts MATCH ?
+    ORDER BY rank
+    LIMIT ?
+"""
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_INDICATION_SQL = """
+    SELECT map.medicine_name, map.effectiveness_score, map.evidence_level, m.id
+    FROM symptoms s
+    JOIN symptom_medicine_mapping map ON map.symptom_id = s.id
+    LEFT JOIN medicines m ON m.name = map.medicine_name
+    WHERE s.name = ?
+    ORDER BY map.effectiveness_score DESC
+    LIMIT ?
+"""
+
+
+def parse_list(value):
+    """Turn a stored list column (JSON array or comma separated text) into a list of strings"""
+    if not value:
+        return []
+    if value.lstrip().startswith('['):
+        try:
+            return [str(item) for item in json.loads(value)]
+        except ValueError:
+            pass
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def build_match_query(query):
+    """Build an FTS5 MATCH expression from free text, any term may match"""
+    terms = re.findall(r"\w+", query.lower())
+    # Quoting every term keeps user input from being read as FTS5 query syntax
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+def search_medicines(conn, query, limit=10):
+    """Return up to `limit` medicines matching `query`, best first
+
+    The best BM25 matches are re-ranked on relevance and confidence_score;
+    only the chosen medicines are converted to dicts.
+    """
+    match = build_match_query(query or "")
+    if not match or limit <= 0:
+        return []
+    catalogue = medicine_catalogues.get(conn)
+    candidates = []
+    for medicine_id, relevance in conn.execute(_SEARCH_SQL, (match, candidate_limit(limit))).fetchall():
+        medicine = catalogue.get(medicine_id, conn)
+        if medicine is not None:
+            candidates.append((medicine, relevance))
+    columns = candidate_columns(
+        relevance=[relevance for _, relevance in candidates],
+        confidence=[medicine.confidence_score for medicine, _ in candidates],
+    )
+    return [{**medicine.to_dict(), 'relevance': relevance}
+            for medicine, relevance in rank(candidates, columns, SEARCH_WEIGHTS, limit)]
+
+
+def parse_limit(value, default=DEFAULT_LIMIT):
+    """The result limit of a request, or None when it is not an integer between 1 and MAX_LIMIT"""
+    if value is None:
+        return default
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= MAX_LIMIT:
+        return None
+    return value
+
+
+def _lookup_response(medicines):
+    return {'success': True, 'medicines': medicines, 'total_results': len(medicines)}
+
+
+def medicine_search_response(conn, query, limit=DEFAULT_LIMIT, cache=None):
+    """Response of /ai/medicine-search, served from `cache` (a ResponseCache) when given
+
+    Cache keys use the normalized query, so "Pain  Headache" shares the entry of "headache pain".
+    """
+    def compute():
+        return _lookup_response(search_medicines(conn, query, limit))
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute('medicine-search', {'query': query, 'limit': limit}, compute)
+
+
+def normalize_symptom(text):
+    """Normalize a symptom or indication the way symptoms are interned in the database"""
+    return " ".join((text or "").lower().split())
+
+
+def medicines_by_indication(conn, indication, limit=10):
+    """Return the `limit` best medicines for an indication
+
+    Known symptoms are served from the effectiveness-ordered mapping index and
+    re-ranked on effectiveness, evidence level and confidence; anything else
+    falls back to a full-text search over the catalogue.
+    """
+    if limit <= 0:
+        return []
+    catalogue = medicine_catalogues.get(conn)
+    if isinstance(catalogue, CatalogueSnapshot):
+        # Served from the snapshot's posting lists without touching SQL
+        postings = catalogue.indication_postings(normalize_symptom(indication), candidate_limit(limit))
+    else:
+        rows = conn.execute(_INDICATION_SQL, (normalize_symptom(indication), candidate_limit(limit))).fetchall()
+        postings = [
+            (medicine_name, effectiveness_score, evidence_level,
+             catalogue.get(medicine_id, conn) if medicine_id is not None else None)
+            for medicine_name, effectiveness_score, evidence_level, medicine_id in rows
+        ]
+    if not postings:
+        return search_medicines(conn, indication, limit)
+
+    columns = candidate_columns(
+        effectiveness=[posting[1] for posting in postings],
+        evidence=[posting[2] for posting in postings],
+        confidence=[posting[3].confidence_score if posting[3] is not None else None for posting in postings],
+    )
+    medicines = []
+    for medicine_name, effectiveness_score, evidence_level, medicine in rank(postings, columns, INDICATION_WEIGHTS, limit):
+        if medicine is None:
+            # Mapped medicines missing from the catalogue are still returned by name
+            medicine = Medicine(name=medicine_name)
+        medicines.append({
+            'effectiveness_score': effectiveness_score,
+            'evidence_level': evidence_level,
+            **medicine.to_dict(),
+        })
+    return medicines
+
+
+def register_routes(app, cache=None):
+    """Register /ai/medicine-search and /ai/medicines-by-indication, answered through `cache` when given"""
+    from flask import jsonify, request
+
+    from db_pool import shared_pool
+
+    def lookup_params(field):
+        payload = request.get_json(silent=True) or {}
+        text = payload.get(field)
+        limit = parse_limit(payload.get('limit'))
+        if not isinstance(text, str) or not text.strip():
+            return None, (jsonify({'success': False, 'message': f"'{field}' is required"}), 400)
+        if limit is None:
+            message = f"'limit' must be an integer from 1 to {MAX_LIMIT}"
+            return None, (jsonify({'success': False, 'message': message}), 400)
+        return (text, limit), None
+
+    @app.route('/ai/medicine-search', methods=['POST'])
+    def medicine_search():
+        params, error = lookup_params('query')
+        return error or jsonify(medicine_search_response(shared_pool().reader(), *params, cache=cache))
+
+    @app.route('/ai/medicines-by-indication', methods=['POST'])
+    def medicines_for_indication():
+        params, error = lookup_params('indication')
+        return error or jsonify(indication_response(shared_pool().reader(), *params, cache=cache))
+
+    return app
+
+
+def indication_response(conn, indication, limit=DEFAULT_LIMIT, cache=None):
+    """Response of /ai/medicines-by-indication, served from `cache` (a ResponseCache) when given"""
+    def compute():
+        return _lookup_response(medicines_by_indication(conn, indication, limit))
+
+    if cache is None:
+        return compute()
+    return cache.get_or_compute('medicines-by-indication', {'indication': indication, 'limit': limit}, compute)
+
+
+def main():
+    """Search the catalogue from the command line"""
+    if len(sys.argv) < 2:
+        print("Usage: python medicine_search.py <query> [limit]")
+        return False
+
+    limit = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    conn = medicine_db.connect()
+    results = search_medicines(conn, sys.argv[1], limit)
+    conn.close()
+
+    print(f"🔍 {len(results)} results for '{sys.argv[1]}'")
+    for medicine in results:
+        print(f"   • {medicine['name']} ({medicine.get('category') or 'Unknown'}) - relevance {medicine['relevance']:.2f}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
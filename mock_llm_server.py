@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Mock LLM Server
+Local stand-in for the OpenAI chat completions API, so the GPT call path can be
+exercised and its throughput measured without network access or an API key.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+
+class MockLLMServer:
+    """Serves POST /v1/chat/completions with canned answers after a simulated delay"""
+
+    def __init__(self, host='127.0.0.1', port=8765, latency=0.5, jitter=0.1):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.completions = 0
+        self.max_concurrent = 0
+        self._active = 0
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/v1"
+
+    def _completion(self, payload):
+        messages = payload.get('messages') or [{}]
+        prompt = messages[-1].get('content', '')
+        content = json.dumps({
+            'summary': f"Mock analysis of: {prompt[:200]}",
+            'possible_conditions': ['common cold'],
+            'recommendations': ['Rest and stay hydrated'],
+            'seek_medical_attention': False,
+        })
+        return {
+            'id': f"mock-{self.completions}",
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': payload.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': 40},
+        }
+
+    async def _respond(self, method, path, body):
+        if method == 'GET' and path == '/stats':
+            return 200, {
+                'requests': self.requests,
+                'completions': self.completions,
+                'max_concurrent': self.max_concurrent,
+            }
+        if method == 'POST' and path.rstrip('/') == '/v1/chat/completions':
+            try:
+                payload = json.loads(body or b'{}')
+            except ValueError:
+                return 400, {'error': {'message': 'Invalid JSON body'}}
+            self._active += 1
+            self.max_concurrent = max(self.max_concurrent, self._active)
+            try:
+                await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+            finally:
+                self._active -= 1
+            self.completions += 1
+            return 200, self._completion(payload)
+        return 404, {'error': {'message': f"No route for {method} {path}"}}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                self.requests += 1
+                status, payload = await self._respond(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n".encode() + data
+                )
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except asyncio.CancelledError:
+            # Server is shutting down with this connection still open
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def serve_forever(self):
+        await self.start()
+        print(f"🤖 Mock LLM listening on {self.base_url} (latency {self.latency}s ± {self.jitter}s)")
+        async with self._server:
+            await self._server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenAI-compatible chat completions server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per completion")
+    parser.add_argument('--jitter', type=float, default=0.1, help="Random +/- seconds added to latency")
+    args = parser.parse_args()
+
+    server = MockLLMServer(args.host, args.port, args.latency, args.jitter)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n🛑 Mock LLM stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Process Groups and PID Files
+The service managers launch every service as the leader of its own process
+group and record it in run/<service>.pid, so stopping the app signals each
+group once instead of scanning every process on the host. Shutdown drains
+services that support it, then stops every group concurrently against one
+shared deadline.
+"""
+
+import json
+import os
+import re
+import signal
+import subprocess
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+RUN_DIR = Path(__file__).parent.absolute() / "run"
+IS_WINDOWS = os.name == 'nt'
+SHUTDOWN_TIMEOUT = 10.0
+# A manager stopping on SIGTERM shuts its services down against SHUTDOWN_TIMEOUT, plus time to wind down
+MANAGER_TIMEOUT = SHUTDOWN_TIMEOUT + 5.0
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def new_group_kwargs():
+    """Popen keyword arguments that make the child the leader of a new process group"""
+    if IS_WINDOWS:
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def pid_file_path(name, run_dir=RUN_DIR):
+    return Path(run_dir) / f"{_slug(name)}.pid"
+
+
+def write_pid_file(name, process, run_dir=RUN_DIR, drain_url=None):
+    """Record a freshly started service so it can be found without a process scan"""
+    path = pid_file_path(name, run_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    record = {
+        'name': name,
+        'pid': process.pid,
+        # A new session/group leader's group id is its own pid
+        'pgid': process.pid,
+        'started_at': time.time(),
+        'manager_pid': os.getpid(),
+        'drain_url': drain_url,
+    }
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(record))
+    os.replace(tmp, path)
+    return path
+
+
+def remove_pid_file(name, run_dir=RUN_DIR, record=None):
+    """Remove a service's PID file; with `record`, only while it still describes that same process group
+
+    A supervising manager may have restarted the service and recorded the new
+    group in the meantime, and that file must survive.
+    """
+    path = pid_file_path(name, run_dir)
+    if record is not None:
+        try:
+            current = json.loads(path.read_text())
+        except (OSError, ValueError):
+            return False
+        if (current.get('pid'), current.get('pgid')) != (record['pid'], record['pgid']):
+            return False
+    try:
+        path.unlink()
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def read_pid_files(run_dir=RUN_DIR):
+    """All recorded services; unreadable files are skipped"""
+    records = []
+    for path in sorted(Path(run_dir).glob("*.pid")):
+        try:
+            record = json.loads(path.read_text())
+            record['path'] = str(path)
+            records.append(record)
+        except (OSError, ValueError):
+            continue
+    return records
+
+
+def group_alive(pgid):
+    """Whether any process in the group still exists"""
+    if IS_WINDOWS:
+        result = subprocess.run(['tasklist', '/FI', f"PID eq {pgid}", '/NH'],
+                                capture_output=True, text=True)
+        return str(pgid) in result.stdout
+    try:
+        os.killpg(pgid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists but belongs to someone else
+        return True
+
+
+def process_alive(pid):
+    """Whether a process with this pid exists"""
+    if IS_WINDOWS:
+        result = subprocess.run(['tasklist', '/FI', f"PID eq {pid}", '/NH'],
+                                capture_output=True, text=True)
+        return str(pid) in result.stdout
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+
+def stop_manager(pid, timeout=MANAGER_TIMEOUT, poll_interval=0.05):
+    """SIGTERM a service manager and wait for it to shut its services down
+
+    The managers stop, drain and unrecord their own services on SIGTERM, and
+    stopping them first keeps their supervisors from restarting services that
+    are being stopped. A manager still running after `timeout` is killed.
+    Returns 'terminated', 'killed' or 'not running'.
+    """
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        return 'not running'
+    deadline = time.monotonic() + timeout
+    while process_alive(pid):
+        if time.monotonic() >= deadline:
+            try:
+                os.kill(pid, signal.SIGTERM if IS_WINDOWS else signal.SIGKILL)
+            except ProcessLookupError:
+                return 'terminated'
+            return 'killed'
+        time.sleep(poll_interval)
+    return 'terminated'
+
+
+def signal_group(pgid, force=False):
+    """SIGTERM (or SIGKILL with force) the whole group in one call; False if it is gone"""
+    if IS_WINDOWS:
+        command = ['taskkill', '/PID', str(pgid), '/T'] + (['/F'] if force else [])
+        return subprocess.run(command, capture_output=True).returncode == 0
+    try:
+        os.killpg(pgid, signal.SIGKILL if force else signal.SIGTERM)
+        return True
+    except ProcessLookupError:
+        return False
+
+
+def request_drain(url, timeout):
+    """Ask a service to drain and wait until its in-flight requests finish
+
+    The service answers POST/GET `url` with {"draining": bool, "in_flight": int}
+    (see service_drain.py). Returns True once it reports nothing in flight.
+    """
+    deadline = time.monotonic() + timeout
+    method = 'POST'
+    delay = 0.02
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            req = urllib.request.Request(url, data=b'' if method == 'POST' else None, method=method)
+            with urllib.request.urlopen(req, timeout=min(remaining, 1.0)) as response:
+                status = json.loads(response.read() or b'{}')
+        except (urllib.error.URLError, OSError, ValueError):
+            # Not reachable or does not support draining: nothing to wait for
+            return False
+        if status.get('in_flight', 0) <= 0:
+            return True
+        method = 'GET'
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, 0.2)
+
+
+def _wait_for_group(pgid, process, deadline, poll_interval):
+    if process is not None:
+        # Our own child: block on it directly, which also reaps it
+        try:
+            process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            return False
+    while group_alive(pgid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll_interval)
+    return True
+
+
+def shutdown_services(targets, timeout=SHUTDOWN_TIMEOUT, drain_timeout=None, poll_interval=0.05):
+    """Stop every service concurrently against one shared deadline
+
+    `targets` are dicts with 'name' and 'pgid', plus an optional 'process'
+    (a Popen owned by the caller) and 'drain_url'. Services with a drain URL
+    are drained first (for at most `drain_timeout`, default half the
+    deadline); all others are sent SIGTERM immediately. Groups still alive at
+    the deadline get SIGKILL.
+
+    Returns {name: {'status': 'terminated' | 'killed' | 'not running',
+    'drained': bool | None, 'drain_seconds': float, 'seconds': float}}.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    drain_timeout = timeout / 2 if drain_timeout is None else drain_timeout
+
+    def stop(target):
+        pgid, process = target['pgid'], target.get('process')
+        result = {'drained': None, 'drain_seconds': 0.0}
+        if target.get('drain_url'):
+            result['drained'] = request_drain(target['drain_url'], drain_timeout)
+            result['drain_seconds'] = time.monotonic() - started
+
+        if not signal_group(pgid):
+            if process is not None:
+                process.poll()
+            result.update(status='not running', seconds=time.monotonic() - started)
+            return result
+        if _wait_for_group(pgid, process, deadline, poll_interval):
+            result.update(status='terminated', seconds=time.monotonic() - started)
+            return result
+
+        signal_group(pgid, force=True)
+        if process is not None:
+            try:
+                process.wait(1)
+            except subprocess.TimeoutExpired:
+                pass
+        result.update(status='killed', seconds=time.monotonic() - started)
+        return result
+
+    if not targets:
+        return {}
+    with ThreadPoolExecutor(max_workers=len(targets)) as executor:
+        return dict(zip((t['name'] for t in targets), executor.map(stop, targets)))
+
+
+def describe_shutdown(result):
+    """One-line summary of a shutdown_services() result, e.g. for the managers' logs"""
+    text = f"{result['status']} after {result['seconds']:.2f}s"
+    if result['drained'] is not None:
+        text += f" (drained in {result['drain_seconds']:.2f}s)" if result['drained'] else " (drain incomplete)"
+    return text
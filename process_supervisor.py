@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Process Supervisor
+Watches managed services and restarts them when they exit. Exits are
+delivered by the kernel (a pidfd per child on Linux, a blocking wait per
+child elsewhere) instead of polling, restarts back off exponentially, and a
+circuit breaker stops restarting a service that keeps crashing.
+"""
+
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+MIN_UPTIME = 10.0
+CRASH_LIMIT = 5
+CRASH_WINDOW = 60.0
+BREAKER_COOLDOWN = 300.0
+
+
+class _Service:
+    def __init__(self, name, process, restart, now):
+        self.name = name
+        self.process = process
+        self.restart = restart
+        self.started_at = now
+        self.restarts = 0
+        self.consecutive_failures = 0
+        self.crashes = deque()
+        self.downtime = 0.0
+        self.down_since = None
+        self.next_restart = None
+        self.breaker_open = False
+        self.last_exit_code = None
+
+    @property
+    def state(self):
+        if self.down_since is None:
+            return "running"
+        return "circuit-open" if self.breaker_open else "restarting"
+
+
+class ProcessSupervisor:
+    """Restart services as soon as they exit, with backoff and a crash-loop breaker
+
+    `restart()` callbacks return the new Popen (or None on failure). The first
+    restart after a service has been up for `min_uptime` is immediate; repeated
+    failures back off from `backoff_base` up to `backoff_max`. More than
+    `crash_limit` crashes within `crash_window` seconds opens the breaker and
+    the service is left down for `breaker_cooldown` seconds before one more try.
+    """
+
+    def __init__(self, backoff_base=BACKOFF_BASE, backoff_max=BACKOFF_MAX, min_uptime=MIN_UPTIME,
+                 crash_limit=CRASH_LIMIT, crash_window=CRASH_WINDOW, breaker_cooldown=BREAKER_COOLDOWN,
+                 clock=time.monotonic, log=print):
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.min_uptime = min_uptime
+        self.crash_limit = crash_limit
+        self.crash_window = crash_window
+        self.breaker_cooldown = breaker_cooldown
+        self.clock = clock
+        self.log = log
+        self.services = {}
+        self._selector = selectors.DefaultSelector()
+        # A socket pair rather than a pipe so the selector also works on Windows
+        self._wake_read, self._wake_write = socket.socketpair()
+        self._wake_read.setblocking(False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+        self._exited = deque()
+        self._stopping = False
+        self._use_pidfd = hasattr(os, 'pidfd_open')
+
+    def watch(self, name, process, restart):
+        """Supervise `process`, calling `restart()` to replace it whenever it exits"""
+        service = _Service(name, process, restart, self.clock())
+        self.services[name] = service
+        self._watch_process(service, process)
+
+    def _watch_process(self, service, process):
+        if self._use_pidfd:
+            try:
+                pidfd = os.pidfd_open(process.pid)
+            except OSError:
+                # Kernel without pidfd support (or the process is already gone)
+                self._use_pidfd = False
+            else:
+                self._selector.register(pidfd, selectors.EVENT_READ, (service, process))
+                return
+        thread = threading.Thread(target=self._wait_for_exit, args=(service, process),
+                                  name=f"supervise-{service.name}", daemon=True)
+        thread.start()
+
+    def _wait_for_exit(self, service, process):
+        process.wait()
+        self._exited.append((service, process))
+        try:
+            self._wake_write.send(b"\0")
+        except OSError:
+            pass
+
+    def run(self, should_continue=lambda: True):
+        """Supervise until stop() is called or `should_continue()` returns False"""
+        while not self._stopping and should_continue():
+            for key, _ in self._selector.select(self._select_timeout()):
+                if key.data is None:
+                    self._drain_wakeups()
+                else:
+                    service, process = key.data
+                    self._selector.unregister(key.fd)
+                    os.close(key.fd)
+                    process.wait()
+                    self._on_exit(service, process)
+            while self._exited:
+                self._on_exit(*self._exited.popleft())
+            self._restart_due()
+
+    def _select_timeout(self):
+        # Wake at least once a second so should_continue() is re-checked
+        timeout = 1.0
+        now = self.clock()
+        for service in self.services.values():
+            if service.next_restart is not None:
+                timeout = min(timeout, max(0.0, service.next_restart - now))
+        return timeout
+
+    def _drain_wakeups(self):
+        try:
+            while self._wake_read.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+
+    def _on_exit(self, service, process):
+        # Events for a process that was already replaced are stale
+        if self._stopping or process is not service.process:
+            return
+        now = self.clock()
+        service.last_exit_code = process.returncode
+        service.down_since = now
+        if now - service.started_at >= self.min_uptime:
+            service.consecutive_failures = 0
+        self._schedule_restart(service, now, f"exited with code {process.returncode}")
+
+    def _schedule_restart(self, service, now, reason):
+        service.consecutive_failures += 1
+        service.crashes.append(now)
+        while service.crashes and now - service.crashes[0] > self.crash_window:
+            service.crashes.popleft()
+
+        if len(service.crashes) > self.crash_limit:
+            service.breaker_open = True
+            service.crashes.clear()
+            service.next_restart = now + self.breaker_cooldown
+            self.log(f"🔌 {service.name} {reason}; crash loop detected, "
+                     f"not restarting for {self.breaker_cooldown:.0f}s")
+            return
+
+        delay = 0.0
+        if service.consecutive_failures > 1:
+            delay = min(self.backoff_base * 2 ** (service.consecutive_failures - 2), self.backoff_max)
+        service.next_restart = now + delay
+        self.log(f"💥 {service.name} {reason}; restarting in {delay:.2f}s")
+
+    def _restart_due(self):
+        now = self.clock()
+        for service in self.services.values():
+            if service.next_restart is None or service.next_restart > now or self._stopping:
+                continue
+            service.next_restart = None
+            try:
+                process = service.restart()
+            except Exception as e:
+                process = None
+                self.log(f"❌ Failed to restart {service.name}: {e}")
+            now = self.clock()
+            if process is None:
+                self._schedule_restart(service, now, "failed to restart")
+                continue
+            service.downtime += now - service.down_since
+            self.log(f"🔁 {service.name} restarted after {now - service.down_since:.2f}s down "
+                     f"(restart #{service.restarts + 1})")
+            service.process = process
+            service.restarts += 1
+            service.started_at = now
+            service.down_since = None
+            service.breaker_open = False
+            self._watch_process(service, process)
+
+    def stats(self):
+        """Restart count, accumulated downtime and current state per service"""
+        now = self.clock()
+        return {
+            name: {
+                'state': service.state,
+                'restarts': service.restarts,
+                'downtime_seconds': round(
+                    service.downtime + (now - service.down_since if service.down_since is not None else 0.0), 3
+                ),
+                'last_exit_code': service.last_exit_code,
+            }
+            for name, service in self.services.items()
+        }
+
+    def stop(self):
+        """Stop restarting services; processes are left to their owner to terminate"""
+        self._stopping = True
+        try:
+            self._wake_write.send(b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        self.stop()
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                os.close(key.fd)
+        self._selector.close()
+        self._wake_read.close()
+        self._wake_write.close()
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Response Cache
+Bounded LRU + TTL cache for deterministic AI service responses such as
+/ai/medicine-search and /ai/medicines-by-indication, optionally shared
+between worker processes.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+import medicine_db
+from cache_backends import DEFAULT_MAX_BYTES, DEFAULT_MAX_ENTRIES, LocalBackend, create_backend
+from db_pool import DatabasePool, shared_pool
+
+DEFAULT_TTL = 300
+# How long a worker may compute a missing entry before peers give up waiting on it
+DEFAULT_LEASE_TTL = 30
+# How long a catalogue version is trusted before the database is asked again
+DEFAULT_VERSION_INTERVAL = 1.0
+
+# Word order does not change the result of a full-text query
+WORD_SORTED_FIELDS = ('query',)
+# Symptom lists are order independent, but words inside one symptom ("sore throat") are not
+TERM_SORTED_FIELDS = ('symptoms',)
+_TERM_SEPARATORS = re.compile(r"\s*(?:,|;|\band\b)\s*")
+
+
+def normalize_text(value):
+    """Lower-case and collapse whitespace"""
+    return " ".join(value.lower().split())
+
+
+def normalize_param(field, value):
+    """Normalize one request parameter so equivalent requests share a cache key"""
+    if not isinstance(value, str):
+        return value
+    text = normalize_text(value)
+    if field in WORD_SORTED_FIELDS:
+        return " ".join(sorted(text.split()))
+    if field in TERM_SORTED_FIELDS:
+        terms = (term for term in _TERM_SEPARATORS.split(text) if term)
+        return ", ".join(sorted(terms))
+    return text
+
+
+def make_key(endpoint, params):
+    """Build the cache key for an endpoint called with `params`"""
+    normalized = {field: normalize_param(field, value) for field, value in (params or {}).items()}
+    return endpoint + "|" + json.dumps(normalized, sort_keys=True, separators=(',', ':'), default=str)
+
+
+def encode(value):
+    return json.dumps(value, separators=(',', ':'), default=str).encode()
+
+
+class _Flight:
+    """A computation in progress that concurrent identical misses wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResponseCache:
+    """Response cache with pluggable storage and request coalescing
+
+    Entries live in a backend from cache_backends: in-process by default, or
+    shared between workers. Identical concurrent misses compute once, both
+    between threads of this process and, through backend leases, between
+    worker processes.
+
+    Keys are prefixed with the catalogue version reported by `version_source`,
+    so a catalogue change makes every earlier entry unreachable at once.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL,
+                 version_source=None, version_interval=DEFAULT_VERSION_INTERVAL, clock=time.monotonic,
+                 backend=None, lease_ttl=DEFAULT_LEASE_TTL):
+        self.backend = backend or LocalBackend(max_entries, max_bytes, clock)
+        self.ttl = ttl
+        self.version_source = version_source
+        self.version_interval = version_interval
+        self.clock = clock
+        self.lease_ttl = lease_ttl
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._version = None
+        self._namespace = ""
+        self._version_checked_at = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def _current_namespace(self):
+        """Key prefix for the current catalogue version, re-read at most every version_interval"""
+        if self.version_source is None:
+            return ""
+        now = self.clock()
+        with self._lock:
+            if self._version_checked_at is not None and now - self._version_checked_at < self.version_interval:
+                return self._namespace
+            self._version_checked_at = now
+        version = self.version_source()
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self.invalidations += 1
+                    if not self.backend.shared:
+                        self.backend.clear()
+                self._version = version
+                self._namespace = hashlib.sha1(repr(version).encode()).hexdigest()[:12] + "|"
+            return self._namespace
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key, default=None):
+        """Return a cached value, or `default` on a miss"""
+        payload = self.backend.get(self._current_namespace() + key)
+        self._count(payload is not None)
+        return default if payload is None else json.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        """Store a value for `ttl` seconds (the cache default when omitted)"""
+        self.backend.set(self._current_namespace() + key, encode(value), self.ttl if ttl is None else ttl)
+
+    def _wait_for_peer(self, key, compute, ttl):
+        """Another worker holds the lease: wait for its result, computing ourselves if it never lands"""
+        deadline = self.clock() + self.lease_ttl
+        delay = 0.005
+        while self.clock() < deadline:
+            time.sleep(delay)
+            payload = self.backend.get(key)
+            if payload is not None:
+                return json.loads(payload)
+            delay = min(delay * 2, 0.1)
+        value = compute()
+        self.backend.set(key, encode(value), ttl)
+        return value
+
+    def get_or_compute(self, endpoint, params, compute, ttl=None):
+        """Return the cached response for endpoint+params, computing it once on a miss"""
+        ttl = self.ttl if ttl is None else ttl
+        key = self._current_namespace() + make_key(endpoint, params)
+        payload = self.backend.get(key)
+        self._count(payload is not None)
+        if payload is not None:
+            return json.loads(payload)
+
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            if self.backend.acquire_lease(key, self.lease_ttl):
+                try:
+                    flight.value = compute()
+                    self.backend.set(key, encode(flight.value), ttl)
+                finally:
+                    self.backend.release_lease(key)
+            else:
+                flight.value = self._wait_for_peer(key, compute, ttl)
+            return flight.value
+        except Exception as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            flight.done.set()
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        """Hit/miss counters plus backend occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'coalesced': self.coalesced,
+                'invalidations': self.invalidations,
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+
+def catalogue_version_source(path=None):
+    """Version source reading catalogue_version() over the calling thread's pooled read connection"""
+    pool = shared_pool() if path is None else DatabasePool(path)
+
+    def current_version():
+        return medicine_db.catalogue_version(pool.reader())
+
+    return current_version
+
+
+def create_response_cache(path=None, cache_url=None, **options):
+    """Response cache invalidated whenever the medicine catalogue changes
+
+    `cache_url` (or the AI_CACHE_URL environment variable) selects the backend,
+    see cache_backends.create_backend(). Use a sqlite:// or redis:// URL when
+    the AI service runs several worker processes.
+    """
+    backend = None
+    if cache_url or os.environ.get('AI_CACHE_URL'):
+        backend = create_backend(cache_url)
+    return ResponseCache(version_source=catalogue_version_source(path), backend=backend, **options)
+
+
+def register_routes(app, cache=None):
+    """Serve the catalogue lookups through `cache` and expose its hit/miss counters
+
+    Registers /ai/medicine-search and /ai/medicines-by-indication (see
+    medicine_search.register_routes) answered through cache.get_or_compute,
+    plus /ai/cache-stats. Without `cache`, one is built by
+    create_response_cache(), so AI_CACHE_URL picks the shared backend.
+    """
+    from flask import jsonify
+
+    import medicine_search
+
+    cache = create_response_cache() if cache is None else cache
+    medicine_search.register_routes(app, cache)
+
+    @app.route('/ai/cache-stats', methods=['GET'])
+    def cache_stats():
+        return jsonify(cache.stats())
+
+    return app
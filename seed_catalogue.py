@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Synthetic Catalogue Generator
+Fills a copy of the medicine database with a deterministic, seeded synthetic
+catalogue (medicines, symptom mappings and drug interactions) so search,
+analysis and the benchmarks can be exercised at production scale.
+
+    python seed_catalogue.py --medicines 100000 --interactions 10000000
+    python benchmark.py --start --db benchmarks/seeded_medicine_database.db
+"""
+
+import argparse
+import itertools
+import json
+import math
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import medicine_db
+
+PROJECT_ROOT = Path(__file__).parent.absolute()
+DEFAULT_OUTPUT = PROJECT_ROOT / "benchmarks" / "seeded_medicine_database.db"
+CATALOGUE_TABLES = ("medicines", "symptom_medicine_mapping", "drug_interactions")
+
+PREFIXES = [
+    "Ab", "Al", "Am", "Ar", "Ba", "Be", "Ca", "Ce", "Cla", "Da", "De", "Do", "El", "En", "Fa", "Fe",
+    "Ga", "Gla", "Ha", "Hy", "Im", "In", "Ka", "La", "Le", "Lo", "Ma", "Me", "Mo", "Na", "Ne", "No",
+    "Ol", "Or", "Pa", "Pe", "Pra", "Qui", "Ra", "Re", "Ri", "Sa", "Se", "So", "Ta", "Te", "Tra", "Va",
+    "Ve", "Xa", "Za", "Ze", "Zo",
+]
+MIDDLES = [
+    "ba", "ce", "da", "fi", "ga", "li", "lo", "ma", "mi", "na", "ni", "pa", "pi", "ra", "ri", "ro",
+    "sa", "ta", "ti", "to", "va", "vi", "xi", "za", "zo", "ver", "lan", "dor", "mel", "tus",
+]
+# Suffix stems hint at the drug class, as real generic names do
+SUFFIXES = {
+    "pril": "Cardiovascular", "sartan": "Cardiovascular", "olol": "Cardiovascular",
+    "statin": "Cardiovascular", "azole": "Antifungal", "cillin": "Antibiotic", "mycin": "Antibiotic",
+    "floxacin": "Antibiotic", "vir": "Antiviral", "mab": "Immunology", "nib": "Oncology",
+    "profen": "Analgesic", "fenac": "Analgesic", "codone": "Analgesic", "tadine": "Antihistamine",
+    "pram": "Psychiatry", "xetine": "Psychiatry", "zepam": "Psychiatry", "prazole": "Gastroenterology",
+    "tidine": "Gastroenterology", "gliptin": "Endocrinology", "formin": "Endocrinology",
+    "sone": "Corticosteroid", "lone": "Corticosteroid",
+}
+DOSAGE_FORMS = ["tablet", "capsule", "syrup", "injection", "cream", "ointment", "inhaler", "drops", "patch", "suspension"]
+STRENGTHS = ["5mg", "10mg", "20mg", "25mg", "50mg", "100mg", "200mg", "250mg", "500mg", "1g"]
+
+# Common symptoms, most frequent first, with the synonyms patients actually type
+COMMON_SYMPTOMS = {
+    "headache": ["head pain", "cephalalgia"], "fever": ["high temperature", "pyrexia"],
+    "cough": ["coughing"], "pain": ["ache", "aching"], "nausea": ["feeling sick", "queasiness"],
+    "fatigue": ["tiredness", "exhaustion"], "sore throat": ["throat pain", "pharyngitis"],
+    "runny nose": ["rhinorrhea", "nasal discharge"], "diarrhea": ["loose stools"],
+    "vomiting": ["throwing up", "emesis"], "dizziness": ["lightheadedness", "vertigo"],
+    "insomnia": ["sleeplessness", "trouble sleeping"], "anxiety": ["nervousness", "worry"],
+    "back pain": ["backache", "lumbago"], "rash": ["skin rash", "hives"], "itching": ["pruritus", "itchy skin"],
+    "constipation": ["hard stools"], "heartburn": ["acid reflux", "indigestion"],
+    "shortness of breath": ["breathlessness", "dyspnea"], "chest pain": ["chest tightness"],
+    "joint pain": ["arthralgia", "sore joints"], "muscle pain": ["myalgia", "muscle ache"],
+    "congestion": ["stuffy nose", "blocked nose"], "sneezing": [], "inflammation": ["swelling"],
+    "high blood pressure": ["hypertension"], "depression": ["low mood"], "allergy": ["allergic reaction"],
+    "infection": [], "migraine": [], "acne": ["pimples"], "wheezing": [], "bloating": ["gas"],
+    "stomach pain": ["abdominal pain", "tummy ache"], "earache": ["ear pain", "otalgia"],
+    "toothache": ["dental pain"], "cramps": ["muscle cramps"], "chills": ["shivering"],
+    "night sweats": [], "loss of appetite": ["anorexia"],
+}
+ADJECTIVES = ["acute", "chronic", "mild", "severe", "recurrent", "persistent", "intermittent", "nocturnal"]
+BODY_PARTS = ["knee", "shoulder", "neck", "wrist", "ankle", "hip", "jaw", "eye", "skin", "scalp", "foot", "elbow"]
+COMPLAINTS = ["pain", "stiffness", "swelling", "numbness", "tingling", "weakness", "irritation", "burning"]
+VOCABULARY = (
+    "used to treat relieve reduce symptoms associated with inflammation infection pain patients adults children "
+    "dose daily once twice taken with food water may cause mild moderate effects consult doctor before use "
+    "pregnancy breastfeeding kidney liver function monitoring recommended long term therapy acute chronic "
+    "condition management clinically proven effective tolerated oral topical formulation release extended"
+).split()
+SEVERITIES = [("minor", 50), ("moderate", 35), ("major", 12), ("contraindicated", 3)]
+EVIDENCE_LEVELS = [("A", 20), ("B", 35), ("C", 30), ("D", 15)]
+INTERACTION_TYPES = ["pharmacokinetic", "pharmacodynamic"]
+
+
+class CatalogueGenerator:
+    """Deterministic generator of synthetic catalogue rows; the same seed always yields the same data"""
+
+    def __init__(self, medicines, interactions, indications_per_medicine=3.0, tail_symptoms=2000, seed=42):
+        self.medicine_count = medicines
+        self.interaction_count = interactions
+        self.indications_per_medicine = indications_per_medicine
+        self.seed = seed
+        rng = random.Random(seed)
+        tail = sorted({
+            f"{rng.choice(ADJECTIVES)} {rng.choice(BODY_PARTS)} {rng.choice(COMPLAINTS)}"
+            for _ in range(tail_symptoms)
+        })
+        rng.shuffle(tail)
+        self.symptoms = list(COMMON_SYMPTOMS) + tail
+        # Zipf-like popularity: a handful of symptoms account for most indications
+        self._symptom_cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(self.symptoms))))
+        self.names, self.categories = self._medicine_names()
+
+    def _medicine_names(self):
+        rng = random.Random(self.seed)
+        suffixes = list(SUFFIXES)
+        names, categories, seen = [], [], set()
+        syllables = 1
+        while len(names) < self.medicine_count:
+            # Add a syllable once half the name space is used, so rejections stay rare
+            while len(PREFIXES) * len(MIDDLES) ** syllables * len(suffixes) < 2 * (len(names) + 1):
+                syllables += 1
+            suffix = rng.choice(suffixes)
+            name = rng.choice(PREFIXES) + "".join(rng.choice(MIDDLES) for _ in range(syllables)) + suffix
+            if name in seen:
+                continue
+            seen.add(name)
+            names.append(name)
+            categories.append(SUFFIXES[suffix])
+        return names, categories
+
+    def _text(self, rng, median_words):
+        words = max(3, int(rng.lognormvariate(0, 0.5) * median_words))
+        return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+    @staticmethod
+    def _weighted(rng, choices):
+        return rng.choices([value for value, _ in choices], weights=[w for _, w in choices])[0]
+
+    def _poisson(self, rng, mean):
+        # Knuth's method; the means used here are small
+        limit, k, p = math.exp(-mean), 0, 1.0
+        while True:
+            p *= rng.random()
+            if p <= limit:
+                return k
+            k += 1
+
+    def indications(self, index):
+        rng = random.Random(self.seed * 1_000_003 + index)
+        count = max(1, self._poisson(rng, self.indications_per_medicine))
+        return list(dict.fromkeys(rng.choices(self.symptoms, cum_weights=self._symptom_cum_weights, k=count)))
+
+    def medicines(self):
+        for index, name in enumerate(self.names):
+            rng = random.Random(self.seed * 7_919 + index)
+            brands = [rng.choice(PREFIXES) + rng.choice(MIDDLES) + rng.choice(["x", "ra", "lin", "on", "ex"])
+                      for _ in range(rng.randint(0, 4))]
+            forms = rng.sample(DOSAGE_FORMS, rng.randint(1, 3))
+            yield (
+                name,
+                name.lower(),
+                json.dumps(brands),
+                self.categories[index],
+                self._text(rng, 30),
+                json.dumps(forms),
+                json.dumps(rng.sample(STRENGTHS, rng.randint(1, 3))),
+                json.dumps(self.indications(index)),
+                json.dumps(rng.sample(self.symptoms[:40], rng.randint(0, 3))),
+                json.dumps([self._text(rng, 3).rstrip(".") for _ in range(rng.randint(1, 6))]),
+                json.dumps(rng.sample(self.names[:1000], min(len(self.names[:1000]), rng.randint(0, 4)))),
+                self._text(rng, 12),
+                rng.choice("ABCDX"),
+                "no" if rng.random() > 0.05 else "yes",
+                rng.choice(["OTC", "Prescription", "Prescription", "Hospital only"]),
+                rng.choice(["$", "$$", "$$$"]),
+                f"{rng.choice(PREFIXES)}{rng.choice(MIDDLES)} Pharmaceuticals",
+                f"{rng.randint(1970, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "synthetic",
+                round(rng.uniform(0.6, 0.99), 2),
+            )
+
+    def symptom_mappings(self):
+        for index, name in enumerate(self.names):
+            rng = random.Random(self.seed * 104_729 + index)
+            for symptom in self.indications(index):
+                yield (symptom, name, round(rng.betavariate(5, 2), 3), self._weighted(rng, EVIDENCE_LEVELS), "synthetic")
+
+    def interactions(self):
+        """Unique (drug1, drug2) pairs with a heavy-tailed number of partners per drug
+
+        Yields exactly the requested number of pairs, or every possible pair when
+        the catalogue has fewer.
+        """
+        n = len(self.names)
+        target = min(self.interaction_count, n * (n - 1) // 2)
+        if target <= 0:
+            return
+        rng = random.Random(self.seed * 15_485_863)
+        # Pareto-distributed degrees: a few drugs interact with very many others
+        degrees = [rng.paretovariate(1.5) for _ in range(n)]
+        scale = target / sum(degrees)
+        counts, produced = [], 0
+        for i in range(n - 1):
+            k = min(n - i - 1, int(degrees[i] * scale + rng.random()), target - produced)
+            counts.append(k)
+            produced += k
+        # Rounding and drugs capped at their remaining partners leave a shortfall: hand it to the
+        # highest-degree drugs that still have partners left
+        for i in sorted(range(n - 1), key=degrees.__getitem__, reverse=True):
+            if produced >= target:
+                break
+            extra = min(n - i - 1 - counts[i], target - produced)
+            counts[i] += extra
+            produced += extra
+
+        for i, k in enumerate(counts):
+            # Pairs are only generated from their lower index, so they are unique without a seen-set
+            for j in rng.sample(range(i + 1, n), k):
+                yield (
+                    self.names[i],
+                    self.names[j],
+                    rng.choice(INTERACTION_TYPES),
+                    self._weighted(rng, SEVERITIES),
+                    f"{self.names[i]} may alter the effect of {self.names[j]}.",
+                    "synthetic",
+                )
+
+    def synonyms(self):
+        for symptom, synonyms in COMMON_SYMPTOMS.items():
+            for synonym in synonyms:
+                yield (synonym, symptom)
+
+
+def _base_schema(template):
+    """CREATE TABLE statements of the catalogue tables, taken from the shipped database"""
+    conn = sqlite3.connect(f"file:{template}?mode=ro", uri=True)
+    try:
+        placeholders = ",".join("?" * len(CATALOGUE_TABLES))
+        return [sql for (sql,) in conn.execute(
+            f"SELECT sql FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})", CATALOGUE_TABLES
+        )]
+    finally:
+        conn.close()
+
+
+def _insert(conn, sql, rows, label):
+    started = time.perf_counter()
+    before = conn.total_changes
+    conn.executemany(sql, rows)
+    count = conn.total_changes - before
+    elapsed = time.perf_counter() - started
+    print(f"   • {label}: {count:,} rows in {elapsed:.1f}s ({count / elapsed if elapsed else 0:,.0f} rows/s)")
+    return count
+
+
+def generate(output, generator, template=medicine_db.DB_PATH):
+    """Create `output` with the shipped schema, bulk-load the generated rows, then migrate"""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(output), isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA cache_size = -262144")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        for sql in _base_schema(template):
+            conn.execute(sql)
+
+        # One transaction for the whole load; indexes, FTS and interning are built afterwards by the migrations
+        conn.execute("BEGIN")
+        _insert(conn, """
+            INSERT INTO medicines(name, generic_name, brand_names, category, description, dosage_forms,
+                common_dosages, indications, contraindications, side_effects, interactions, warnings,
+                pregnancy_category, controlled_substance, availability, price_range, manufacturer,
+                approval_date, source, confidence_score)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, generator.medicines(), "medicines")
+        _insert(conn, """
+            INSERT INTO symptom_medicine_mapping(symptom, medicine_name, effectiveness_score, evidence_level, source)
+            VALUES (?, ?, ?, ?, ?)
+        """, generator.symptom_mappings(), "symptom mappings")
+        _insert(conn, """
+            INSERT INTO drug_interactions(drug1, drug2, interaction_type, severity, description, source)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, generator.interactions(), "drug interactions")
+        conn.execute("COMMIT")
+
+        started = time.perf_counter()
+        medicine_db.migrate(conn)
+        print(f"   • indexes, search index and symptom lookup: {time.perf_counter() - started:.1f}s")
+        conn.execute("BEGIN")
+        _insert(conn, """
+            INSERT OR IGNORE INTO symptom_synonyms(symptom_id, synonym)
+            SELECT id, ? FROM symptoms WHERE name = ?
+        """, generator.synonyms(), "symptom synonyms")
+        conn.execute("COMMIT")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+    return output
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic medicine catalogue")
+    parser.add_argument('--db', default=str(DEFAULT_OUTPUT), help="Database file to create")
+    parser.add_argument('--medicines', type=int, default=10000)
+    parser.add_argument('--interactions', type=int, default=100000, help="Drug interaction pairs")
+    parser.add_argument('--indications', type=float, default=3.0, help="Mean indications per medicine")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--force', action='store_true', help="Replace the output file if it exists")
+    args = parser.parse_args()
+
+    output = Path(args.db).absolute()
+    if output == Path(medicine_db.DB_PATH).absolute():
+        print("❌ Refusing to overwrite the shipped medicine database; choose another --db")
+        return False
+    if output.exists():
+        if not args.force:
+            print(f"❌ {output} already exists; pass --force to replace it")
+            return False
+        for suffix in ("", "-wal", "-shm"):
+            Path(f"{output}{suffix}").unlink(missing_ok=True)
+
+    print(f"🧪 Generating {args.medicines:,} medicines and {args.interactions:,} interactions (seed {args.seed})")
+    started = time.perf_counter()
+    generator = CatalogueGenerator(args.medicines, args.interactions, args.indications, seed=args.seed)
+    generate(output, generator)
+    print(f"✅ {output} ready in {time.perf_counter() - started:.1f}s "
+          f"({output.stat().st_size / 1024 / 1024:.1f} MB)")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Request Draining
+Lets the service managers ask the AI service to drain before it is stopped:
+the health check starts failing so no new traffic is routed to it, and the
+manager waits until in-flight requests have finished before sending SIGTERM.
+
+The drain flag and in-flight counter live in shared memory, so a controller
+created before gunicorn forks (preload_app) is shared by every worker: one
+POST /ai/drain drains them all and in_flight counts requests across workers.
+"""
+
+import multiprocessing
+import time
+
+DRAIN_PATH = '/ai/drain'
+
+
+class DrainController:
+    """Counts in-flight requests and tracks whether the service is draining
+
+    Create it in the master before workers fork so they all share its state.
+    """
+
+    def __init__(self):
+        self._draining = multiprocessing.Value('b', False)
+        self._in_flight = multiprocessing.Value('i', 0)
+
+    @property
+    def draining(self):
+        return bool(self._draining.value)
+
+    @property
+    def in_flight(self):
+        return self._in_flight.value
+
+    def enter(self):
+        with self._in_flight.get_lock():
+            self._in_flight.value += 1
+
+    def leave(self):
+        with self._in_flight.get_lock():
+            self._in_flight.value -= 1
+
+    def start_draining(self):
+        self._draining.value = True
+
+    def wait_idle(self, timeout, poll_interval=0.01):
+        """Block until nothing is in flight in any worker; False if `timeout` passed first"""
+        deadline = time.monotonic() + timeout
+        while self.in_flight > 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(poll_interval, remaining))
+        return True
+
+    def status(self):
+        return {'draining': self.draining, 'in_flight': self.in_flight}
+
+
+def register_routes(app, controller, health_path='/health'):
+    """Track in-flight requests on the AI service and serve POST/GET /ai/drain
+
+    While draining, `health_path` answers 503 so readiness probes and load
+    balancers stop sending traffic; requests that still arrive are served.
+    """
+    from flask import g, jsonify, request
+
+    @app.before_request
+    def track_request():
+        if request.path == DRAIN_PATH:
+            return None
+        if controller.draining and request.path == health_path:
+            return jsonify({'status': 'draining', **controller.status()}), 503
+        controller.enter()
+        g.drain_tracked = True
+        return None
+
+    @app.teardown_request
+    def untrack_request(exc):
+        if g.pop('drain_tracked', False):
+            controller.leave()
+
+    @app.route(DRAIN_PATH, methods=['GET', 'POST'])
+    def drain():
+        if request.method == 'POST':
+            controller.start_draining()
+        return jsonify(controller.status())
+
+    return app
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Service Readiness Probes
+TCP and HTTP probes with exponential backoff, used by the service managers to
+know when a service is actually ready instead of sleeping a fixed time.
+"""
+
+import socket
+import time
+import urllib.error
+import urllib.request
+
+
+def tcp_probe(host, port, timeout=1.0):
+    """Return a probe that succeeds once something accepts connections on host:port"""
+    def probe():
+        try:
+            with socket.create_connection((host, port), timeout=timeout):
+                return True
+        except OSError:
+            return False
+    probe.description = f"tcp://{host}:{port}"
+    return probe
+
+
+def http_probe(url, timeout=2.0):
+    """Return a probe that succeeds once `url` answers without a server error"""
+    def probe():
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                return response.status < 500
+        except urllib.error.HTTPError as e:
+            # The server is up and routing requests, even if this path is not 2xx
+            return e.code < 500
+        except (urllib.error.URLError, OSError):
+            return False
+    probe.description = url
+    return probe
+
+
+def wait_until_ready(probe, timeout=60.0, initial_delay=0.05, max_delay=2.0, is_alive=None):
+    """Poll `probe` with exponential backoff until it succeeds
+
+    Returns (ready, seconds_waited). Gives up early when `is_alive()` reports
+    that the process being probed has exited.
+    """
+    started = time.monotonic()
+    delay = initial_delay
+    while True:
+        if probe():
+            return True, time.monotonic() - started
+        if is_alive is not None and not is_alive():
+            return False, time.monotonic() - started
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            return False, time.monotonic() - started
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
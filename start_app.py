@@ -4,6 +4,8 @@ Healthcare Assistant App - Service Manager
 Starts all services (Frontend, Backend, AI Service) with proper error handling and monitoring.
 """
 
+import argparse
+import importlib.util
 import subprocess
 import sys
 import os
@@ -11,8 +13,13 @@ import time
 import signal
 import platform
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from log_pump import LogPump
+from process_groups import describe_shutdown, new_group_kwargs, remove_pid_file, shutdown_services, write_pid_file
+from service_probes import http_probe, tcp_probe, wait_until_ready
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,11 +30,40 @@ logging.basicConfig(
     ]
 )
 
+# Startup graph: each service starts as soon as the services it depends on are ready
+SERVICES = {
+    "Backend": {
+        "start": "start_backend",
+        "depends_on": [],
+        "probe": http_probe("http://localhost:5000/api/health"),
+        "required": True,
+    },
+    "AI Service": {
+        "start": "start_ai_service",
+        "depends_on": [],
+        "probe": http_probe("http://localhost:5001/health"),
+        "drain_url": "http://localhost:5001/ai/drain",
+        "required": False,
+    },
+    "Frontend": {
+        "start": "start_frontend",
+        "depends_on": ["Backend"],
+        "probe": tcp_probe("localhost", 3000),
+        "required": True,
+    },
+}
+
+READY_TIMEOUT = 120
+CRASH_LOG_LINES = 20
+
+
 class HealthcareServiceManager:
-    def __init__(self):
+    def __init__(self, production=False):
         self.project_root = Path(__file__).parent.absolute()
+        self.production = production
         self.processes = []
         self.is_windows = platform.system() == "Windows"
+        self.log_pump = LogPump(self.project_root / "logs")
         
     def check_prerequisites(self):
         """Check if all required tools are installed"""
@@ -120,13 +156,12 @@ class HealthcareServiceManager:
                 shell=True,
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                **new_group_kwargs()
             )
             self.processes.append(("Backend", process))
-            
-            # Wait for backend to start
-            time.sleep(5)
-            logging.info("✅ Backend server started successfully")
+            self.log_pump.add("Backend", process)
+            write_pid_file("Backend", process)
             return True
         except Exception as e:
             logging.error(f"❌ Failed to start Backend: {e}")
@@ -145,13 +180,12 @@ class HealthcareServiceManager:
                 shell=True,
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                **new_group_kwargs()
             )
             self.processes.append(("Frontend", process))
-            
-            # Wait for frontend to start
-            time.sleep(8)
-            logging.info("✅ Frontend started successfully")
+            self.log_pump.add("Frontend", process)
+            write_pid_file("Frontend", process)
             return True
         except Exception as e:
             logging.error(f"❌ Failed to start Frontend: {e}")
@@ -168,38 +202,124 @@ class HealthcareServiceManager:
             logging.info("🟢 Starting AI Service...")
             # Use the new_backend.py instead of app.py
             cmd = [sys.executable, "new_backend.py"]
+            if self.production:
+                if self.is_windows or importlib.util.find_spec("gunicorn") is None:
+                    logging.warning("⚠️  gunicorn is not available, running the single-process dev server")
+                else:
+                    # Pre-fork workers sized to the available CPUs (see ai_workers.py)
+                    cmd = [sys.executable, "-m", "gunicorn", "-c", str(self.project_root / "ai_workers.py"),
+                           "new_backend:app"]
             process = subprocess.Popen(
                 cmd, 
                 cwd=ai_dir,
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                **new_group_kwargs()
             )
             self.processes.append(("AI Service", process))
-            
-            # Wait for AI service to start
-            time.sleep(3)
-            logging.info("✅ AI Service started successfully")
+            self.log_pump.add("AI Service", process)
+            write_pid_file("AI Service", process, drain_url=SERVICES["AI Service"]["drain_url"])
             return True
         except Exception as e:
             logging.error(f"❌ Failed to start AI Service: {e}")
             return False
     
+    def _process(self, name):
+        for process_name, process in self.processes:
+            if process_name == name:
+                return process
+        return None
+
+    def _start_and_probe(self, name, spec, dependencies):
+        """Start one service once its dependencies are ready, then wait for its probe"""
+        for dependency in spec["depends_on"]:
+            if dependencies[dependency].result()["status"] != "ready":
+                logging.error(f"❌ Not starting {name}: {dependency} is not ready")
+                return {"status": "blocked", "seconds": 0.0}
+
+        started = time.monotonic()
+        if not getattr(self, spec["start"])():
+            return {"status": "failed", "seconds": time.monotonic() - started}
+        process = self._process(name)
+        if process is None:
+            return {"status": "skipped", "seconds": 0.0}
+
+        ready, _ = wait_until_ready(
+            spec["probe"],
+            timeout=READY_TIMEOUT,
+            is_alive=lambda: process.poll() is None,
+        )
+        seconds = time.monotonic() - started
+        if ready:
+            logging.info(f"✅ {name} ready in {seconds:.1f}s ({spec['probe'].description})")
+            return {"status": "ready", "seconds": seconds}
+        if process.poll() is not None:
+            logging.error(f"❌ {name} exited with code {process.returncode} before becoming ready")
+            self._log_recent_output(name)
+        else:
+            logging.error(f"❌ {name} not ready after {seconds:.1f}s ({spec['probe'].description})")
+        return {"status": "failed", "seconds": seconds}
+
+    def _log_recent_output(self, name):
+        lines = self.log_pump.recent(name, CRASH_LOG_LINES)
+        if lines:
+            logging.error(f"   Last output from {name} (full log: {self.log_pump.log_path(name)}):")
+            for line in lines:
+                logging.error(f"   {line}")
+
+    def start_services_concurrently(self, services=SERVICES):
+        """Start services in parallel following the dependency graph; return per-service results"""
+        with ThreadPoolExecutor(max_workers=len(services)) as executor:
+            futures = {}
+            # Dependencies are submitted first, so every future a service waits on exists
+            for name in self._startup_order(services):
+                futures[name] = executor.submit(self._start_and_probe, name, services[name], futures)
+            results = {name: future.result() for name, future in futures.items()}
+
+        logging.info("\n⏱️  Time to ready:")
+        for name, result in results.items():
+            logging.info(f"   • {name}: {result['status']} ({result['seconds']:.1f}s)")
+        return results
+
+    @staticmethod
+    def _startup_order(services):
+        """Topologically sort services so dependencies come before their dependents"""
+        order, visiting = [], set()
+
+        def visit(name):
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Circular service dependency involving {name}")
+            visiting.add(name)
+            for dependency in services[name]["depends_on"]:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in services:
+            visit(name)
+        return order
+
     def stop_all_services(self):
         """Stop all running services"""
         logging.info("\n🛑 Stopping all services...")
-        for name, process in self.processes:
-            try:
-                if process.poll() is None:
-                    logging.info(f"Stopping {name}...")
-                    process.terminate()
-                    process.wait(timeout=5)
-                    logging.info(f"✅ {name} stopped")
-            except subprocess.TimeoutExpired:
-                logging.warning(f"⚠️  Force killing {name}...")
-                process.kill()
-            except Exception as e:
-                logging.error(f"❌ Error stopping {name}: {e}")
+        # Drain and stop everything at once, so shutdown takes as long as the slowest service
+        targets = [
+            {
+                "name": name,
+                "pgid": process.pid,
+                "process": process,
+                "drain_url": SERVICES.get(name, {}).get("drain_url"),
+            }
+            for name, process in self.processes
+        ]
+        for name, result in shutdown_services(targets).items():
+            log = logging.warning if result["status"] == "killed" else logging.info
+            log(f"   • {name}: {describe_shutdown(result)}")
+            remove_pid_file(name)
+        self.log_pump.stop()
     
     def signal_handler(self, signum, frame):
         """Handle interrupt signals"""
@@ -230,24 +350,22 @@ class HealthcareServiceManager:
         # Start services
         logging.info("\n🚀 Starting services...")
         
-        # Start backend first
-        if not self.start_backend():
-            return False
-        
-        # Start AI service
-        if not self.start_ai_service():
-            logging.warning("⚠️  AI service failed to start, but continuing...")
-        
-        # Start frontend last
-        if not self.start_frontend():
-            return False
+        results = self.start_services_concurrently()
+        for name, result in results.items():
+            if result["status"] in ("ready", "skipped"):
+                continue
+            if SERVICES[name]["required"]:
+                self.stop_all_services()
+                return False
+            logging.warning(f"⚠️  {name} failed to start, but continuing...")
         
         logging.info("\n" + "=" * 50)
         logging.info("🎉 All services started successfully!")
         logging.info("\n📍 Access Points:")
         logging.info("   • Frontend:  http://localhost:3000")
         logging.info("   • Backend:   http://localhost:5000")
-        logging.info("   • AI Service: http://localhost:5000")
+        logging.info("   • AI Service: http://localhost:5001")
+        logging.info(f"\n📝 Service logs: {self.log_pump.log_dir}")
         logging.info("\n💡 Press Ctrl+C to stop all services")
         logging.info("=" * 50)
         
@@ -262,7 +380,12 @@ class HealthcareServiceManager:
 
 def main():
     """Main entry point"""
-    manager = HealthcareServiceManager()
+    parser = argparse.ArgumentParser(description="Start all Healthcare Assistant App services")
+    parser.add_argument("--production", action="store_true",
+                        default=os.environ.get("AI_SERVICE_MODE") == "production",
+                        help="Run the AI service under gunicorn with 2 x available CPUs + 1 workers")
+    args = parser.parse_args()
+    manager = HealthcareServiceManager(production=args.production)
     success = manager.start_all_services()
     
     if not success:
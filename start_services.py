@@ -5,6 +5,7 @@ Starts all services (MongoDB, Backend, Frontend, AI Service) using Python
 Now includes setup for new laptops: checks and installs dependencies.
 """
 
+import argparse
 import os
 import sys
 import time
@@ -15,11 +16,37 @@ from pathlib import Path
 import shutil
 import webbrowser
 
+from log_pump import LogPump
+from process_groups import (
+    describe_shutdown,
+    new_group_kwargs,
+    remove_pid_file,
+    shutdown_services,
+    signal_group,
+    write_pid_file,
+)
+from process_supervisor import ProcessSupervisor
+
 class ServiceManager:
+    # Method that (re)starts each service, used by the supervisor to replace crashed ones
+    START_METHODS = {
+        "MongoDB": "start_mongodb",
+        "Backend": "start_backend",
+        "AI Service": "start_ai_service",
+        "Frontend": "start_frontend",
+    }
+    # Services that can finish in-flight requests before being stopped (see service_drain.py)
+    DRAIN_URLS = {
+        "AI Service": "http://localhost:5001/ai/drain",
+    }
+
     def __init__(self):
         self.project_root = Path(__file__).parent
         self.processes = []
         self.running = True
+        # Drain child output continuously so no service blocks on a full pipe
+        self.log_pump = LogPump(self.project_root.absolute() / "logs")
+        self.supervisor = None
         # Setup signal handlers for graceful shutdown
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
@@ -82,7 +109,7 @@ class ServiceManager:
         print(f"📁 MongoDB data directory: {data_dir}")
         return data_dir
     
-    def start_mongodb(self):
+    def start_mongodb(self, wait=True):
         """Start MongoDB service"""
         try:
             data_dir = self.create_mongodb_data_dir()
@@ -93,19 +120,23 @@ class ServiceManager:
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                **new_group_kwargs()
             )
             self.processes.append(("MongoDB", process))
+            self.log_pump.add("MongoDB", process)
+            write_pid_file("MongoDB", process)
             
             # Wait a moment for MongoDB to start
-            time.sleep(3)
-            print("✅ MongoDB started successfully")
+            if wait:
+                time.sleep(3)
+                print("✅ MongoDB started successfully")
             return True
         except Exception as e:
             print(f"❌ Failed to start MongoDB: {e}")
             return False
     
-    def start_backend(self):
+    def start_backend(self, wait=True):
         """Start Node.js backend server"""
         try:
             backend_dir = self.project_root / "server"
@@ -120,19 +151,23 @@ class ServiceManager:
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                **new_group_kwargs()
             )
             self.processes.append(("Backend", process))
+            self.log_pump.add("Backend", process)
+            write_pid_file("Backend", process)
             
             # Wait for backend to start
-            time.sleep(5)
-            print("✅ Backend server started successfully")
+            if wait:
+                time.sleep(5)
+                print("✅ Backend server started successfully")
             return True
         except Exception as e:
             print(f"❌ Failed to start Backend: {e}")
             return False
     
-    def start_frontend(self):
+    def start_frontend(self, wait=True):
         """Start React frontend"""
         try:
             frontend_dir = self.project_root / "client"
@@ -147,19 +182,23 @@ class ServiceManager:
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                **new_group_kwargs()
             )
             self.processes.append(("Frontend", process))
+            self.log_pump.add("Frontend", process)
+            write_pid_file("Frontend", process)
             
             # Wait for frontend to start
-            time.sleep(8)
-            print("✅ Frontend started successfully")
+            if wait:
+                time.sleep(8)
+                print("✅ Frontend started successfully")
             return True
         except Exception as e:
             print(f"❌ Failed to start Frontend: {e}")
             return False
     
-    def start_ai_service(self):
+    def start_ai_service(self, wait=True):
         """Start Python AI service"""
         try:
             ai_dir = self.project_root / "ai_service"
@@ -179,13 +218,17 @@ class ServiceManager:
                 stdout=subprocess.PIPE, 
                 stderr=subprocess.PIPE,
                 encoding='utf-8',
-                errors='ignore'
+                errors='ignore',
+                **new_group_kwargs()
             )
             self.processes.append(("AI Service", process))
+            self.log_pump.add("AI Service", process)
+            write_pid_file("AI Service", process, drain_url=self.DRAIN_URLS["AI Service"])
             
             # Wait for AI service to start
-            time.sleep(3)
-            print("✅ AI Service started successfully")
+            if wait:
+                time.sleep(3)
+                print("✅ AI Service started successfully")
             return True
         except Exception as e:
             print(f"❌ Failed to start AI Service: {e}")
@@ -222,6 +265,7 @@ class ServiceManager:
         print("🔧 Backend: http://localhost:5000")
         print("🤖 AI Service: http://localhost:5001")
         print("🗄️  MongoDB: localhost:27017")
+        print(f"📝 Service logs: {self.log_pump.log_dir}")
         print("\nPress Ctrl+C to stop all services")
         
         # Automatically open the frontend in the default browser
@@ -229,34 +273,77 @@ class ServiceManager:
         
         return True
     
+    def _restart_service(self, name):
+        """Replace a crashed service with a fresh process; return it, or None on failure"""
+        for process_name, process in self.processes:
+            if process_name == name:
+                # Children of the crashed leader may still hold its port
+                signal_group(process.pid, force=True)
+        self.processes = [(n, p) for n, p in self.processes if n != name]
+        if not getattr(self, self.START_METHODS[name])(wait=False):
+            return None
+        for process_name, process in self.processes:
+            if process_name == name:
+                return process
+        return None
+
+    def supervise(self):
+        """Block until shutdown, restarting any service that exits"""
+        self.supervisor = ProcessSupervisor()
+        for name, process in self.processes:
+            self.supervisor.watch(name, process, lambda name=name: self._restart_service(name))
+        print("👀 Supervising services: crashed services are restarted automatically")
+        self.supervisor.run(should_continue=lambda: self.running)
+
+    def report_supervision(self):
+        """Print restart counts and downtime per supervised service"""
+        stats = self.supervisor.stats()
+        if not any(s["restarts"] or s["state"] != "running" for s in stats.values()):
+            return
+        print("\n📊 Supervisor summary:")
+        for name, s in stats.items():
+            print(f"   • {name}: {s['restarts']} restart(s), {s['downtime_seconds']:.2f}s down, "
+                  f"state {s['state']}, last exit code {s['last_exit_code']}")
+
     def stop_all_services(self):
         """Stop all running services"""
         print("\n🛑 Stopping all services...")
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            self.report_supervision()
+            self.supervisor.close()
+            self.supervisor = None
         
-        for name, process in self.processes:
-            try:
-                print(f"🛑 Stopping {name}...")
-                process.terminate()
-                process.wait(timeout=5)
-                print(f"✅ {name} stopped")
-            except subprocess.TimeoutExpired:
-                print(f"⚠️  Force killing {name}...")
-                process.kill()
-            except Exception as e:
-                print(f"❌ Error stopping {name}: {e}")
+        # Drain and stop everything at once, so shutdown takes as long as the slowest service
+        targets = [
+            {"name": name, "pgid": process.pid, "process": process, "drain_url": self.DRAIN_URLS.get(name)}
+            for name, process in self.processes
+        ]
+        for name, result in shutdown_services(targets).items():
+            icon = "⚠️ " if result["status"] == "killed" else "✅"
+            print(f"{icon} {name} {describe_shutdown(result)}")
+            remove_pid_file(name)
         
         self.processes.clear()
+        self.log_pump.stop()
         print("✅ All services stopped")
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Start all Healthcare App services")
+    parser.add_argument("--no-supervise", action="store_true",
+                        help="Do not restart services that exit")
+    args = parser.parse_args()
     manager = ServiceManager()
     
     try:
         if manager.start_all_services():
-            # Keep the script running
-            while manager.running:
-                time.sleep(1)
+            if args.no_supervise:
+                # Keep the script running
+                while manager.running:
+                    time.sleep(1)
+            else:
+                manager.supervise()
         else:
             print("❌ Failed to start services")
             sys.exit(1)
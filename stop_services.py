@@ -4,12 +4,120 @@ Healthcare Assistant App - Service Stopper
 Stops all running services gracefully.
 """
 
+import argparse
+import os
 import subprocess
 import sys
 import platform
-import psutil
 import time
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from process_groups import (
+    describe_shutdown,
+    process_alive,
+    read_pid_files,
+    remove_pid_file,
+    shutdown_services,
+    stop_manager,
+)
+
+# A recorded leader started this long after its PID file was written is a reused PID
+PID_REUSE_TOLERANCE = 5.0
+
+def _is_stale(record):
+    """Whether the PID in a record now belongs to an unrelated process"""
+    if psutil is None:
+        return False
+    try:
+        return psutil.Process(record['pid']).create_time() > record['started_at'] + PID_REUSE_TOLERANCE
+    except psutil.NoSuchProcess:
+        # The leader is gone but other members of its group may not be
+        return False
+    except psutil.AccessDenied:
+        return False
+
+def _live_manager(record):
+    """The pid of the manager that started a recorded service, if it is still running"""
+    pid = record.get('manager_pid')
+    if not pid or pid == os.getpid() or not process_alive(pid):
+        return None
+    if psutil is not None:
+        try:
+            # A manager starts before its services; a younger process reused its PID
+            if psutil.Process(pid).create_time() > record['started_at'] + PID_REUSE_TOLERANCE:
+                return None
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            pass
+    return pid
+
+def stop_managers(records):
+    """Stop the managers still supervising recorded services, so none of them restarts a service
+
+    Each manager drains and stops its own services and removes their PID files.
+    """
+    stopped = []
+    for pid in sorted({pid for pid in map(_live_manager, records) if pid}):
+        print(f"🧭 Stopping service manager (PID {pid}) so it does not restart its services...")
+        status = stop_manager(pid)
+        if status == 'not running':
+            continue
+        print(f"{'⚠️ ' if status == 'killed' else '✅'} Service manager (PID {pid}) {status}")
+        stopped.append(f"Service manager (PID: {pid})" + (" - Force killed" if status == 'killed' else ""))
+    return stopped
+
+def stop_recorded_services():
+    """Stop the services recorded in PID files, signalling each process group once
+
+    Managers that are still running are stopped first; whatever they leave
+    recorded is then stopped directly. Returns the list of stopped services,
+    or None when nothing was recorded.
+    """
+    records = read_pid_files()
+    if not records:
+        return None
+    stopped = stop_managers(records)
+    records = read_pid_files()
+    if not records:
+        return stopped
+    print(f"📄 Found {len(records)} recorded service(s), stopping their process groups...")
+
+    live = [record for record in records if not _is_stale(record)]
+    results = shutdown_services(live)
+    for record in records:
+        name = record['name']
+        result = results.get(name)
+        if result is None:
+            print(f"⚠️  {name}: PID {record['pid']} was reused by another process, skipping")
+        elif result['status'] == 'not running':
+            print(f"ℹ️  {name} was not running")
+        else:
+            print(f"✅ {name} (process group {record['pgid']}) {describe_shutdown(result)}")
+            stopped.append(f"{name} (PGID: {record['pgid']})" + (" - Force killed" if result['status'] == 'killed' else ""))
+        # Only if it still records the group stopped here, not one started since
+        remove_pid_file(name, record=record)
+    return stopped
+
+def ensure_psutil():
+    """Import psutil for the process scan, installing it if needed"""
+    global psutil
+    if psutil is not None:
+        return True
+    print("❌ psutil is not installed. Installing...")
+    try:
+        subprocess.run([sys.executable, "-m", "pip", "install", "psutil"], check=True)
+        import psutil as installed
+        psutil = installed
+        print("✅ psutil installed successfully")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to install psutil: {e}")
+        print("Please install psutil manually: pip install psutil")
+        return False
+
 def find_and_kill_processes():
     """Find and kill all healthcare app related processes"""
     print("🔍 Finding healthcare app processes...")
@@ -64,12 +172,17 @@ def kill_processes_by_port():
     ports = [3000, 5000, 5001]  # Frontend, Backend, AI Service
     killed_processes = []
     
+    # One connection table snapshot serves every port
+    try:
+        connections = psutil.net_connections()
+    except Exception as e:
+        print(f"❌ Error listing connections: {e}")
+        return killed_processes
+    
     for port in ports:
         try:
-            # Find processes using the port
-            connections = psutil.net_connections()
             for conn in connections:
-                if conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
+                if conn.laddr and conn.laddr.port == port and conn.status == psutil.CONN_LISTEN:
                     try:
                         proc = psutil.Process(conn.pid)
                         print(f"🎯 Found process on port {port}: {proc.name()} (PID: {conn.pid})")
@@ -95,31 +208,31 @@ def kill_processes_by_port():
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Stop all Healthcare App services")
+    parser.add_argument("--scan", action="store_true",
+                        help="Also scan all processes and ports, even when PID files were found")
+    args = parser.parse_args()
+    
     print("🛑 Healthcare Assistant App - Service Stopper")
     print("=" * 50)
     
-    # Check if psutil is available
-    try:
-        import psutil
-    except ImportError:
-        print("❌ psutil is not installed. Installing...")
-        try:
-            subprocess.run([sys.executable, "-m", "pip", "install", "psutil"], check=True)
-            import psutil
-            print("✅ psutil installed successfully")
-        except Exception as e:
-            print(f"❌ Failed to install psutil: {e}")
-            print("Please install psutil manually: pip install psutil")
-            return False
-    
-    # Kill processes by pattern
-    killed_by_pattern = find_and_kill_processes()
-    
-    # Kill processes by port
-    killed_by_port = kill_processes_by_port()
+    # Fast path: process groups recorded by the service managers
+    killed_by_pid_file = stop_recorded_services()
+    all_killed = killed_by_pid_file or []
     
-    # Summary
-    all_killed = killed_by_pattern + killed_by_port
+    if killed_by_pid_file is None or args.scan:
+        if killed_by_pid_file is None:
+            print("ℹ️  No PID files found, falling back to a process scan")
+        if not ensure_psutil():
+            return False
+        
+        # Kill processes by pattern
+        killed_by_pattern = find_and_kill_processes()
+        
+        # Kill processes by port
+        killed_by_port = kill_processes_by_port()
+        
+        all_killed += killed_by_pattern + killed_by_port
     
     print("\n" + "=" * 50)
     if all_killed:
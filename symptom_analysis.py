@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Symptom Analysis
+Symptom detection and treatment lookup for /ai/comprehensive-symptom-analysis,
+including a batch mode that analyses many symptom descriptions in one request.
+"""
+
+import json
+import sys
+import threading
+
+import medicine_db
+from db_pool import shared_pool
+from medicine_search import normalize_symptom
+from symptom_matcher import SymptomMatcher
+
+MAX_BATCH_SIZE = 5000
+
+_SYMPTOM_DB_SQL = """
+    SELECT s.name, syn.synonym
+    FROM symptoms s
+    LEFT JOIN symptom_synonyms syn ON syn.symptom_id = s.id
+    ORDER BY s.id
+"""
+
+_SYMPTOM_VERSION_SQL = """
+    SELECT
+        (SELECT MAX(id) FROM symptoms),
+        (SELECT COUNT(*) FROM symptom_synonyms)
+"""
+
+
+def load_symptom_db(conn):
+    """Load every interned symptom with its synonyms: {name: {'synonyms': [...]}}"""
+    symptom_db = {}
+    for name, synonym in conn.execute(_SYMPTOM_DB_SQL):
+        entry = symptom_db.setdefault(name, {'synonyms': []})
+        if synonym:
+            entry['synonyms'].append(synonym.lower())
+    return symptom_db
+
+
+def symptom_version(conn):
+    """Highest symptom id and synonym count; symptoms are only ever added, so this grows with the vocabulary"""
+    return tuple(conn.execute(_SYMPTOM_VERSION_SQL).fetchone())
+
+
+class SymptomMatcherStore:
+    """Holds the matcher compiled from the symptom DB, loaded once per process
+
+    The catalogue watcher publishes a freshly compiled matcher when the
+    vocabulary grows; requests keep using whichever matcher they started with.
+    """
+
+    def __init__(self):
+        self._state = (None, None)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        return self._state[0]
+
+    @property
+    def version(self):
+        return self._state[1]
+
+    def publish(self, matcher, version):
+        """Atomically replace the matcher readers see"""
+        self._state = (matcher, version)
+
+    def load(self, conn):
+        """Compile the symptom DB behind `conn` and publish it"""
+        version = symptom_version(conn)
+        matcher = SymptomMatcher(load_symptom_db(conn))
+        self.publish(matcher, version)
+        return matcher
+
+    def get(self):
+        matcher = self.current
+        if matcher is None:
+            with self._lock:
+                matcher = self.current
+                if matcher is None:
+                    conn = medicine_db.connect()
+                    try:
+                        matcher = self.load(conn)
+                    finally:
+                        conn.close()
+        return matcher
+
+
+symptom_matchers = SymptomMatcherStore()
+
+
+def shared_symptom_matcher():
+    """Matcher compiled from the symptom DB, shared by every request of this process"""
+    return symptom_matchers.get()
+
+
+def validate_item(item):
+    """Return an error message for an invalid analysis request, or None"""
+    if not isinstance(item, dict):
+        return "Each item must be an object with 'symptoms'"
+    symptoms = item.get('symptoms')
+    if not isinstance(symptoms, str) or not symptoms.strip():
+        return "Symptoms are required"
+    return None
+
+
+def analyze_batch(items, conn, matcher=None):
+    """Analyse a list of {symptoms, user_id} items, returning results in the same order
+
+    Symptoms of every valid item are detected in one find_batch pass over the
+    shared precompiled matcher, then each item runs through an AnalysisPipeline.
+    Invalid items get an unsuccessful result in place instead of failing the
+    batch. Treatment lookups are shared between items that report the same symptom.
+    """
+    from analysis_pipeline import AnalysisPipeline, comprehensive_analysis
+
+    matcher = shared_symptom_matcher() if matcher is None else matcher
+    errors = [validate_item(item) for item in items]
+    valid = [item for item, error in zip(items, errors) if not error]
+    detections = iter(matcher.find_batch([normalize_symptom(item['symptoms']) for item in valid]))
+
+    lookups = {}
+    results = []
+    for item, error in zip(items, errors):
+        if error:
+            results.append({'success': False, 'message': error})
+        else:
+            pipeline = AnalysisPipeline(item['symptoms'], conn, matcher, lookups, detected=next(detections))
+            results.append(comprehensive_analysis(pipeline, item.get('user_id')))
+    return results
+
+
+def analyze_symptoms(symptoms, conn, user_id=None, matcher=None):
+    """Analyse a single symptom description"""
+    return analyze_batch([{'symptoms': symptoms, 'user_id': user_id}], conn, matcher)[0]
+
+
+def register_routes(app):
+    """Register the batch analysis endpoint on the AI service's Flask app"""
+    from flask import jsonify, request
+
+    @app.route('/ai/comprehensive-symptom-analysis/batch', methods=['POST'])
+    def comprehensive_symptom_analysis_batch():
+        payload = request.get_json(silent=True) or {}
+        items = payload.get('items')
+        if not isinstance(items, list) or not items:
+            return jsonify({'success': False, 'message': "'items' must be a non-empty list"}), 400
+        if len(items) > MAX_BATCH_SIZE:
+            return jsonify({'success': False, 'message': f"At most {MAX_BATCH_SIZE} items per batch"}), 400
+
+        results = analyze_batch(items, shared_pool().reader())
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+
+    return app
+
+
+def main():
+    """Analyse symptom descriptions given on the command line"""
+    if len(sys.argv) < 2:
+        print('Usage: python symptom_analysis.py "<symptoms>" ["<symptoms>" ...]')
+        return False
+
+    conn = medicine_db.connect()
+    results = analyze_batch([{'symptoms': text} for text in sys.argv[1:]], conn)
+    conn.close()
+    print(json.dumps(results, indent=2))
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Healthcare Assistant App - Symptom Matcher
+Aho-Corasick automaton over every symptom name and synonym, compiled once at startup.
+"""
+
+import sys
+from collections import deque
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _outermost(hits):
+    """Symptom ids of the (start, end, symptom id) hits not contained in a longer hit"""
+    found = set()
+    reach = -1
+    # Longest first among hits starting together; anything ending within reach is inside an earlier hit
+    for start, end, symptom_id in sorted(hits, key=lambda hit: (hit[0], -hit[1])):
+        if end > reach:
+            reach = end
+            span = (start, end)
+        elif (start, end) != span:
+            continue
+        found.add(symptom_id)
+    return found
+
+
+class SymptomMatcher:
+    """Finds every known symptom term in a text in a single left-to-right pass
+
+    The automaton is built from a symptom DB shaped like
+    {name: {'synonyms': [...]}}. Matching cost depends on the length of the
+    text, not on how many names and synonyms the DB holds.
+
+    Terms only match whole words ("gas" does not match "gastric"), and a term
+    found inside a longer matched term is dropped ("ear pain" is earache, not
+    also pain).
+    """
+
+    def __init__(self, symptom_db):
+        self.symptoms = list(symptom_db)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for symptom_id, (name, entry) in enumerate(symptom_db.items()):
+            for term in (name, *entry.get('synonyms', ())):
+                self._add_term(term.lower(), symptom_id)
+        self._build_failure_links()
+
+    def _add_term(self, term, symptom_id):
+        if not term:
+            return
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        # Outputs carry the term length so a hit's start can be checked for a word boundary
+        if (symptom_id, len(term)) not in self._output[state]:
+            self._output[state] += ((symptom_id, len(term)),)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                # Inherit matches of the longest proper suffix so lookups never walk fail links
+                self._output[next_state] += tuple(
+                    match for match in self._output[self._fail[next_state]]
+                    if match not in self._output[next_state]
+                )
+
+    @property
+    def state_count(self):
+        return len(self._goto)
+
+    def find_ids(self, text):
+        """Return the set of symptom ids whose terms occur in `text` as whole words"""
+        goto, fail, output = self._goto, self._fail, self._output
+        text = (text or "").lower()
+        hits = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] and (end + 1 == len(text) or not _is_word_char(text[end + 1])):
+                for symptom_id, length in output[state]:
+                    start = end - length + 1
+                    if start == 0 or not _is_word_char(text[start - 1]):
+                        hits.append((start, end, symptom_id))
+        return _outermost(hits)
+
+    def find(self, text):
+        """Return the symptoms mentioned in `text`, in symptom DB order"""
+        return [self.symptoms[symptom_id] for symptom_id in sorted(self.find_ids(text))]
+
+    def find_batch(self, texts):
+        """Return the detected symptoms for each text of a batch"""
+        return [self.find(text) for text in texts]
+
+
+def main():
+    """Match symptom text against the symptom DB from the command line"""
+    if len(sys.argv) < 2:
+        print('Usage: python symptom_matcher.py "<symptoms>"')
+        return False
+
+    from symptom_analysis import shared_symptom_matcher
+
+    matcher = shared_symptom_matcher()
+    print(f"🧠 {len(matcher.symptoms)} symptoms compiled into {matcher.state_count} states")
+    print(f"📊 Detected: {', '.join(matcher.find(' '.join(sys.argv[1:]))) or 'nothing'}")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for the asynchronous GPT client against the mock LLM server
+"""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from gpt_client import AsyncGPTClient, TokenBucket
+from mock_llm_server import MockLLMServer
+
+
+def run_against_mock(scenario, latency=0.1, **options):
+    """Run `scenario(client, server)` with a client pointed at a fresh mock server"""
+
+    async def run():
+        server = await MockLLMServer(port=0, latency=latency, jitter=0).start()
+        options.setdefault('cache_path', None)
+        client = AsyncGPTClient(api_key='', base_url=server.base_url, requests_per_minute=10 ** 6, **options)
+        try:
+            return await scenario(client, server)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(run())
+
+
+def test_duplicate_inflight_prompts_call_upstream_once():
+    """Identical prompts in flight together share one upstream call"""
+
+    async def scenario(client, server):
+        results = await asyncio.gather(*(client.analyze("Fever and  COUGH") for _ in range(10)))
+        return results, server.completions, client.stats
+
+    results, completions, stats = run_against_mock(scenario)
+    assert completions == 1
+    assert stats['deduplicated'] == 9
+    assert all(result == results[0] and result['source'] == 'gpt' for result in results)
+
+
+def test_cached_prompts_make_no_upstream_call():
+    """A prompt answered before is served from the persistent cache, even by a new client"""
+    cache_path = Path(tempfile.mkdtemp(prefix="healthcare-gpt-test-")) / "gpt_cache.db"
+
+    async def scenario(client, server):
+        first = await client.analyze("headache")
+        again = AsyncGPTClient(api_key='', base_url=server.base_url, cache_path=cache_path)
+        cached = await again.analyze("Headache ")
+        await again.close()
+        return first, cached, server.completions
+
+    first, cached, completions = run_against_mock(scenario, cache_path=cache_path)
+    assert completions == 1
+    assert first['source'] == 'gpt'
+    assert cached['source'] == 'cache'
+    assert cached['analysis'] == first['analysis']
+
+
+def test_concurrency_cap_holds():
+    """No more than max_concurrency completions are ever in flight upstream"""
+
+    async def scenario(client, server):
+        await asyncio.gather(*(client.analyze(f"symptom set {i}") for i in range(12)))
+        return server.completions, server.max_concurrent
+
+    completions, max_concurrent = run_against_mock(scenario, max_concurrency=3)
+    assert completions == 12
+    assert max_concurrent == 3
+
+
+def test_token_bucket_limits_the_rate():
+    """After the burst capacity is spent, calls are spaced at the configured rate"""
+
+    async def acquire_all():
+        bucket = TokenBucket(rate_per_minute=600, capacity=2)
+        started = time.monotonic()
+        for _ in range(5):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # Two calls from the burst, then three at 10 per second
+    assert 0.25 <= asyncio.run(acquire_all()) < 1.0
+
+
+def test_timeout_falls_back_to_local_analysis():
+    """A completion slower than the timeout is answered by the fallback"""
+    calls = []
+
+    def fallback(kind, symptoms):
+        calls.append((kind, symptoms))
+        return {'summary': 'local'}
+
+    async def scenario(client, server):
+        return await client.analyze("fever"), client.stats
+
+    result, stats = run_against_mock(scenario, latency=1.0, timeout=0.1, fallback=fallback)
+    assert result == {'success': True, 'source': 'fallback', 'fallback_reason': 'timeout',
+                      'analysis': {'summary': 'local'}}
+    assert calls == [('analyze', 'fever')]
+    assert stats['fallbacks'] == 1
+
+
+if __name__ == "__main__":
+    print("🧪 Testing GPT Client")
+    print("=" * 50)
+    for test in (test_duplicate_inflight_prompts_call_upstream_once, test_cached_prompts_make_no_upstream_call,
+                 test_concurrency_cap_holds, test_token_bucket_limits_the_rate,
+                 test_timeout_falls_back_to_local_analysis):
+        test()
+        print(f"✅ {test.__doc__}")
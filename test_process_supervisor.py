@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script for service supervision: restart backoff and the crash-loop breaker
+"""
+
+import re
+import subprocess
+import sys
+import time
+
+from process_supervisor import ProcessSupervisor
+
+CRASH = [sys.executable, "-c", "raise SystemExit(1)"]
+
+
+def supervise(command, until, timeout=10.0, **options):
+    """Supervise one service running `command` until `until(stats)` holds; returns (stats, logged delays, log)"""
+    log = []
+    supervisor = ProcessSupervisor(log=log.append, **options)
+    supervisor.watch("Crasher", subprocess.Popen(command), lambda: subprocess.Popen(command))
+    deadline = time.monotonic() + timeout
+    try:
+        supervisor.run(lambda: time.monotonic() < deadline and not until(supervisor.stats()["Crasher"]))
+        stats = supervisor.stats()["Crasher"]
+    finally:
+        supervisor.close()
+    delays = [float(match) for line in log for match in re.findall(r"restarting in ([\d.]+)s", line)]
+    return stats, delays, log
+
+
+def test_first_restart_is_immediate_then_backs_off():
+    """A crashing service restarts at once, then waits twice as long after each failure up to the cap"""
+    stats, delays, _ = supervise(CRASH, lambda s: s["restarts"] >= 5, backoff_base=0.05, backoff_max=0.2,
+                                 crash_limit=100)
+    assert stats["last_exit_code"] == 1
+    assert delays[:5] == [0.0, 0.05, 0.1, 0.2, 0.2]
+
+
+def test_healthy_run_resets_the_backoff():
+    """A service that stayed up for min_uptime is restarted immediately every time"""
+    command = [sys.executable, "-c", "import time; time.sleep(0.2); raise SystemExit(3)"]
+    stats, delays, _ = supervise(command, lambda s: s["restarts"] >= 3, min_uptime=0.1, backoff_base=5.0)
+    assert stats["last_exit_code"] == 3
+    assert delays[:3] == [0.0, 0.0, 0.0]
+
+
+def test_breaker_opens_after_crash_limit():
+    """More than crash_limit crashes within the window stop the restarts"""
+    stats, delays, log = supervise(CRASH, lambda s: s["state"] == "circuit-open", backoff_base=0.01,
+                                   crash_limit=3, crash_window=60.0, breaker_cooldown=60.0)
+    assert stats["state"] == "circuit-open"
+    # Three restarts fill the limit; the fourth crash opens the breaker instead of restarting
+    assert stats["restarts"] == 3
+    assert len(delays) == 3
+    assert "crash loop detected" in log[-1]
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Process Supervisor")
+    print("=" * 50)
+    for test in (test_first_restart_is_immediate_then_backs_off, test_healthy_run_resets_the_backoff,
+                 test_breaker_opens_after_crash_limit):
+        test()
+        print(f"✅ {test.__doc__}")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the response cache in front of the catalogue lookups
+"""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import medicine_db
+import medicine_search
+from cache_backends import SQLiteBackend
+from medicine_search import indication_response, medicine_search_response
+from response_cache import ResponseCache, make_key
+from seed_catalogue import CatalogueGenerator, generate
+
+_seeded_db = None
+
+
+def seeded_connection():
+    """Connection to a small synthetic catalogue, generated once per run"""
+    global _seeded_db
+    if _seeded_db is None:
+        directory = Path(tempfile.mkdtemp(prefix="healthcare-cache-test-"))
+        _seeded_db = generate(directory / "medicine_database.db", CatalogueGenerator(200, 300))
+    return medicine_db.connect(_seeded_db)
+
+
+def test_repeated_search_is_a_cache_hit():
+    """A repeated medicine search, in any word order or case, is answered from the cache"""
+    conn = seeded_connection()
+    cache = ResponseCache()
+    first = medicine_search_response(conn, "headache pain", 5, cache)
+    again = medicine_search_response(conn, "Pain   HEADACHE", 5, cache)
+    conn.close()
+    assert first['total_results'] > 0
+    assert again == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_repeated_indication_lookup_is_a_cache_hit():
+    """A repeated indication lookup is answered from the cache"""
+    conn = seeded_connection()
+    cache = ResponseCache()
+    first = indication_response(conn, "fever", 5, cache)
+    again = indication_response(conn, " Fever ", 5, cache)
+    other = indication_response(conn, "fever", 3, cache)
+    conn.close()
+    assert first['total_results'] > 0
+    assert again == first
+    assert other['total_results'] == 3
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def shared_workers(count, **options):
+    """Response caches of `count` simulated workers sharing one SQLite cache file"""
+    path = Path(tempfile.mkdtemp(prefix="healthcare-cache-test-")) / "response_cache.db"
+    return [ResponseCache(backend=SQLiteBackend(path), **options) for _ in range(count)]
+
+
+def test_concurrent_misses_search_once():
+    """Concurrent identical misses in two workers run the search once and all get its result"""
+    workers = shared_workers(2)
+    searches = []
+    search = medicine_search.search_medicines
+
+    def slow_search(conn, query, limit):
+        searches.append(query)
+        time.sleep(0.2)
+        return search(conn, query, limit)
+
+    results = [None] * 8
+
+    def request(index):
+        conn = seeded_connection()
+        try:
+            results[index] = medicine_search_response(conn, "fever cough", 5, workers[index % 2])
+        finally:
+            conn.close()
+
+    medicine_search.search_medicines = slow_search
+    try:
+        threads = [threading.Thread(target=request, args=(index,)) for index in range(len(results))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        medicine_search.search_medicines = search
+
+    assert len(searches) == 1
+    assert results[0]['total_results'] > 0
+    assert all(result == results[0] for result in results)
+    # Every request but the two workers' first ones waited on an in-process flight
+    assert sum(worker.coalesced for worker in workers) == len(results) - 2
+
+
+def test_expired_lease_is_taken_over():
+    """A worker whose peer died holding the lease computes the response itself once the lease expires"""
+    crashed, worker = shared_workers(2, lease_ttl=0.3)
+    params = {'query': "fever cough", 'limit': 5}
+    assert crashed.backend.acquire_lease(make_key('medicine-search', params), crashed.lease_ttl)
+
+    conn = seeded_connection()
+    started = time.monotonic()
+    result = medicine_search_response(conn, params['query'], params['limit'], worker)
+    waited = time.monotonic() - started
+    conn.close()
+    assert result['total_results'] > 0
+    assert waited >= worker.lease_ttl
+    # The computed response is shared: the other worker now hits it
+    assert crashed.get(make_key('medicine-search', params)) == result
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Response Cache")
+    print("=" * 50)
+    for test in (test_repeated_search_is_a_cache_hit, test_repeated_indication_lookup_is_a_cache_hit,
+                 test_concurrent_misses_search_once, test_expired_lease_is_taken_over):
+        test()
+        print(f"✅ {test.__doc__}")
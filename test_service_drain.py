@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for request draining across worker processes
+"""
+
+import multiprocessing
+import os
+
+from service_drain import DrainController
+
+
+def test_drain_is_shared_with_forked_workers():
+    """A drain requested in one worker is seen by its siblings and the master"""
+    controller = DrainController()
+    pid = os.fork()
+    if pid == 0:
+        controller.start_draining()
+        os._exit(0)
+    os.waitpid(pid, 0)
+    assert controller.draining
+
+
+def test_in_flight_counts_every_worker():
+    """Requests in flight in any worker keep the service from reporting idle"""
+    controller = DrainController()
+    started, release = multiprocessing.Event(), multiprocessing.Event()
+
+    def worker():
+        controller.enter()
+        started.set()
+        release.wait()
+        controller.leave()
+
+    process = multiprocessing.get_context('fork').Process(target=worker)
+    process.start()
+    started.wait()
+    controller.enter()
+    assert controller.in_flight == 2
+    controller.leave()
+    assert not controller.wait_idle(0.05)
+    release.set()
+    assert controller.wait_idle(5)
+    process.join()
+    assert controller.status() == {'draining': False, 'in_flight': 0}
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Request Draining")
+    print("=" * 50)
+    for test in (test_drain_is_shared_with_forked_workers, test_in_flight_counts_every_worker):
+        test()
+        print(f"✅ {test.__doc__}")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script for symptom detection with the precompiled matcher
+"""
+
+from symptom_matcher import SymptomMatcher
+
+SYMPTOM_DB = {
+    'headache': {'synonyms': ['head pain']},
+    'pain': {'synonyms': ['ache', 'aching']},
+    'earache': {'synonyms': ['ear pain']},
+    'rash': {'synonyms': ['skin rash', 'hives']},
+    'bloating': {'synonyms': ['gas']},
+    'sore throat': {'synonyms': ['throat pain']},
+    'fever': {'synonyms': []},
+    'cough': {'synonyms': ['coughing']},
+}
+
+
+def detect(text):
+    return SymptomMatcher(SYMPTOM_DB).find(text)
+
+
+def test_terms_match_whole_words_only():
+    """Terms inside longer words are not symptoms"""
+    assert detect("my archives are a mess") == []
+    assert detect("gastric upset") == []
+    assert detect("Spain holiday") == []
+
+
+def test_contained_terms_are_dropped():
+    """A term inside a longer matched term does not count on its own"""
+    assert detect("I have a headache") == ['headache']
+    assert detect("ear pain since monday") == ['earache']
+    assert detect("bad head pain") == ['headache']
+
+
+def test_symptoms_are_detected_at_boundaries():
+    """Punctuation and the ends of the text are word boundaries"""
+    assert detect("cough, fever & sore throat") == ['sore throat', 'fever', 'cough']
+    assert detect("Hives!") == ['rash']
+    assert detect("gas") == ['bloating']
+    assert detect("aching all over, and coughing") == ['pain', 'cough']
+
+
+def test_separate_mentions_are_all_kept():
+    """Containment only applies to overlapping text, not to the same term elsewhere"""
+    assert detect("headache and some pain in my back") == ['headache', 'pain']
+
+
+if __name__ == "__main__":
+    print("🧪 Testing Symptom Matcher")
+    print("=" * 50)
+    for test in (test_terms_match_whole_words_only, test_contained_terms_are_dropped,
+                 test_symptoms_are_detected_at_boundaries, test_separate_mentions_are_all_kept):
+        test()
+        print(f"✅ {test.__doc__}")